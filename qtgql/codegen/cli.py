@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import importlib
+import json
 from pathlib import Path
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, List, Optional
 
 import rich
 import toml
@@ -68,6 +69,30 @@ def gen():
     )
 
 
+@app.command()
+def snapshot(
+    output: Path = typer.Argument(..., help="Path of the snapshot file to write."),
+    responses: List[Path] = typer.Argument(
+        ...,
+        help="Recorded responses, JSON files of `{operationName, data}` objects (or a list of them).",
+    ),
+    env: Optional[str] = typer.Option(
+        None, help="Environment name, defaults to the one in your `QtGqlConfig`."
+    ),
+):
+    """Creates a cache snapshot (see `QtGqlEnvironment.restore_snapshot`)
+    from recorded responses."""
+    from qtgql.codegen.py.runtime.snapshot import SnapshotWriter
+
+    writer = SnapshotWriter(env_name=env or _get_config().env_name)
+    for response_file in responses:
+        recorded = json.loads(response_file.read_text())
+        for response in recorded if isinstance(recorded, list) else [recorded]:
+            writer.add_operation(response["operationName"], response["data"])
+    writer.save(output)
+    console.print(f"[bold green]Snapshot was written to {output.resolve()}")
+
+
 @app.command()
 def hotreload():  # pragma: no cover
     raise NotImplementedError
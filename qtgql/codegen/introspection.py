@@ -6,10 +6,10 @@ from typing import (
     TYPE_CHECKING,
     List,
     Optional,
-    TypedDict,
     Union,
 )
 
+import attrs
 import graphql
 from graphql import OperationType
 from graphql import language as gql_lang
@@ -25,11 +25,19 @@ from qtgql.codegen.graphql_ref import (
     is_union_definition,
 )
 from qtgql.codegen.py.compiler.builtin_scalars import BuiltinScalars
-from qtgql.codegen.py.compiler.query import QtGqlQueriedField, QtGqlQueryHandlerDefinition
+from qtgql.codegen.py.compiler.query import (
+    QtGqlQueriedField,
+    QtGqlQueryHandlerDefinition,
+    QueryConnection,
+    find_connection,
+    selected_fields,
+)
 from qtgql.codegen.py.compiler.template import (
     TemplateContext,
     handlers_template,
     schema_types_template,
+    type_module_template,
+    types_package_template,
 )
 from qtgql.codegen.py.objecttype import (
     EnumMap,
@@ -50,11 +58,6 @@ if TYPE_CHECKING:  # pragma: no cover
 introspection_query = graphql.get_introspection_query(descriptions=True)
 
 
-class GeneratedNamespace(TypedDict):
-    handlers: str
-    objecttypes: str
-
-
 class QtGqlVisitor(visitor.Visitor):
     """Creates handlers for root operations.
 
@@ -73,15 +76,22 @@ class QtGqlVisitor(visitor.Visitor):
                 root_field: gql_lang.FieldNode = operation.selection_set.selections[0]  # type: ignore
                 fname = root_field.name.value
                 assert self.evaluator._query_type
+                found_connection = find_connection(root_field)
                 root_qtgql_field = QtGqlQueriedField.from_field(
                     self.evaluator._query_type.fields_dict[fname], root_field.selection_set
                 )
                 op_name = operation.name.value
+                connection = None
+                if found_connection:
+                    connection = QueryConnection.from_path(
+                        root_qtgql_field, *found_connection, prefix=f"_{op_name}__{fname}"
+                    )
                 self.query_handlers[op_name] = QtGqlQueryHandlerDefinition(
                     query=graphql.print_ast(node),
                     name=op_name,
                     field=root_qtgql_field,
                     directives=node.directives,
+                    connection=connection,
                 )
 
 
@@ -237,8 +247,33 @@ class SchemaEvaluator:
         operations = visitor.visit(operations, operation_miner)
         self._query_handlers.update(operation_miner.query_handlers)
 
-    def dumps(self) -> GeneratedNamespace:
-        """:return: The generated schema module as a string."""
+    def _tree_shake(self, context: TemplateContext) -> TemplateContext:
+        """Drops the types, fields, enums and custom scalars that no operation
+        selects (see `QtGqlConfig.tree_shaking`)."""
+        selected = selected_fields(context.queries)
+        types = [
+            attrs.evolve(
+                t,
+                fields_dict={
+                    name: f for name, f in t.fields_dict.items() if name in selected[t.name]
+                },
+            )
+            for t in context.types
+            if t.name in selected
+        ]
+        fields = [f for t in types for f in t.fields]
+        enums = {enum.name for f in fields if (enum := f.type.is_enum)}
+        scalars = {scalar for f in fields if (scalar := f.is_custom_scalar)}
+        return attrs.evolve(
+            context,
+            types=types,
+            enums=[enum for enum in context.enums if enum.name in enums],
+            scalars=[s for s in self.config.custom_scalars.values() if s in scalars],
+        )
+
+    def dumps(self) -> dict[str, str]:
+        """:return: The generated modules as strings, by their path relative
+        to `graphql_dir` (without the suffix)."""
         self.parse_schema_concretes()
         self.parse_operations()
         context = TemplateContext(
@@ -249,12 +284,25 @@ class SchemaEvaluator:
             queries=list(self._query_handlers.values()),
             config=self.config,
         )
-        return GeneratedNamespace(
-            handlers=handlers_template(context), objecttypes=schema_types_template(context)
-        )
+        if self.config.tree_shaking:
+            context = self._tree_shake(context)
+        if self.config.split_modules:
+            ret = {
+                "handlers": handlers_template(context),
+                "objecttypes/__init__": types_package_template(context),
+            }
+            for t in context.types:
+                ret[f"objecttypes/{t.name}"] = type_module_template(context, t)
+            return ret
+        return {
+            "handlers": handlers_template(context),
+            "objecttypes": schema_types_template(context),
+        }
 
     def dump(self):
         """:param file: Path to the directory the codegen would dump to."""
         for fname, content in self.dumps().items():
-            with (self.config.graphql_dir / (fname + ".py")).open("w") as fh:
+            path = self.config.graphql_dir / (fname + ".py")
+            path.parent.mkdir(exist_ok=True)
+            with path.open("w") as fh:
                 fh.write(content)
@@ -1,11 +1,12 @@
 from pathlib import Path
 from typing import Callable, Type
 
-from attrs import define
+from attrs import define, field
 
 from qtgql.codegen.introspection import SchemaEvaluator
 from qtgql.codegen.py.compiler.template import TemplateContext, schema_types_template
 from qtgql.codegen.py.runtime.bases import BaseGraphQLObject, _BaseQGraphQLObject
+from qtgql.codegen.py.runtime.cachepolicy import CachePolicy
 from qtgql.codegen.py.runtime.custom_scalars import CUSTOM_SCALARS, CustomScalarMap
 
 
@@ -29,11 +30,84 @@ class QtGqlConfig:
     evaluator: Type[SchemaEvaluator] = SchemaEvaluator
     """evaluates the schema and generates types."""
     custom_scalars: CustomScalarMap = CUSTOM_SCALARS
-    """mapping of custom scalars, respected by the schema evaluator."""
+    """mapping of custom scalars, respected by the schema evaluator.
+
+    builtin scalars are included, scalars mapped here under the same
+    GraphQL name (i.e `NativeDateTimeScalar`) override them.
+    """
     template_class: Callable[[TemplateContext], str] = schema_types_template
     """jinja template."""
     base_object: Type[_BaseQGraphQLObject] = BaseGraphQLObject
     """base object to be extended by all generated types."""
+    cache_policies: dict[str, CachePolicy] = field(factory=dict)
+    """mapping of a type name to its cache policy (TTL, maximum resident nodes
+    and eviction strategy), enforced by the store of the generated type."""
+    object_pools: dict[str, int] = field(factory=dict)
+    """mapping of a type name to the maximum size of its object pool.
+
+    Released nodes of these types are reset and reused instead of being
+    deleted, worth it for types that are created and discarded at high
+    rates (i.e list rows that are replaced on every refetch).
+    """
+    structural_hashing: bool = False
+    """whether generated updaters should skip subtrees whose payload didn't
+    change since the last update, at the cost of hashing the payloads.
+
+    Worth it for large operations that are refetched often while most
+    of their data stays the same.
+    """
+    role_models: bool = False
+    """whether to generate a list model per type (`<Type>ListModel`) with a
+    role per field, next to the `object` role.
+
+    Delegates can then bind to `model.<field>` instead of going through
+    `model.object`. Updates of the operation emit `dataChanged` with the
+    roles of the fields that changed.
+    """
+    columnar_lists: bool = False
+    """whether lists of types that have only builtin scalars and enums are
+    stored column by column (a `ColumnarListModel` per type).
+
+    Each field is served by its role, row objects are created only for
+    the `object` role.
+    """
+    lazy_rows: bool = False
+    """whether list models should keep the raw payload of each row and
+    create its object on first access (i.e when a view displays it).
+
+    The row count is known right away, so views can scroll the whole
+    list while only the rows in their viewport are created.
+    """
+    tree_shaking: bool = False
+    """whether to generate only what the operations select.
+
+    Types that no operation selects are dropped, as are the fields the
+    operations don't select and the enums and custom scalars only those
+    fields refer to.
+    """
+    split_modules: bool = False
+    """whether to generate the types as a package (`objecttypes/`) with a
+    module per type.
+
+    A type is imported only when an operation (or another type) first
+    refers to it, so that large schemas don't pay for the types the
+    client never uses at startup.
+    """
+    two_phase_decode: bool = False
+    """whether results from the network should be decoded in two phases.
+
+    Scalar conversion, enum mapping and diffing against the previous
+    result run on a background thread (see `DecodeWorker`), leaving only
+    the changed nodes to apply on the GUI thread.
+    """
+    lazy_children: bool = False
+    """whether nested objects and list models should keep their raw payload
+    and be built on first access (from QML or Python) instead of right away.
+
+    Payloads that refer to nodes that are already in the store are
+    still applied right away. Worth it for deep trees of which most
+    branches are never displayed.
+    """
 
     @property
     def schema_path(self) -> Path:
@@ -56,4 +130,4 @@ class QtGqlConfig:
 
     def __attrs_post_init__(self):
         if self.custom_scalars != CUSTOM_SCALARS:
-            self.custom_scalars.update(CUSTOM_SCALARS)
+            self.custom_scalars = {**CUSTOM_SCALARS, **self.custom_scalars}
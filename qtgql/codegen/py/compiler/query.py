@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from collections import defaultdict
 from textwrap import dedent
-from typing import List, NamedTuple, Optional
+from typing import Iterable, Iterator, List, NamedTuple, Optional
 
 import attrs
 from graphql import language as gql_lang
@@ -14,6 +14,7 @@ from qtgql.codegen.py.compiler.template import (
 )
 from qtgql.codegen.py.objecttype import GqlFieldDefinition, GqlTypeDefinition
 from qtgql.codegen.utils import AntiForwardRef
+from qtgql.exceptions import QtGqlException
 
 
 def get_field_from_field_node(
@@ -43,6 +44,54 @@ def has_id_field(selection_set: gql_lang.SelectionSetNode) -> bool:
     return False
 
 
+PAGE_INFO_SELECTIONS = ("hasNextPage", "endCursor")
+
+
+def _selected_field(
+    selection_set: Optional[gql_lang.SelectionSetNode], name: str
+) -> Optional[gql_lang.FieldNode]:
+    for selection in getattr(selection_set, "selections", ()):
+        if (field_node := is_field_node(selection)) and field_node.name.value == name:
+            return field_node
+    return None
+
+
+def find_connection(
+    root_field: gql_lang.FieldNode,
+) -> Optional[tuple[tuple[str, ...], str]]:
+    """Finds a Relay connection paginated by the operation, that is a field
+    that takes its `after` argument from a variable and selects `edges`
+    and `pageInfo`.
+
+    Injects the `pageInfo` fields that pagination requires if they
+    weren't selected.
+
+    :returns: The path of the connection (from the root field) and the
+        name of the cursor variable.
+    """
+    stack: list[tuple[gql_lang.FieldNode, tuple[str, ...]]] = [
+        (root_field, (root_field.name.value,))
+    ]
+    while stack:
+        field_node, path = stack.pop()
+        for argument in field_node.arguments or ():
+            if argument.name.value == "after" and isinstance(argument.value, gql_lang.VariableNode):
+                page_info = _selected_field(field_node.selection_set, "pageInfo")
+                if page_info and _selected_field(field_node.selection_set, "edges"):
+                    for name in PAGE_INFO_SELECTIONS:
+                        if not _selected_field(page_info.selection_set, name):
+                            page_info.selection_set.selections += (  # type: ignore
+                                gql_lang.FieldNode(
+                                    name=gql_lang.NameNode(value=name), arguments=(), directives=()
+                                ),
+                            )
+                    return path, argument.value.name.value
+        for selection in getattr(field_node.selection_set, "selections", ()):
+            if child := is_field_node(selection):
+                stack.append((child, (*path, child.name.value)))
+    return None
+
+
 @attrs.define
 class QtGqlQueriedField(GqlFieldDefinition):
     selections: List[QtGqlQueriedField] = attrs.Factory(list)
@@ -99,13 +148,149 @@ class QtGqlQueriedField(GqlFieldDefinition):
         )
 
 
+def _selected_object_type(f: GqlFieldDefinition) -> Optional[GqlTypeDefinition]:
+    if object_type := f.type.is_object_type:
+        return object_type
+    if model_of := f.type.is_model:
+        return model_of.is_object_type
+    return None
+
+
+@attrs.define
+class SpecializedSelection:
+    """A selection set of an operation (or of an inline fragment), the
+    handlers template generates straight-line `<prefix>__from_dict` and
+    `<prefix>__update` functions for each, that visit only the selected
+    fields."""
+
+    prefix: str
+    type: Optional[GqlTypeDefinition]
+    fields: List[QtGqlQueriedField]
+
+    def child(self, f: QtGqlQueriedField) -> str:
+        """:returns: The prefix of the functions of a selected field.
+
+        for unions this prefix is of the dispatch tables
+        (`<prefix>__from_dict_choices` and `<prefix>__update_choices`).
+        """
+        return f"{self.prefix}__{f.name}"
+
+    def child_has_id(self, f: QtGqlQueriedField) -> bool:
+        object_type = _selected_object_type(f)
+        return bool(object_type and object_type.has_id_field)
+
+    @property
+    def subtree_types(self) -> tuple[str, ...]:
+        """:returns: Names of the types of this selection and of the
+        selections nested in it, invalidating one of them invalidates the
+        subtree hashes of this selection."""
+        ret = {self.type.name} if self.type else set()
+        stack = list(self.fields)
+        while stack:
+            f = stack.pop()
+            if f.choices:
+                ret.update(f.choices)
+                for fields in f.choices.values():
+                    stack.extend(fields)
+            elif object_type := _selected_object_type(f):
+                ret.add(object_type.name)
+                stack.extend(f.selections)
+        return tuple(sorted(ret))
+
+
+class SpecializedUnion(NamedTuple):
+    prefix: str
+    choices: dict[str, str]
+    """type name -> prefix of the selection of that type."""
+
+
+def _specialize_field(
+    prefix: str, f: QtGqlQueriedField
+) -> Iterator[SpecializedSelection | SpecializedUnion]:
+    if f.choices:
+        choices = {type_name: f"{prefix}__{type_name}" for type_name in f.choices}
+        yield SpecializedUnion(prefix, choices)
+        for type_name, fields in f.choices.items():
+            yield from _specialize_selection(choices[type_name], f.type_map[type_name], fields)
+    elif object_type := _selected_object_type(f):
+        yield from _specialize_selection(prefix, object_type, f.selections)
+
+
+def _specialize_selection(
+    prefix: str, t: GqlTypeDefinition, fields: List[QtGqlQueriedField]
+) -> Iterator[SpecializedSelection | SpecializedUnion]:
+    selection = SpecializedSelection(prefix, t, fields)
+    yield selection
+    for f in fields:
+        yield from _specialize_field(selection.child(f), f)
+
+
+class QueryConnection(NamedTuple):
+    """A Relay connection that the operation pages through (see
+    `BaseQueryHandler.fetch_more()`)."""
+
+    path: tuple[str, ...]
+    """Field names from the root field to the connection."""
+    variable: str
+    """The variable of the `after` cursor."""
+    prefix: str
+    """Prefix of the specialized functions of the connection selection."""
+
+    @classmethod
+    def from_path(
+        cls, root_field: QtGqlQueriedField, path: tuple[str, ...], variable: str, prefix: str
+    ) -> QueryConnection:
+        f = root_field
+        for name in path[1:]:
+            if f.type.is_model:
+                raise QtGqlException(f"paginated connection {'.'.join(path)} is inside a list")
+            f = next(child for child in f.selections if child.name == name)
+            prefix = f"{prefix}__{name}"
+        return cls(path=path, variable=variable, prefix=prefix)
+
+
 class QtGqlQueryHandlerDefinition(NamedTuple):
     query: str
     name: str
     field: QtGqlQueriedField
     directives: list[str] = []
     fragments: list[str] = []
+    connection: Optional[QueryConnection] = None
 
     @property
     def operation_config(self) -> str:
         return self.field.as_conf_string()
+
+    @property
+    def root_selection(self) -> SpecializedSelection:
+        """Pseudo selection of the root field (used by the handler itself)."""
+        return SpecializedSelection(prefix=f"_{self.name}", type=None, fields=[self.field])
+
+    @property
+    def specialized_selections(self) -> list[SpecializedSelection]:
+        root = self.root_selection
+        return [
+            s
+            for s in _specialize_field(root.child(self.field), self.field)
+            if isinstance(s, SpecializedSelection)
+        ]
+
+    @property
+    def specialized_unions(self) -> list[SpecializedUnion]:
+        root = self.root_selection
+        return [
+            s
+            for s in _specialize_field(root.child(self.field), self.field)
+            if isinstance(s, SpecializedUnion)
+        ]
+
+
+def selected_fields(queries: Iterable[QtGqlQueryHandlerDefinition]) -> dict[str, set[str]]:
+    """:returns: The names of the fields of each type that the operations
+    select (transitively, including union choices), by type name."""
+    ret: dict[str, set[str]] = defaultdict(set)
+    for query in queries:
+        for selection in query.specialized_selections:
+            if selection.type is not None:
+                ret[selection.type.name].update(f.name for f in selection.fields)
+    return dict(ret)
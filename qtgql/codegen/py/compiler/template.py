@@ -1,21 +1,53 @@
 from __future__ import annotations
 
+import builtins
 import inspect
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Iterable, Optional, get_type_hints
 
-from attrs import define
+from attrs import define, evolve
 from jinja2 import Environment, PackageLoader, select_autoescape
 
 if TYPE_CHECKING:  # pragma: no cover
     from qtgql.codegen.py.compiler.config import QtGqlConfig
     from qtgql.codegen.py.compiler.query import QtGqlQueriedField, QtGqlQueryHandlerDefinition
     from qtgql.codegen.py.objecttype import GqlEnumDefinition, GqlTypeDefinition
+    from qtgql.codegen.py.runtime.custom_scalars import BaseCustomScalar
 
 template_env = Environment(loader=PackageLoader("qtgql.codegen.py"), autoescape=select_autoescape())
 
 SCHEMA_TEMPLATE = template_env.get_template("schema.jinja.py")
 HANDLERS_TEMPLATE = template_env.get_template("handlers.jinja.py")
 CONFIG_TEMPLATE = template_env.get_template("config.jinja.py")
+TYPES_PACKAGE_TEMPLATE = template_env.get_template("types_package.jinja.py")
+TYPE_MODULE_TEMPLATE = template_env.get_template("type_module.jinja.py")
+
+
+@define
+class _TypeIndex:
+    types: list[GqlTypeDefinition]
+    by_name: dict[str, GqlTypeDefinition]
+    listed: set[str]
+    """Names of the types that some field is a list of."""
+
+    @classmethod
+    def of(cls, types: list[GqlTypeDefinition]) -> _TypeIndex:
+        listed = {
+            object_type.name
+            for t in types
+            for f in t.fields
+            if (model_of := f.type.is_model) and (object_type := model_of.is_object_type)
+        }
+        return cls(types=types, by_name={t.name: t for t in types}, listed=listed)
+
+
+def _return_type(func: Any) -> Any:
+    """:returns: The return annotation of `func`, resolved if it can be
+    (forward references that don't resolve at codegen time, i.e names that
+    are imported only for type checking, are returned as is)."""
+    try:
+        return get_type_hints(func).get("return", None)
+    except (NameError, TypeError):
+        return inspect.signature(func).return_annotation
 
 
 @define
@@ -24,6 +56,20 @@ class TemplateContext:
     types: list[GqlTypeDefinition]
     queries: list[QtGqlQueryHandlerDefinition]
     config: QtGqlConfig
+    scalars: Optional[list[type[BaseCustomScalar]]] = None
+    """The custom scalars to generate, all the configured scalars if None."""
+    type_prefix: str = ""
+    """Prepended to references of generated types, the module of a type
+    (see `QtGqlConfig.split_modules`) reaches other types through its
+    package."""
+    _index: Optional[_TypeIndex] = None
+    """Lookups of `types`, built on first use (and kept by `evolve()`)."""
+
+    @property
+    def _type_index(self) -> _TypeIndex:
+        if self._index is None or self._index.types is not self.types:
+            self._index = _TypeIndex.of(self.types)
+        return self._index
 
     @property
     def dependencies(self) -> list[str]:
@@ -32,18 +78,78 @@ class TemplateContext:
             assert mod
             return f"from {mod.__name__} import {t.__name__}"
 
-        ret = [build_import_statement(scalar) for scalar in self.config.custom_scalars.values()]
+        ret = [build_import_statement(scalar) for scalar in self._scalars]
+        # types that scalars expose to QML (i.e `QDateTime`), used by the properties.
+        for scalar in self._scalars:
+            qt_type = _return_type(scalar.to_qt)
+            if isinstance(qt_type, type) and qt_type.__module__ != builtins.__name__:
+                ret.append(build_import_statement(qt_type))
         ret.append(build_import_statement(self.config.base_object))
-        return ret
+        return list(dict.fromkeys(ret))
 
     @property
     def custom_scalars(self) -> list[str]:
-        return [scalar.__name__ for scalar in self.config.custom_scalars.values()]
+        return [scalar.__name__ for scalar in self._scalars]
+
+    @property
+    def _scalars(self) -> Iterable[type[BaseCustomScalar]]:
+        if self.scalars is None:
+            return self.config.custom_scalars.values()
+        return self.scalars
 
     @property
     def base_object_name(self) -> str:
         return self.config.base_object.__name__
 
+    def _is_listed(self, t: GqlTypeDefinition) -> bool:
+        return t.name in self._type_index.listed
+
+    def is_columnar(self, t: GqlTypeDefinition) -> bool:
+        """Whether a columnar model is generated for the type (see
+        `QtGqlConfig.columnar_lists`)."""
+        if not self.config.columnar_lists:
+            return False
+        # the generated type might have less fields (see `QtGqlConfig.tree_shaking`).
+        t = self._type_index.by_name.get(t.name, t)
+        return t.is_flat and self._is_listed(t)
+
+    def has_role_model(self, t: GqlTypeDefinition) -> bool:
+        """Whether a role model is generated for the type (see
+        `QtGqlConfig.role_models`), that is if some field is a list of
+        it."""
+        return self.is_columnar(t) or bool(self.config.role_models and self._is_listed(t))
+
+    def type_ref(self, t: GqlTypeDefinition) -> str:
+        return self.type_prefix + t.name
+
+    def exports(self, t: GqlTypeDefinition) -> list[str]:
+        """:returns: The names the module of a type defines."""
+        if self.has_role_model(t):
+            return [t.name, f"{t.name}ListModel"]
+        return [t.name]
+
+    def enums_of(self, t: GqlTypeDefinition) -> list[str]:
+        return sorted({enum.name for f in t.fields if (enum := f.type.is_enum)})
+
+    @property
+    def operation_types(self) -> list[str]:
+        """:returns: The names of the types (and list models) the handlers
+        refer to."""
+        ret: dict[str, None] = {}
+        for query in self.queries:
+            for selection in query.specialized_selections:
+                if selection.type is not None:
+                    ret.update(dict.fromkeys(self.exports(selection.type)))
+        return list(ret)
+
+    def cache_policy(self, t: GqlTypeDefinition) -> Optional[str]:
+        if policy := self.config.cache_policies.get(t.name, None):
+            return policy.as_code()
+        return None
+
+    def pool_size(self, t: GqlTypeDefinition) -> Optional[int]:
+        return self.config.object_pools.get(t.name, None)
+
 
 def schema_types_template(context: TemplateContext) -> str:
     return SCHEMA_TEMPLATE.render(context=context)
@@ -53,6 +159,14 @@ def handlers_template(context: TemplateContext) -> str:
     return HANDLERS_TEMPLATE.render(context=context)
 
 
+def types_package_template(context: TemplateContext) -> str:
+    return TYPES_PACKAGE_TEMPLATE.render(context=context)
+
+
+def type_module_template(context: TemplateContext, t: GqlTypeDefinition) -> str:
+    return TYPE_MODULE_TEMPLATE.render(context=evolve(context, type_prefix="_types."), type=t)
+
+
 @define
 class ConfigContext:
     p_field: QtGqlQueriedField
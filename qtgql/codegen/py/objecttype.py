@@ -82,6 +82,8 @@ class GqlFieldDefinition:
 
     @cached_property
     def property_type(self) -> str:
+        if self.type.is_custom_scalar(self.scalars):
+            return self.fget_annotation
         try:
             # this should raise if it is an inner type.
             ret = GqlTypeHinter.from_string(self.fget_annotation, self.type_map)
@@ -114,7 +116,7 @@ class GqlFieldDefinition:
     @property
     def fget(self) -> str:
         if self.type.is_custom_scalar(self.scalars):
-            return f"return self.{self.private_name}.{BaseCustomScalar.to_qt.__name__}()"
+            return f"return self.{self.private_name}.{BaseCustomScalar.qt_value.__name__}()"
         if self.type.is_enum:
             return f"return self.{self.private_name}.value"
         return f"return self.{self.private_name}"
@@ -128,6 +130,31 @@ class GqlFieldDefinition:
         if object_type:
             return object_type.has_id_field
 
+    @cached_property
+    def column(self) -> str:
+        """The `Column` of this field in a columnar model."""
+        if enum_def := self.type.is_enum:
+            return (
+                f"Column('{self.name}', default={self.default_value}, "
+                f"convert=partial(enum_value, {enum_def.name}), enum={enum_def.name})"
+            )
+        builtin_scalar = self.type.is_builtin_scalar
+        assert builtin_scalar
+        typecode = None if self.type.is_optional() else ARRAY_TYPECODES.get(builtin_scalar.tp, None)
+        convert = ", convert=bool" if builtin_scalar.tp is bool and typecode else ""
+        return (
+            f"Column('{self.name}', typecode={typecode!r}, default={self.default_value}{convert})"
+        )
+
+    @cached_property
+    def holds_nodes(self) -> bool:
+        """Whether the value of this field is an object, a union or a list of
+        those."""
+        return bool(self.type.is_object_type or self.type.is_model or self.type.is_union())
+
+
+ARRAY_TYPECODES: dict[type, str] = {int: "q", float: "d", bool: "b"}
+
 
 @define(slots=False)
 class GqlTypeDefinition:
@@ -149,6 +176,11 @@ class GqlTypeDefinition:
     def fields(self) -> list[GqlFieldDefinition]:
         return list(self.fields_dict.values())
 
+    @cached_property
+    def is_flat(self) -> bool:
+        """Whether all the fields are builtin scalars or enums."""
+        return all(f.type.is_builtin_scalar or f.type.is_enum for f in self.fields)
+
 
 @define
 class EnumValue:
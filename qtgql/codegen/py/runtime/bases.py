@@ -1,17 +1,59 @@
 from __future__ import annotations
 
-import contextlib
-from typing import TYPE_CHECKING, ClassVar, Generic, NamedTuple, Optional, TypeVar
-
-from PySide6.QtCore import QAbstractListModel, QByteArray, QObject, Qt, Signal, Slot
+import bisect
+import itertools
+import sys
+import time
+from collections import defaultdict, deque
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ClassVar,
+    Generic,
+    Iterable,
+    NamedTuple,
+    Optional,
+    Protocol,
+    TypeVar,
+    Union,
+)
+
+import shiboken6
+from PySide6.QtCore import (
+    QAbstractListModel,
+    QByteArray,
+    QMetaMethod,
+    QModelIndex,
+    QObject,
+    Qt,
+    Signal,
+    Slot,
+)
+
+from qtgql.codegen.py.runtime.cachepolicy import CachePolicy, EvictionStrategy
+from qtgql.codegen.py.runtime.collector import get_collector, register_store, track_model
+from qtgql.codegen.py.runtime.environment import get_gql_env
+from qtgql.codegen.py.runtime.lazy import Deferred, RawRow, in_store
+from qtgql.codegen.py.runtime.progressive import get_active_materializer
+from qtgql.codegen.py.runtime.teardown import get_delete_queue
 
 if TYPE_CHECKING:
     from typing_extensions import Self
 
+    from qtgql.codegen.py.runtime.pool import ObjectPool
     from qtgql.codegen.py.runtime.queryhandler import OperationMetaData, SelectionConfig
+    from qtgql.codegen.py.runtime.structhash import SubtreeHash
 from qtgql.tools import qproperty, slot
 
-__all__ = ["QGraphQListModel", "get_base_graphql_object"]
+__all__ = [
+    "DetachedNodes",
+    "QGraphQListModel",
+    "get_base_graphql_object",
+    "loose_tree",
+    "reachable",
+]
 
 
 class _BaseQGraphQLObject(QObject):
@@ -19,9 +61,18 @@ class _BaseQGraphQLObject(QObject):
     id: str
     __singleton__: Self
     __store__: ClassVar[QGraphQLObjectStore[Self]]
+    _subtree_hash: Optional[SubtreeHash] = None
+    """Hash of the payload this node was last updated with (see
+    `QtGqlConfig.structural_hashing`)."""
+    _decoded: Optional[tuple[dict, int]] = None
+    """The decoded data this node was last applied with and the epoch of
+    then (see `QtGqlConfig.two_phase_decode`)."""
+    _deferred: Optional[dict[str, Deferred]] = None
+    """Child fields that are not materialized yet (see
+    `QtGqlConfig.lazy_children`)."""
 
     def __init_subclass__(cls, **kwargs):
-        cls.__store__ = QGraphQLObjectStore()
+        cls.__store__ = QGraphQLObjectStore(cls)
 
     def __init__(self, parent: Optional[QObject] = None):
         super().__init__(parent)
@@ -31,11 +82,17 @@ class _BaseQGraphQLObject(QObject):
         return self.__class__.__name__
 
     @classmethod
-    def from_dict(cls, parent: QObject, data: dict, config: SelectionConfig):
+    def from_dict(
+        cls,
+        parent: Optional[QObject],
+        data: dict,
+        config: SelectionConfig,
+        metadata: OperationMetaData,
+    ) -> Self:
         """Creates a new instance from GraphQL raw data."""
         raise NotImplementedError
 
-    def update(self, data, config: SelectionConfig) -> None:
+    def update(self, data: dict, config: SelectionConfig, metadata: OperationMetaData) -> None:
         """updates a node based on new GraphQL data."""
         raise NotImplementedError
 
@@ -47,16 +104,62 @@ class _BaseQGraphQLObject(QObject):
         otherwise the pointer to this object is release and this object
         would be deleted.
         """
+        loose_tree(self, metadata)
+
+    def _detach_children(self) -> list[QObject]:
+        """Detaches and returns the direct child nodes and models of this
+        object, real implementation is generated."""
+        raise NotImplementedError
+
+    def _child_nodes(self) -> list[QObject]:
+        """:returns: The direct child nodes and models of this object, real
+        implementation is generated."""
+        raise NotImplementedError
+
+    def _defer(self, name: str, data: Any, build: Callable[[Any], Any], types: Any) -> bool:
+        """Keeps the payload of a child field until it is first accessed.
+
+        :returns: False if the field should be materialized now (null
+            payloads and payloads of nodes that are in the store already).
+        """
+        if not data or in_store(data, types):
+            return False
+        if self._deferred is None:
+            self._deferred = {}
+        self._deferred[name] = Deferred(build, data)
+        return True
+
+    def _redefer(self, name: str, data: Any, build: Callable[[Any], Any], types: Any) -> bool:
+        """Used by updaters, a field that is still deferred takes the new
+        payload instead of being updated.
+
+        :returns: False if the field should be updated as usual.
+        """
+        if not self._deferred or name not in self._deferred:
+            return False
+        if self._defer(name, data, build, types):
+            return True
+        self._materialize(name)
+        return False
+
+    def _materialize(self, name: str) -> None:
+        assert self._deferred
+        build, data = self._deferred.pop(name)
+        setattr(self, "_" + name, build(data))
+
+    def _reset(self) -> None:
+        """Resets all fields to their default values without emitting
+        signals (used by `ObjectPool`), real implementation is generated."""
         raise NotImplementedError
 
     @classmethod
     def default_instance(cls) -> Self:
         # used for default values.
-        try:
-            return cls.__singleton__  # type: ignore
-        except AttributeError:
-            cls.__singleton__ = cls()
-            return cls.__singleton__
+        default = cls.__dict__.get("__singleton__", None)
+        # might have been deleted by an owner.
+        if default is None or not shiboken6.isValid(default):
+            default = cls.__singleton__ = cls()
+        return default
 
 
 T_BaseQGraphQLObject = TypeVar("T_BaseQGraphQLObject", bound=_BaseQGraphQLObject)
@@ -72,35 +175,239 @@ class NodeRecord(NamedTuple):
 
 
 class QGraphQLObjectStore(Generic[T_BaseQGraphQLObject]):
-    def __init__(self) -> None:
+    def __init__(self, node_type: Optional[type[T_BaseQGraphQLObject]] = None) -> None:
+        self.node_type = node_type
         self._data: dict[str, NodeRecord] = {}
+        self._added_at: dict[str, float] = {}
+        self._written_at: dict[str, float] = {}
+        """Ordered by write time (oldest first)."""
+        self._unretained: deque[T_BaseQGraphQLObject] = deque()
+        self._evicted: dict[int, NodeRecord] = {}
+        """Records that are still retained but are no longer normalized."""
+        self.policy: Optional[CachePolicy] = None
+        self._env_name: Optional[str] = None
+        self.pool: Optional[ObjectPool[T_BaseQGraphQLObject]] = None
+        register_store(self)
+
+    def set_pool(self, pool: ObjectPool[T_BaseQGraphQLObject]) -> None:
+        self.pool = pool
+
+    def recycle(self, nodes: list[T_BaseQGraphQLObject]) -> list[T_BaseQGraphQLObject]:
+        """Passes released nodes to the pool if there is one.
+
+        :returns: nodes that should be deleted.
+        """
+        if self.pool is None:
+            return nodes
+        return self.pool.release(nodes)
+
+    def set_policy(self, policy: CachePolicy, env_name: str) -> None:
+        """:param env_name: The environment used to refetch operations that
+        retain expired nodes."""
+        self.policy = policy
+        self._env_name = env_name
+        if policy.ttl is not None:
+            # expiration is checked on sweeps.
+            get_collector().sweep_every(min(max(policy.ttl, 0.1), 1.0))
 
     def get_node(self, id_: str) -> Optional[_BaseQGraphQLObject]:
         assert id_
         if found := self._data.get(id_, None):
+            if self.policy and self.policy.eviction is EvictionStrategy.LRU:
+                self._data[id_] = self._data.pop(id_)
             return found.node
 
+    def contains(self, id_: str) -> bool:
+        """Unlike `get_node()` this doesn't count as an access."""
+        return id_ in self._data
+
     def add_record(self, record: NodeRecord):
-        assert record.node.id
-        self._data[record.node.id] = record
+        # `_id` rather than the `id` property, this is called per created row.
+        id_ = record.node._id
+        assert id_
+        now = time.monotonic()
+        self._data[id_] = record
+        self._added_at[id_] = now
+        self._written_at.pop(id_, None)
+        self._written_at[id_] = now
+        if self.policy and self.policy.max_resident is not None:
+            self._evict(len(self._data) - self.policy.max_resident)
+
+    def retain(self, node: T_BaseQGraphQLObject, operation_name: str) -> None:
+        """Adds a retainer to a node that is already in the store."""
+        if (record := self._data.get(node._id, None)) and record.node is node:
+            record.retain(operation_name)
+
+    def touch(self, node: T_BaseQGraphQLObject) -> None:
+        """Marks a node as freshly written (used by types with a TTL)."""
+        if self._written_at.pop(node._id, None) is not None:
+            self._written_at[node._id] = time.monotonic()
+
+    def _evict(self, count: int) -> None:
+        # `_data` is ordered by insertion (or by access for LRU).
+        for id_ in list(itertools.islice(self._data, max(count, 0))):
+            record = self._data.pop(id_)
+            self._added_at.pop(id_, None)
+            self._written_at.pop(id_, None)
+            self._evicted[id(record.node)] = record
+
+    def enforce_policy(self) -> None:
+        """Refetches the operations that retain expired nodes.
+
+        Only expired nodes are visited (`_written_at` is ordered by write
+        time).
+        """
+        if not self.policy or self.policy.ttl is None:
+            return
+        now = time.monotonic()
+        ttl = self.policy.ttl
+        written_at = self._written_at
+        expired: list[str] = []
+        for id_, at in written_at.items():
+            if now - at <= ttl:
+                break
+            expired.append(id_)
+        if not expired:
+            return
+        expired_retainers: set[str] = set()
+        for id_ in expired:
+            expired_retainers.update(self._data[id_].retainers)
+            # the refetch would update it, don't refetch again meanwhile.
+            del written_at[id_]
+            written_at[id_] = now
+        assert self._env_name
+        env = get_gql_env(self._env_name)
+        for operation_name in expired_retainers:
+            # local writes (see `write_fragment()`) have nothing to refetch.
+            if handler := env.find_handler(operation_name):
+                handler.refetch()
+
+    def records(self) -> list[NodeRecord]:
+        return list(self._data.values())
+
+    def retained_by(self, operation_name: str) -> list[NodeRecord]:
+        """:returns: The records (evicted ones included) that `operation_name`
+        retains."""
+        return [
+            record
+            for record in itertools.chain(self._data.values(), self._evicted.values())
+            if operation_name in record.retainers
+        ]
+
+    def added_at(self, id_: str) -> float:
+        """:returns: `time.monotonic()` of when the node was added to the store."""
+        return self._added_at[id_]
 
     def loose(self, node: T_BaseQGraphQLObject, operation_name: str) -> None:
         assert node.id
-        with contextlib.suppress(
-            KeyError
-        ):  # This node was already deleted, we can safely ignore it
-            record = self._data[node.id]
+        self.loose_many((node,), operation_name)
+
+    def loose_many(self, nodes: Iterable[T_BaseQGraphQLObject], operation_name: str) -> None:
+        """Releases the retention of `operation_name` from all the nodes.
+
+        Nodes that has no retainers anymore are removed from the store
+        and would be deleted by the `StoreCollector`.
+        """
+        data = self._data
+        unretained = self._unretained
+        prev_len = len(unretained)
+        for node in nodes:
+            record = data.get(node.id, None)
+            if record is None or record.node is not node:
+                record = self._evicted.get(id(node), None)
+            # This node was already deleted, we can safely ignore it
+            if record is None or operation_name not in record.retainers:
+                continue
             record.retainers.remove(operation_name)
             if not record.retainers:
-                self._data.pop(node.id)
-                node.deleteLater()  # we can delete it now since it has no retainers.
+                if self._evicted.pop(id(node), None) is None:
+                    data.pop(node.id)
+                    self._added_at.pop(node.id, None)
+                    self._written_at.pop(node.id, None)
+                unretained.append(node)
+        if len(unretained) > prev_len:
+            get_collector().schedule()
+
+    def has_garbage(self) -> bool:
+        return bool(self._unretained)
+
+    def reclaim(self, deadline: float) -> list[T_BaseQGraphQLObject]:
+        """Pops unretained nodes until `deadline` (`time.perf_counter()`) is
+        reached."""
+        ret = []
+        unretained = self._unretained
+        while unretained:
+            ret.append(unretained.popleft())
+            if len(ret) % 64 == 0 and time.perf_counter() > deadline:
+                break
+        return ret
+
+    def drop_default_instance(self) -> Optional[T_BaseQGraphQLObject]:
+        """Drops the default instance of the node type if there are no nodes
+        in this store and nothing else uses it (see `_is_owned()`), the
+        type creates a new one on next use.
+
+        :returns: The dropped instance, it is safe to delete.
+        """
+        if self.node_type is None or self._data:
+            return None
+        default = self.node_type.__dict__.get("__singleton__", None)
+        if default is None:
+            return None
+        if not shiboken6.isValid(default):
+            # deleted by its owner.
+            delattr(self.node_type, "__singleton__")
+            return None
+        # referenced by the type, `default` and the argument of getrefcount.
+        if sys.getrefcount(default) > 3 or _is_owned(default):
+            return None
+        delattr(self.node_type, "__singleton__")
+        return default
+
+
+def _is_owned(obj: QObject) -> bool:
+    """:returns: Whether `obj` has a parent or any of its signals is
+    connected (i.e a QML binding to one of its properties)."""
+    if obj.parent() is not None:
+        return True
+    meta = obj.metaObject()
+    for index in range(meta.methodCount()):
+        method = meta.method(index)
+        if method.methodType() == QMetaMethod.MethodType.Signal and obj.isSignalConnected(method):
+            return True
+    return False
+
+
+class PagerProto(Protocol):  # pragma: no cover
+    def can_fetch_more(self) -> bool:
+        ...
+
+    def fetch_more(self) -> None:
+        ...
 
 
 class QGraphQListModel(QAbstractListModel, Generic[T_BaseQGraphQLObject]):
     OBJECT_ROLE = Qt.ItemDataRole.UserRole + 1
     _role_names = {OBJECT_ROLE: QByteArray("object")}  # type: ignore
+    FIELD_ROLES: ClassVar[dict[str, int]] = {}
+    """Field name -> role, set by the generated role models (see
+    `QtGqlConfig.role_models`) so delegates can bind to fields
+    directly."""
+    RAW_FIELDS: ClassVar[frozenset[str]] = frozenset()
+    """Fields whose role is read from the payload of rows that were not
+    created yet (see `QtGqlConfig.lazy_rows`)."""
+    _role_fields: ClassVar[dict[int, str]] = {}
     currentIndexChanged = Signal()
 
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        if cls.FIELD_ROLES:
+            cls._role_fields = {role: name for name, role in cls.FIELD_ROLES.items()}
+            cls._role_names = {
+                cls.OBJECT_ROLE: QByteArray(b"object"),
+                **{role: QByteArray(name.encode()) for role, name in cls._role_fields.items()},
+            }
+
     def __init__(
         self,
         parent: Optional[QObject],
@@ -109,6 +416,49 @@ class QGraphQListModel(QAbstractListModel, Generic[T_BaseQGraphQLObject]):
         super().__init__(parent)
         self._data = data
         self._current_index: int = 0
+        self._create: Optional[Callable[[dict], T_BaseQGraphQLObject]] = None
+        """Materializes `RawRow`s, set for models with lazy rows."""
+        self._pager: Optional[PagerProto] = None
+        if parent is not None:
+            # owned models are collected once they are detached from their owner.
+            track_model(self)
+
+    @classmethod
+    def from_rows(
+        cls,
+        parent: Optional[QObject],
+        rows: list[dict],
+        create: Callable[[dict], T_BaseQGraphQLObject],
+        lazy_types: Any = None,
+    ) -> QGraphQListModel[T_BaseQGraphQLObject]:
+        """Creates a model with a node for each row, used by the generated
+        deserializers.
+
+        If the result is built progressively (see
+        `BaseQueryHandler.set_frame_budget()`) only the rows that fit in
+        the current frame are created, the rest are inserted later.
+
+        :param lazy_types: The row type (or a typename -> type mapping
+            for unions) if rows should be created on first access (see
+            `QtGqlConfig.lazy_rows`), rows of nodes that are in the store
+            already are created right away.
+        """
+        if lazy_types is not None:
+            model = cls(
+                parent=parent,
+                data=[
+                    create(row) if in_store(row, lazy_types) else RawRow(row)  # type: ignore
+                    for row in rows
+                ],
+            )
+            model._create = create
+            return model
+        materializer = get_active_materializer()
+        if materializer is None:
+            return cls(parent=parent, data=[create(row) for row in rows])
+        model = cls(parent=parent, data=[])
+        model._data.extend(materializer.build_rows(model, rows, create))
+        return model
 
     @slot
     def set_current_index(self, i: int) -> None:
@@ -121,7 +471,31 @@ class QGraphQListModel(QAbstractListModel, Generic[T_BaseQGraphQLObject]):
 
     @qproperty(QObject, notify=currentIndexChanged)  # type: ignore
     def currentObject(self) -> Optional[T_BaseQGraphQLObject]:
-        return self._data[self._current_index]
+        return self.node_at(self._current_index)
+
+    def node_at(self, index: int) -> T_BaseQGraphQLObject:
+        """:returns: The node of a row, creating it if it wasn't yet."""
+        node = self._data[index]
+        if type(node) is RawRow:
+            assert self._create is not None
+            node = self._data[index] = self._create(node.data)  # type: ignore
+        return node
+
+    def _live_nodes(self) -> Iterable[T_BaseQGraphQLObject]:
+        """The rows that were created (used when the model is released)."""
+        return (row for row in self._data if type(row) is not RawRow)
+
+    def set_pager(self, pager: Optional[PagerProto]) -> None:
+        """Lets views load the next page of rows when they scroll to the
+        end of this model (see `BaseQueryHandler.fetch_more()`)."""
+        self._pager = pager
+
+    def canFetchMore(self, parent=None) -> bool:
+        return self._pager is not None and self._pager.can_fetch_more()
+
+    def fetchMore(self, parent=None) -> None:
+        if self._pager is not None:
+            self._pager.fetch_more()
 
     def rowCount(self, *args, **kwargs) -> int:
         return len(self._data)
@@ -132,7 +506,12 @@ class QGraphQListModel(QAbstractListModel, Generic[T_BaseQGraphQLObject]):
     def data(self, index, role=...) -> Optional[T_BaseQGraphQLObject]:
         if index.row() < len(self._data) and index.isValid():
             if role == self.OBJECT_ROLE:
-                return self._data[index.row()]
+                return self.node_at(index.row())
+            if name := self._role_fields.get(role, None):
+                row = self._data[index.row()]
+                if type(row) is RawRow and name in self.RAW_FIELDS and name in row.data:
+                    return row.data[name]  # type: ignore
+                return getattr(self.node_at(index.row()), name)
             raise NotImplementedError(
                 f"role {role} is not a valid role for {self.__class__.__name__}"
             )
@@ -153,10 +532,7 @@ class QGraphQListModel(QAbstractListModel, Generic[T_BaseQGraphQLObject]):
 
     @slot
     def clear(self) -> None:
-        if self._data:
-            self.beginRemoveRows(self.index(0).parent(), 0, self.rowCount())
-            self._data = []
-            self.endRemoveRows()
+        self.remove_range(0, self.rowCount())
 
     @Slot(int, QObject)
     def insert(self, index: int, v: T_BaseQGraphQLObject):
@@ -172,19 +548,362 @@ class QGraphQListModel(QAbstractListModel, Generic[T_BaseQGraphQLObject]):
             self._data.append(v)
             self.endInsertRows()
 
+    def extend(self, nodes: Iterable[T_BaseQGraphQLObject]) -> None:
+        """Appends rows with a single insertion."""
+        self.insert_many(self.rowCount(), nodes)
+
+    def insert_many(self, index: int, nodes: Iterable[T_BaseQGraphQLObject]) -> None:
+        """Inserts rows before `index` with a single insertion, an index
+        past the end appends."""
+        nodes = list(nodes)
+        if not nodes:
+            return
+        index = max(0, min(index, self.rowCount()))
+        self.beginInsertRows(QModelIndex(), index, index + len(nodes) - 1)
+        self._data[index:index] = nodes
+        self.endInsertRows()
+
+    def remove_range(self, row: int, count: int) -> list[T_BaseQGraphQLObject]:
+        """Removes `count` rows starting at `row` with a single removal.
+
+        :returns: The removed rows.
+        """
+        if count <= 0:
+            return []
+        last = row + count - 1
+        if row < 0 or last >= self.rowCount():
+            raise IndexError(f"can't remove rows {row}-{last} of {self.rowCount()}")
+        self.beginRemoveRows(QModelIndex(), row, last)
+        removed = self._data[row : last + 1]
+        del self._data[row : last + 1]
+        self.endRemoveRows()
+        return removed
+
+    def replace_range(
+        self, row: int, nodes: Iterable[T_BaseQGraphQLObject]
+    ) -> list[T_BaseQGraphQLObject]:
+        """Replaces the rows starting at `row` with `nodes`, emits a single
+        `dataChanged` for them.
+
+        :returns: The replaced rows.
+        """
+        nodes = list(nodes)
+        if not nodes:
+            return []
+        last = row + len(nodes) - 1
+        if row < 0 or last >= self.rowCount():
+            raise IndexError(f"can't replace rows {row}-{last} of {self.rowCount()}")
+        replaced = self._data[row : last + 1]
+        self._data[row : last + 1] = nodes
+        self.dataChanged.emit(self.index(row), self.index(last))
+        return replaced
+
+    def reset_with(self, nodes: Iterable[T_BaseQGraphQLObject]) -> list[T_BaseQGraphQLObject]:
+        """Replaces all the rows with a model reset, cheaper for views than
+        removing and inserting everything.
+
+        :returns: The previous rows.
+        """
+        self.beginResetModel()
+        previous = self._data[:]
+        self._data[:] = nodes
+        self.endResetModel()
+        return previous
+
     def update(self, data: list[dict], node_selection: SelectionConfig) -> None:
         raise NotImplementedError
 
+    def reconcile(
+        self,
+        data: list[dict],
+        create: Callable[[dict], T_BaseQGraphQLObject],
+        update: Callable[[T_BaseQGraphQLObject, dict], None],
+    ) -> None:
+        """Updates the rows to match arrived data (used by the generated
+        updaters).
+
+        Rows are matched by id, rows that are no longer present are
+        removed and new rows are inserted, the rows that are kept are
+        moved with the minimal amount of moves (the rows of the longest
+        increasing subsequence of their previous positions stay in place).
+        Each change emits the matching ranged model signals.
+
+        If the ids are missing or not unique, rows are matched by index.
+
+        :param create: Creates a node for a row that doesn't exist.
+        :param update: Updates an existing node with its row data.
+        """
+        if self._create is not None:
+            # rows that weren't accessed yet only take the new payload.
+            self._create = create
+            create, update = RawRow, partial(_update_lazy_row, update)  # type: ignore
+        if not self.FIELD_ROLES:
+            return self._reconcile(data, create, update)
+        changed: dict[int, list[int]] = {}
+        self._reconcile(data, create, partial(self._update_roles, update, changed))
+        for i, row in enumerate(self._data):
+            if roles := changed.get(id(row), None):
+                index = self.index(i)
+                self.dataChanged.emit(index, index, roles)
+
+    def _update_roles(
+        self,
+        update: Callable[[T_BaseQGraphQLObject, dict], None],
+        changed: dict[int, list[int]],
+        row: T_BaseQGraphQLObject,
+        data: dict,
+    ) -> None:
+        """Updates a row and collects the roles of the fields that
+        changed."""
+        before = self._role_values(row)
+        update(row, data)
+        after = self._role_values(row)
+        roles = [
+            role
+            for role, prev, current in zip(self.FIELD_ROLES.values(), before, after)
+            if prev != current
+        ]
+        if roles:
+            changed[id(row)] = roles
+
+    def _role_values(self, row: Union[T_BaseQGraphQLObject, RawRow]) -> list:
+        if type(row) is RawRow:
+            return [row.data.get(name, None) for name in self.FIELD_ROLES]  # type: ignore
+        return [getattr(row, "_" + name, None) for name in self.FIELD_ROLES]
+
+    def _reconcile(
+        self,
+        data: list[dict],
+        create: Callable[[dict], T_BaseQGraphQLObject],
+        update: Callable[[T_BaseQGraphQLObject, dict], None],
+    ) -> None:
+        keys = [node.get("id", None) for node in data]
+        old_keys = [_row_id(row) for row in self._data]
+        if (
+            None in keys
+            or None in old_keys
+            or len(set(keys)) != len(keys)
+            or len(set(old_keys)) != len(old_keys)
+        ):
+            return self._reconcile_by_index(data, create, update)
+
+        # remove rows that are gone, in contiguous ranges from the end.
+        arrived = set(keys)
+        gone = [i for i, key in enumerate(old_keys) if key not in arrived]
+        for first, last in reversed(_contiguous_ranges(gone)):
+            DetachedNodes.add(self.remove_range(first, last - first + 1))
+
+        rows = self._data
+        position = {_row_id(row): i for i, row in enumerate(rows)}
+        kept = [position[key] for key in keys if key in position]
+        stable = {kept[i] for i in _longest_increasing_subsequence(kept)}
+        by_key = {_row_id(row): row for row in rows}
+        anchor = len(rows)
+        pending: list[T_BaseQGraphQLObject] = []
+        # place rows from the end, each right before the previously placed one.
+        for key, node_data in zip(reversed(keys), reversed(data)):
+            row = by_key.get(key, None)
+            if row is None:
+                pending.append(create(node_data))
+                continue
+            self._insert_pending(anchor, pending)
+            update(row, node_data)
+            # usually the row is already right before the anchor.
+            current = anchor - 1 if anchor and rows[anchor - 1] is row else rows.index(row)
+            if position[key] in stable or current == anchor - 1:
+                anchor = current
+                continue
+            self.beginMoveRows(QModelIndex(), current, current, QModelIndex(), anchor)
+            rows.pop(current)
+            anchor = anchor - 1 if current < anchor else anchor
+            rows.insert(anchor, row)
+            self.endMoveRows()
+        self._insert_pending(anchor, pending)
+
+    def _insert_pending(self, index: int, pending: list[T_BaseQGraphQLObject]) -> None:
+        """Inserts rows that were collected in reverse order."""
+        if pending:
+            self.insert_many(index, reversed(pending))
+            pending.clear()
+
+    def _reconcile_by_index(
+        self,
+        data: list[dict],
+        create: Callable[[dict], T_BaseQGraphQLObject],
+        update: Callable[[T_BaseQGraphQLObject, dict], None],
+    ) -> None:
+        prev_len = len(self._data)
+        new_len = len(data)
+        if new_len < prev_len:
+            DetachedNodes.add(self.remove_range(new_len, prev_len - new_len))
+        for index, node_data in enumerate(data[:prev_len]):
+            row = self._data[index]
+            id_ = node_data.get("id", None)
+            if id_ and _row_id(row) == id_:
+                update(row, node_data)
+            else:
+                DetachedNodes.add(self.replace_range(index, [create(node_data)]))
+        if new_len > prev_len:
+            self.extend(create(node_data) for node_data in data[prev_len:])
+
     def removeRows(self, row: int, count: int, parent=None) -> bool:
         # check that this is a valid removal.
-        if row + count <= self.rowCount():
-            self.beginRemoveRows(self.index(0).parent(), row, count)
-            end = self._data[row + count :]
-            start = self._data[:row]
-            self._data = start + end
-            self.endRemoveRows()
+        if count > 0 and row >= 0 and row + count <= self.rowCount():
+            self.remove_range(row, count)
             return True
-        return False  # pragma: no cover
+        return False
+
+
+def _row_id(row: Union[_BaseQGraphQLObject, RawRow]) -> Optional[str]:
+    if type(row) is RawRow:
+        return row.data.get("id", None)  # type: ignore
+    return getattr(row, "_id", None)
+
+
+def _update_lazy_row(
+    update: Callable[[_BaseQGraphQLObject, dict], None],
+    row: Union[_BaseQGraphQLObject, RawRow],
+    data: dict,
+) -> None:
+    if type(row) is RawRow:
+        row.data = data  # type: ignore
+    else:
+        update(row, data)  # type: ignore
+
+
+def _contiguous_ranges(indices: list[int]) -> list[tuple[int, int]]:
+    """:returns: (first, last) of each run of consecutive sorted indices."""
+    ranges: list[tuple[int, int]] = []
+    for i in indices:
+        if ranges and ranges[-1][1] == i - 1:
+            ranges[-1] = (ranges[-1][0], i)
+        else:
+            ranges.append((i, i))
+    return ranges
+
+
+def _longest_increasing_subsequence(seq: list[int]) -> list[int]:
+    """:returns: Indices (in `seq`) of a longest strictly increasing
+    subsequence, O(n log n)."""
+    tails: list[int] = []  # index in seq of the smallest tail of each length.
+    tail_values: list[int] = []
+    prev: list[int] = [-1] * len(seq)
+    for i, value in enumerate(seq):
+        pos = bisect.bisect_left(tail_values, value)
+        if pos:
+            prev[i] = tails[pos - 1]
+        if pos == len(tails):
+            tails.append(i)
+            tail_values.append(value)
+        else:
+            tails[pos] = i
+            tail_values[pos] = value
+    ret: list[int] = []
+    i = tails[-1] if tails else -1
+    while i != -1:
+        ret.append(i)
+        i = prev[i]
+    ret.reverse()
+    return ret
+
+
+def loose_tree(
+    root: Union[_BaseQGraphQLObject, QGraphQListModel],
+    metadata: OperationMetaData,
+    keep: Optional[set[int]] = None,
+) -> None:
+    """Releases the retention of an operation from `root` and all of its
+    descendants.
+
+    The tree is walked iteratively so deep trees won't hit the recursion
+    limit, store retention is released in bulk (per store) and the
+    deletion of released objects is scheduled in time-sliced batches
+    (nodes that are in a store are reclaimed by the `StoreCollector`).
+
+    :param keep: `id()`s of objects that are still used by the operation,
+        they (and their descendants) are left as is.
+    """
+    _loose_trees([root], metadata, keep)
+
+
+def _loose_trees(
+    roots: Iterable[QObject], metadata: OperationMetaData, keep: Optional[set[int]] = None
+) -> None:
+    stack: list[QObject] = list(roots)
+    seen: set[int] = set(keep) if keep else set()
+    by_store: dict[QGraphQLObjectStore, list[_BaseQGraphQLObject]] = defaultdict(list)
+    no_id_by_store: dict[QGraphQLObjectStore, list[_BaseQGraphQLObject]] = defaultdict(list)
+    doomed: list[QObject] = []
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        if isinstance(node, QGraphQListModel):
+            # rows that were never accessed have nothing to release.
+            stack.extend(node._live_nodes())
+            doomed.append(node)
+            continue
+        assert isinstance(node, _BaseQGraphQLObject)
+        stack.extend(node._detach_children())
+        if not hasattr(node, "_id"):
+            # type with no ID wouldn't clear up itself at the store. delete it here.
+            no_id_by_store[node.__store__].append(node)
+        elif node._id:
+            by_store[node.__store__].append(node)
+
+    for store, nodes in by_store.items():
+        store.loose_many(nodes, metadata.operation_name)
+    for store, nodes in no_id_by_store.items():
+        doomed.extend(store.recycle(nodes))
+    get_delete_queue().enqueue(doomed)
+
+
+def reachable(root: Optional[QObject]) -> set[int]:
+    """:returns: `id()`s of the objects that were created under `root`,
+    rows and children that are still deferred are not created."""
+    ret: set[int] = set()
+    stack = [root] if root is not None else []
+    while stack:
+        node = stack.pop()
+        if id(node) in ret:
+            continue
+        ret.add(id(node))
+        if isinstance(node, QGraphQListModel):
+            stack.extend(node._live_nodes())
+        elif isinstance(node, _BaseQGraphQLObject):
+            stack.extend(node._child_nodes())
+    return ret
+
+
+class DetachedNodes:
+    """Collects the nodes that left the data of an operation during an
+    update (rows that were removed or replaced).
+
+    A node can leave a list and show up elsewhere in the same result,
+    hence it is released only once the update is done and only if it
+    is not reachable from the data of the operation anymore (see
+    `BaseQueryHandler.releasing_detached()`).
+    """
+
+    active: ClassVar[Optional[DetachedNodes]] = None
+
+    def __init__(self) -> None:
+        self.nodes: list[_BaseQGraphQLObject] = []
+
+    @classmethod
+    def add(cls, nodes: Iterable[Union[_BaseQGraphQLObject, RawRow]]) -> None:
+        """Used by models when rows leave them, rows that were never created
+        have nothing to release."""
+        if (active := cls.active) is not None:
+            active.nodes.extend(node for node in nodes if type(node) is not RawRow)  # type: ignore
+
+    def release(self, root: Optional[QObject], metadata: OperationMetaData) -> None:
+        if not self.nodes:
+            return
+        keep = reachable(root)
+        if released := [node for node in self.nodes if id(node) not in keep]:
+            _loose_trees(released, metadata, keep)
 
 
 def get_base_graphql_object(name: str) -> type[_BaseQGraphQLObject]:
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import enum
+from typing import Optional
+
+from attrs import define
+
+__all__ = ["CachePolicy", "EvictionStrategy"]
+
+
+class EvictionStrategy(enum.Enum):
+    LRU = "LRU"
+    """Evicts the least recently accessed node."""
+    FIFO = "FIFO"
+    """Evicts the node that was added first."""
+
+
+@define(frozen=True)
+class CachePolicy:
+    """Per-type cache policy, enforced by the `QGraphQLObjectStore` of the
+    type.
+
+    ```python
+    from qtgql.codegen.py.runtime.cachepolicy import CachePolicy
+
+    telemetry_policy = CachePolicy(ttl=5, max_resident=1000)
+    ```
+    """
+
+    ttl: Optional[float] = None
+    """Seconds since a node was last written before it is considered expired.
+
+    Expired nodes trigger a refetch of the operations that retain them.
+    Expiration is checked on `StoreCollector` sweeps, which run
+    periodically once a type with a TTL is imported.
+    """
+    max_resident: Optional[int] = None
+    """Maximum nodes to keep normalized in the store.
+
+    Evicted nodes are no longer shared between operations; they stay
+    alive until the operations that retain them release them.
+    """
+    eviction: EvictionStrategy = EvictionStrategy.LRU
+
+    def as_code(self) -> str:
+        """:returns: A python expression that constructs this policy (used by
+        the codegen)."""
+        return (
+            f"{self.__class__.__name__}(ttl={self.ttl!r}, max_resident={self.max_resident!r}, "
+            f"eviction={EvictionStrategy.__name__}.{self.eviction.name})"
+        )
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import time
+import weakref
+from typing import TYPE_CHECKING, ClassVar, NamedTuple, Optional
+
+import shiboken6
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from qtgql.codegen.py.runtime.teardown import get_delete_queue
+from qtgql.tools import slot
+
+if TYPE_CHECKING:  # pragma: no cover
+    from qtgql.codegen.py.runtime.bases import QGraphQListModel, QGraphQLObjectStore
+
+__all__ = ["CollectStats", "StoreCollector", "get_collector"]
+
+
+class CollectStats(NamedTuple):
+    nodes: int = 0
+    """Nodes that had no retainers."""
+    models: int = 0
+    """List models that were detached from their owner."""
+    defaults: int = 0
+    """Default instances of types that had no living nodes."""
+
+    def merge(self, other: CollectStats) -> CollectStats:
+        return CollectStats(*(a + b for a, b in zip(self, other)))
+
+
+_STORES: weakref.WeakSet[QGraphQLObjectStore] = weakref.WeakSet()
+_MODELS: weakref.WeakSet[QGraphQListModel] = weakref.WeakSet()
+
+
+def register_store(store: QGraphQLObjectStore) -> None:
+    _STORES.add(store)
+
+
+def track_model(model: QGraphQListModel) -> None:
+    _MODELS.add(model)
+
+
+class StoreCollector(QObject):
+    """Reclaims garbage of all the `QGraphQLObjectStore`s in the background.
+
+    Releasing a node (i.e on `unconsume()`) only drops its retention,
+    the actual reclaim happens here on a zero-timer (or on an interval
+    if `start()` was called). Each sweep is bounded by `budget_ms` and
+    continues on the next event-loop turn if it didn't finish.
+
+    Sweeps also refetch the operations that retain nodes whose
+    `CachePolicy.ttl` expired.
+    """
+
+    collected = Signal(int, int, int)
+    """Emitted after a sweep with the reclaimed (nodes, models, defaults)."""
+
+    instance: ClassVar[Optional[StoreCollector]] = None
+
+    def __init__(self, budget_ms: float = 4.0, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.budget_ms = budget_ms
+        self.total = CollectStats()
+        self._sweep_timer = QTimer(self)
+        self._sweep_timer.setSingleShot(True)
+        self._sweep_timer.setInterval(0)
+        self._sweep_timer.timeout.connect(self._on_timeout)  # type: ignore
+        self._idle_timer = QTimer(self)
+        self._idle_timer.timeout.connect(self._on_timeout)  # type: ignore
+
+    @property
+    def stores(self) -> list[QGraphQLObjectStore]:
+        return list(_STORES)
+
+    @property
+    def models(self) -> list[QGraphQListModel]:
+        return [model for model in _MODELS if shiboken6.isValid(model)]
+
+    def schedule(self) -> None:
+        """Requests a sweep on the next event-loop turn."""
+        if not self._sweep_timer.isActive():
+            self._sweep_timer.start()
+
+    def start(self, interval_ms: int = 1000) -> None:
+        """Sweeps periodically, useful for long-running applications."""
+        self._idle_timer.start(interval_ms)
+
+    def sweep_every(self, seconds: float) -> None:
+        """Makes sure periodic sweeps are at most `seconds` apart (used by
+        stores with a `CachePolicy.ttl`)."""
+        interval_ms = int(seconds * 1000)
+        if not self._idle_timer.isActive() or self._idle_timer.interval() > interval_ms:
+            self.start(interval_ms)
+
+    def stop(self) -> None:
+        self._idle_timer.stop()
+
+    def collect(self, budget_ms: Optional[float] = None) -> CollectStats:
+        """Sweeps all the stores.
+
+        :param budget_ms: Time limit for this sweep, defaults to
+            `self.budget_ms`. pass `float("inf")` for a full sweep.
+        """
+        budget_ms = self.budget_ms if budget_ms is None else budget_ms
+        deadline = time.perf_counter() + budget_ms / 1000
+        doomed: list[QObject] = []
+        nodes = defaults = models = 0
+        for store in list(_STORES):
+            store.enforce_policy()
+            reclaimed = store.reclaim(deadline)
+            nodes += len(reclaimed)
+            doomed.extend(store.recycle(reclaimed))
+            if default := store.drop_default_instance():
+                defaults += 1
+                doomed.append(default)
+            if time.perf_counter() > deadline:
+                break
+        for model in list(_MODELS):
+            if not shiboken6.isValid(model):
+                _MODELS.discard(model)
+            elif model.parent() is None:
+                _MODELS.discard(model)
+                doomed.append(model)
+                models += 1
+        get_delete_queue().enqueue(doomed)
+        stats = CollectStats(nodes=nodes, models=models, defaults=defaults)
+        self.total = self.total.merge(stats)
+        if any(stats):
+            self.collected.emit(*stats)
+        return stats
+
+    def has_garbage(self) -> bool:
+        return any(store.has_garbage() for store in list(_STORES))
+
+    @slot
+    def _on_timeout(self) -> None:
+        self.collect()
+        if self.has_garbage():
+            self.schedule()
+
+
+def get_collector() -> StoreCollector:
+    if StoreCollector.instance is None:
+        StoreCollector.instance = StoreCollector()
+    return StoreCollector.instance
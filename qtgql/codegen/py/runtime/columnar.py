@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+from array import array
+from enum import Enum
+from typing import Any, Callable, ClassVar, Iterable, MutableSequence, NamedTuple, Optional
+
+from PySide6.QtCore import QModelIndex, QObject
+
+from qtgql.codegen.py.runtime.bases import DetachedNodes, QGraphQListModel, _BaseQGraphQLObject
+
+__all__ = ["Column", "ColumnarListModel", "enum_value"]
+
+
+class Column(NamedTuple):
+    name: str
+    typecode: Optional[str] = None
+    """`array` typecode of non-null numeric fields, other fields are stored
+    in a list."""
+    default: Any = None
+    convert: Optional[Callable[[Any], Any]] = None
+    """Converts a stored value to its Qt value."""
+    enum: Optional[type[Enum]] = None
+    """The enum of an enum column, that stores member names whether they
+    came from a payload, decoded rows or nodes (that hold members)."""
+
+
+def enum_value(enum: type[Enum], name: str) -> int:
+    """Qt value of an enum column."""
+    return enum[name].value
+
+
+class ColumnarListModel(QGraphQListModel):
+    """A list model of a type that has only builtin scalars and enums (see
+    `QtGqlConfig.columnar_lists`), each field is stored in a contiguous
+    column and served by its role.
+
+    Row objects are created only for the `object` role (or by
+    `node_at()`), updates are diffed column by column and emit
+    `dataChanged` with the roles that changed.
+    """
+
+    COLUMNS: ClassVar[tuple[Column, ...]] = ()
+    _by_role: ClassVar[dict[int, Column]] = {}
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        if cls.COLUMNS:
+            cls.FIELD_ROLES = {
+                column.name: cls.OBJECT_ROLE + 1 + i for i, column in enumerate(cls.COLUMNS)
+            }
+            cls._by_role = {cls.FIELD_ROLES[column.name]: column for column in cls.COLUMNS}
+        super().__init_subclass__(**kwargs)
+
+    def __init__(self, parent: Optional[QObject], data: Optional[list] = None):
+        super().__init__(parent, [])
+        self._columns: dict[str, MutableSequence] = {
+            column.name: self._make_column(column, ()) for column in self.COLUMNS
+        }
+        self._length = 0
+        self._objects: dict[int, _BaseQGraphQLObject] = {}
+        """Rows that were created, by index."""
+        if data:
+            self.insert_many(0, data)
+
+    @classmethod
+    def from_rows(
+        cls,
+        parent: Optional[QObject],
+        rows: list[dict],
+        create: Callable[[dict], _BaseQGraphQLObject],
+        lazy_types: Any = None,
+    ) -> ColumnarListModel:
+        model = cls(parent=parent)
+        model._create = create
+        model._load(rows)
+        return model
+
+    @staticmethod
+    def _make_column(column: Column, values: Iterable) -> MutableSequence:
+        if column.typecode:
+            default = column.default
+            return array(column.typecode, (default if v is None else v for v in values))
+        if column.enum:
+            return [v.name if isinstance(v, Enum) else v for v in values]
+        return list(values)
+
+    def _column_of(self, column: Column, rows: list[dict]) -> MutableSequence:
+        name, default = column.name, column.default
+        return self._make_column(column, (row.get(name, default) for row in rows))
+
+    def _nodes_column(self, column: Column, nodes: list[_BaseQGraphQLObject]) -> MutableSequence:
+        private_name = "_" + column.name
+        return self._make_column(column, (getattr(node, private_name) for node in nodes))
+
+    def _load(self, rows: list[dict]) -> None:
+        self._columns = {column.name: self._column_of(column, rows) for column in self.COLUMNS}
+        self._length = len(rows)
+
+    def row(self, index: int) -> dict:
+        """:returns: The stored values of a row."""
+        return {name: values[index] for name, values in self._columns.items()}
+
+    def rowCount(self, *args, **kwargs) -> int:
+        return self._length
+
+    def node_at(self, index: int) -> _BaseQGraphQLObject:
+        if index < 0:
+            index += self._length
+        node = self._objects.get(index, None)
+        if node is None:
+            if not 0 <= index < self._length:
+                raise IndexError(f"row {index} of {self._length}")
+            assert self._create is not None
+            node = self._objects[index] = self._create(self.row(index))
+        return node
+
+    def _live_nodes(self) -> Iterable[_BaseQGraphQLObject]:
+        return self._objects.values()
+
+    def data(self, index, role=...) -> Any:
+        if index.isValid() and index.row() < self._length:
+            if column := self._by_role.get(role, None):
+                value = self._columns[column.name][index.row()]
+                return column.convert(value) if column.convert else value
+            if role == self.OBJECT_ROLE:
+                return self.node_at(index.row())
+            raise NotImplementedError(
+                f"role {role} is not a valid role for {self.__class__.__name__}"
+            )
+
+    def _shift_objects(self, start: int, delta: int) -> None:
+        self._objects = {
+            (i + delta if i >= start else i): node for i, node in self._objects.items()
+        }
+
+    def append(self, node: _BaseQGraphQLObject) -> None:
+        self.insert_many(self._length, [node])
+
+    def insert(self, index: int, v: _BaseQGraphQLObject):
+        self.insert_many(index, [v])
+
+    def pop(self, index: Optional[int] = None) -> None:
+        index = self._length - 1 if index is None else index
+        self.remove_range(index if index > -1 else self._length + index, 1)
+
+    def insert_many(self, index: int, nodes: Iterable[_BaseQGraphQLObject]) -> None:
+        nodes = list(nodes)
+        if not nodes:
+            return
+        index = max(0, min(index, self._length))
+        self.beginInsertRows(QModelIndex(), index, index + len(nodes) - 1)
+        for column in self.COLUMNS:
+            self._columns[column.name][index:index] = self._nodes_column(column, nodes)
+        self._length += len(nodes)
+        self._shift_objects(index, len(nodes))
+        self._objects.update({index + i: node for i, node in enumerate(nodes)})
+        self.endInsertRows()
+
+    def append_rows(self, rows: list[dict]) -> None:
+        """Appends row payloads with a single insertion."""
+        if not rows:
+            return
+        first = self._length
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        for column in self.COLUMNS:
+            self._columns[column.name].extend(self._column_of(column, rows))
+        self._length += len(rows)
+        self.endInsertRows()
+
+    def remove_range(self, row: int, count: int) -> list[_BaseQGraphQLObject]:
+        """Removes `count` rows starting at `row` with a single removal.
+
+        :returns: The removed rows that were created.
+        """
+        if count <= 0:
+            return []
+        last = row + count - 1
+        if row < 0 or last >= self._length:
+            raise IndexError(f"can't remove rows {row}-{last} of {self._length}")
+        self.beginRemoveRows(QModelIndex(), row, last)
+        for values in self._columns.values():
+            del values[row : last + 1]
+        self._length -= count
+        removed = [self._objects.pop(i) for i in range(row, last + 1) if i in self._objects]
+        self._shift_objects(last + 1, -count)
+        self.endRemoveRows()
+        return removed
+
+    def replace_range(
+        self, row: int, nodes: Iterable[_BaseQGraphQLObject]
+    ) -> list[_BaseQGraphQLObject]:
+        nodes = list(nodes)
+        if not nodes:
+            return []
+        last = row + len(nodes) - 1
+        if row < 0 or last >= self._length:
+            raise IndexError(f"can't replace rows {row}-{last} of {self._length}")
+        replaced = [self._objects[i] for i in range(row, last + 1) if i in self._objects]
+        for column in self.COLUMNS:
+            self._columns[column.name][row : last + 1] = self._nodes_column(column, nodes)
+        self._objects.update({row + i: node for i, node in enumerate(nodes)})
+        self.dataChanged.emit(self.index(row), self.index(last))
+        return replaced
+
+    def reset_with(self, nodes: Iterable[_BaseQGraphQLObject]) -> list[_BaseQGraphQLObject]:
+        nodes = list(nodes)
+        self.beginResetModel()
+        previous = list(self._objects.values())
+        self._columns = {column.name: self._nodes_column(column, nodes) for column in self.COLUMNS}
+        self._length = len(nodes)
+        self._objects = dict(enumerate(nodes))
+        self.endResetModel()
+        return previous
+
+    def reconcile(
+        self,
+        data: list[dict],
+        create: Callable[[dict], _BaseQGraphQLObject],
+        update: Callable[[_BaseQGraphQLObject, dict], None],
+    ) -> None:
+        """Updates the columns to match arrived data.
+
+        If the rows are the same (by id, or by index for types without
+        ids) the columns are diffed in place, rows that were appended
+        are inserted, any other change resets the model.
+        """
+        self._create = create
+        length = self._length
+        ids = self._columns.get("id", None)
+        new_ids = [row.get("id", None) for row in data] if ids is not None else None
+        if ids is None or new_ids[:length] == list(ids):  # type: ignore
+            if len(data) < length:
+                DetachedNodes.add(self.remove_range(len(data), length - len(data)))
+            self._apply(data[:length], update)
+            self.append_rows(data[length:])
+        else:
+            self._reset(data, new_ids, update)  # type: ignore
+
+    def _apply(self, data: list[dict], update: Callable[[_BaseQGraphQLObject, dict], None]) -> None:
+        """Diffs the first `len(data)` rows column by column."""
+        count = len(data)
+        changed: dict[int, list[int]] = {}
+        for column in self.COLUMNS:
+            values = self._columns[column.name]
+            arrived = self._column_of(column, data)
+            if values[:count] == arrived:
+                continue
+            role = self.FIELD_ROLES[column.name]
+            for i, (prev, current) in enumerate(zip(values, arrived)):
+                if prev != current:
+                    changed.setdefault(i, []).append(role)
+            values[:count] = arrived
+        for i, roles in sorted(changed.items()):
+            if (node := self._objects.get(i, None)) is not None:
+                update(node, data[i])
+            index = self.index(i)
+            self.dataChanged.emit(index, index, roles)
+
+    def _reset(
+        self,
+        data: list[dict],
+        new_ids: list,
+        update: Callable[[_BaseQGraphQLObject, dict], None],
+    ) -> None:
+        # created rows are kept for the ids that are still present, the
+        # others are released.
+        by_id = {getattr(node, "_id", None): node for node in self._objects.values()}
+        self.beginResetModel()
+        self._load(data)
+        self._objects = {}
+        for i, id_ in enumerate(new_ids):
+            if (node := by_id.pop(id_, None)) is not None:
+                update(node, data[i])
+                self._objects[i] = node
+        self.endResetModel()
+        DetachedNodes.add(by_id.values())
@@ -1,18 +1,22 @@
 from abc import ABC, abstractmethod
 from datetime import date, datetime, time
-from typing import Any, Generic, Optional, Type, TypeVar
+from functools import lru_cache
+from typing import Any, Callable, ClassVar, Generic, Iterable, Optional, Type, TypeVar
 
 from _decimal import Decimal
+from PySide6.QtCore import QDate, QDateTime, QTime, QTimeZone
 
 T = TypeVar("T")
 T_RAW = TypeVar("T_RAW")
-__all__ = ["BaseCustomScalar"]
+__all__ = ["BaseCustomScalar", "NativeDateTimeScalar"]
 
 
 class BaseCustomScalar(Generic[T, T_RAW], ABC):
     """Class to extend by user defined scalars."""
 
-    __slots__ = "_value"
+    __slots__ = ("_value", "_qt")
+    _qt: Any
+    """Cache of `qt_value()`."""
     GRAPHQL_NAME: str
     """The *real* GraphQL name of the scalar (used by the codegen inspection
     pipeline)."""
@@ -21,6 +25,14 @@ class BaseCustomScalar(Generic[T, T_RAW], ABC):
 
     can be used by `from_graphql()`
     """
+    MEMO_SIZE: ClassVar[int] = 0
+    """How many decoded values `decode()` keeps (least recently used are
+    dropped), 0 disables the memo.
+
+    Scalars are never mutated, so one decoded instance can be shared by
+    every field that got the same raw value.
+    """
+    _decode_memo: ClassVar[Callable[[Any], "BaseCustomScalar"]]
 
     def __init__(self, v: Optional[T] = None):
         if not v:
@@ -28,6 +40,7 @@ class BaseCustomScalar(Generic[T, T_RAW], ABC):
         else:
             self._value = v
 
+    @classmethod
     @abstractmethod
     def from_graphql(cls, v: Optional[T_RAW] = None) -> "BaseCustomScalar":
         """Deserializes data fetched from graphql, This is useful when you want
@@ -37,6 +50,37 @@ class BaseCustomScalar(Generic[T, T_RAW], ABC):
         """
         raise NotImplementedError  # pragma: no cover
 
+    @classmethod
+    def decode(cls, v: Optional[T_RAW] = None) -> "BaseCustomScalar":
+        """`from_graphql()` through the memo of this class (see `MEMO_SIZE`),
+        used by the generated deserializers."""
+        if not cls.MEMO_SIZE:
+            return cls.from_graphql(v)
+        cached = cls.__dict__.get("_decode_memo", None)
+        if cached is None:
+            cached = lru_cache(maxsize=cls.MEMO_SIZE)(cls.from_graphql)
+            cls._decode_memo = cached
+        try:
+            return cached(v)
+        except TypeError:  # unhashable raw value.
+            return cls.from_graphql(v)
+
+    @classmethod
+    def from_graphql_many(cls, values: Iterable[Optional[T_RAW]]) -> list["BaseCustomScalar"]:
+        """Decodes a batch of raw values (i.e a column of a list), each
+        distinct value is decoded once."""
+        batch: dict[Any, BaseCustomScalar] = {}
+        ret = []
+        for v in values:
+            try:
+                decoded = batch.get(v, None)
+                if decoded is None:
+                    decoded = batch[v] = cls.decode(v)
+            except TypeError:  # unhashable raw value.
+                decoded = cls.decode(v)
+            ret.append(decoded)
+        return ret
+
     @abstractmethod
     def to_qt(self) -> Any:
         """Will be used by the property getter, This is the official value that
@@ -46,10 +90,32 @@ class BaseCustomScalar(Generic[T, T_RAW], ABC):
         """
         raise NotImplementedError  # pragma: no cover
 
+    def qt_value(self) -> Any:
+        """:returns: `to_qt()`, converted once per scalar instance.
+
+        Generated getters call it on every QML property read, setters
+        and updates replace the scalar instance (scalars are never
+        mutated) so a new value is converted again.
+        """
+        try:
+            return self._qt
+        except AttributeError:
+            self._qt = ret = self.to_qt()
+            return ret
+
     def __ne__(self, other) -> bool:
-        assert isinstance(other, BaseCustomScalar), "can only compare scalar with other scalar."
+        if not isinstance(other, BaseCustomScalar):
+            return NotImplemented
         return self._value != other._value
 
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, BaseCustomScalar):
+            return NotImplemented
+        return self._value == other._value
+
+    def __hash__(self) -> int:
+        return hash(self._value)
+
 
 class DateTimeScalar(BaseCustomScalar[datetime, str]):
     """An ISO-8601 encoded datetime."""
@@ -57,6 +123,7 @@ class DateTimeScalar(BaseCustomScalar[datetime, str]):
     GRAPHQL_NAME: str = "DateTime"
     DEFAULT_VALUE = datetime.now()
     FORMAT_STRING = "%H:%M (%m/%d/%Y)"
+    MEMO_SIZE = 1024
 
     @classmethod
     def from_graphql(cls, v=None) -> "DateTimeScalar":
@@ -68,11 +135,30 @@ class DateTimeScalar(BaseCustomScalar[datetime, str]):
         return self._value.strftime(self.FORMAT_STRING)
 
 
+class NativeDateTimeScalar(DateTimeScalar):
+    """A `DateTimeScalar` exposed to QML as a `QDateTime`, so that it is
+    formatted by QML (i.e `Qt.formatDateTime()`) only where it is
+    displayed.
+
+    Not used by default, register it with
+    `QtGqlConfig.custom_scalars`.
+    """
+
+    def to_qt(self) -> QDateTime:  # type: ignore[override]
+        value = self._value
+        date_ = QDate(value.year, value.month, value.day)
+        time_ = QTime(value.hour, value.minute, value.second, value.microsecond // 1000)
+        if (offset := value.utcoffset()) is not None:
+            return QDateTime(date_, time_, QTimeZone(int(offset.total_seconds())))
+        return QDateTime(date_, time_)
+
+
 class DateScalar(BaseCustomScalar[date, str]):
     """An ISO-8601 encoded date."""
 
     GRAPHQL_NAME = "Date"
     DEFAULT_VALUE = date(year=1998, month=8, day=23)
+    MEMO_SIZE = 1024
 
     @classmethod
     def from_graphql(cls, v=None) -> "DateScalar":
@@ -89,6 +175,7 @@ class TimeScalar(BaseCustomScalar[time, str]):
 
     GRAPHQL_NAME = "Time"
     DEFAULT_VALUE = time()
+    MEMO_SIZE = 1024
 
     @classmethod
     def from_graphql(cls, v: Optional[str] = None) -> "TimeScalar":
@@ -105,6 +192,7 @@ class DecimalScalar(BaseCustomScalar[Decimal, str]):
 
     GRAPHQL_NAME = "Decimal"
     DEFAULT_VALUE = Decimal()
+    MEMO_SIZE = 1024
 
     @classmethod
     def from_graphql(cls, v: Optional[str] = None) -> "DecimalScalar":
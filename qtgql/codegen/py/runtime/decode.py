@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, ClassVar, NamedTuple, Optional
+
+from PySide6.QtCore import QObject, Signal
+
+if TYPE_CHECKING:  # pragma: no cover
+    from qtgql.codegen.py.runtime.queryhandler import BaseQueryHandler
+
+__all__ = ["DecodeWorker", "decode_rows", "decode_union", "get_decoder"]
+
+logger = logging.getLogger(__name__)
+
+_Decode = Callable[[dict, Optional[dict]], dict]
+
+
+def decode_rows(rows: list[dict], prev_rows: Optional[list[dict]], decode: _Decode) -> list[dict]:
+    """Decodes the rows of a list, each row is diffed against the previous
+    row with the same id (or at the same index if the rows have no ids).
+
+    :returns: `prev_rows` itself if no row has changed.
+    """
+    if not prev_rows:
+        return [decode(row, None) for row in rows]
+    by_id = {row["id"]: row for row in prev_rows if "id" in row}
+    prev_len = len(prev_rows)
+    ret = []
+    for i, row in enumerate(rows):
+        id_ = row.get("id", None)
+        prev = by_id.get(id_, None) if id_ is not None else (prev_rows[i] if i < prev_len else None)
+        ret.append(decode(row, prev))
+    return prev_rows if ret == prev_rows else ret
+
+
+def decode_union(choices: dict[str, _Decode], data: dict, prev: Optional[dict]) -> dict:
+    type_name = data["__typename"]
+    if prev is not None and prev.get("__typename", None) != type_name:
+        prev = None
+    return choices[type_name](data, prev)
+
+
+class _Decoded(NamedTuple):
+    generation: int
+    """`BaseQueryHandler._decode_generation` when the result was submitted."""
+    decoded: Optional[dict]
+    error: Optional[Exception]
+
+
+class DecodeWorker(QObject):
+    """Runs the thread-safe phase of two-phase decoding (see
+    `QtGqlConfig.two_phase_decode`) on a background thread.
+
+    A handler's `decode()` converts a raw result to plain dicts (custom
+    scalars and enums converted) and reuses the previous decoded
+    subtrees that didn't change, the handler then applies it on the GUI
+    thread, skipping nodes that were last applied with the very same
+    subtree. Results are decoded one at a time, in order of arrival.
+    """
+
+    _decoded = Signal(object, object, object)
+    """handler, message, `_Decoded`."""
+
+    instance: ClassVar[Optional[DecodeWorker]] = None
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="qtgql-decode")
+        # emitted from the worker thread, hence queued to the GUI thread.
+        self._decoded.connect(self._on_decoded)  # type: ignore
+
+    def submit(self, handler: BaseQueryHandler, message: dict) -> Future:
+        handler._pending_decodes += 1
+        # the handler's snapshot is only touched on the GUI thread.
+        return self._executor.submit(
+            self._decode, handler, message, handler._decode_snapshot, handler._decode_generation
+        )
+
+    def wait(self) -> None:
+        """Blocks until all the submitted results were decoded, they are
+        still applied by the event loop."""
+        self._executor.submit(lambda: None).result()
+
+    def _decode(
+        self, handler: BaseQueryHandler, message: dict, previous: Optional[dict], generation: int
+    ) -> None:
+        try:
+            result = _Decoded(generation, handler.decode(message, previous), None)
+        except Exception as e:
+            logger.exception("failed to decode a result of %s", handler.objectName())
+            result = _Decoded(generation, None, e)
+        self._decoded.emit(handler, message, result)
+
+    def _on_decoded(self, handler: BaseQueryHandler, message: dict, result: _Decoded) -> None:
+        handler._pending_decodes -= 1
+        if result.decoded is not None:
+            if result.generation == handler._decode_generation:
+                handler._decode_snapshot = result.decoded
+            handler.apply_decoded(message, result.decoded)
+        else:
+            assert result.error is not None
+            handler.on_decode_error(message, result.error)
+        handler._complete_if_decoded()
+
+
+def get_decoder() -> DecodeWorker:
+    if DecodeWorker.instance is None:
+        DecodeWorker.instance = DecodeWorker()
+    return DecodeWorker.instance
@@ -1,16 +1,32 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Protocol
+from typing import TYPE_CHECKING, Any, Optional, Protocol
+
+from qtgql.codegen.py.runtime.optimistic import OptimisticUpdates
 
 if TYPE_CHECKING:  # pragma: no cover
-    from qtgql.codegen.py.runtime.queryhandler import BaseQueryHandler
+    from PySide6.QtCore import QObject
+
+    from qtgql.codegen.py.runtime.bases import NodeRecord, _BaseQGraphQLObject
+    from qtgql.codegen.py.runtime.queryhandler import BaseQueryHandler, SelectionConfig
+    from qtgql.codegen.py.runtime.snapshot import Snapshot, SnapshotWriter
     from qtgql.gqltransport.client import HandlerProto
 
+LOCAL_OPERATION_NAME = "__local__"
+"""Retains nodes that were created by `QtGqlEnvironment.write_fragment()`
+until `QtGqlEnvironment.release_fragment()` / `evict_local()`."""
+
 
 class NetworkLayerProto(Protocol):
     def execute(self, handler: HandlerProto) -> None:
-        """accepts a handler and expected to call the handler's `on_data` /
-        `on_error` / 'on_completed' when the operation is completed."""
+        """accepts a handler and expected to deliver each result to the
+        handler's `receive` (or `on_patch` for a JSON-Patch of the previous
+        result), then call `on_error` / `on_completed` when the operation
+        is completed.
+
+        Results must not be passed to `on_data` directly, `receive` is
+        what decodes them off the GUI thread (`two_phase_decode`) and
+        merges pages requested by `fetch_more()`."""
 
 
 class QtGqlEnvironment:
@@ -31,6 +47,15 @@ class QtGqlEnvironment:
         self.client = client
         self._query_handlers: dict[str, BaseQueryHandler] = {}
         self.name = name
+        self.optimistic = OptimisticUpdates()
+        """Optimistic patches over the generated objects of this schema."""
+        self.type_map: dict[str, type[_BaseQGraphQLObject]] = {}
+        """Generated types by their GraphQL name, set by the generated handlers
+        `init()`."""
+        self.recorder: Optional[SnapshotWriter] = None
+        """Records every operation result when set (see `SnapshotWriter`)."""
+        self._snapshot: Optional[Snapshot] = None
+        self._restored: set[str] = set()
 
     def add_query_handler(self, handler: BaseQueryHandler) -> None:
         """Adds an query handler to the environment, this would further be used
@@ -40,6 +65,166 @@ class QtGqlEnvironment:
     def get_handler(self, operation_name: str) -> BaseQueryHandler:
         return self._query_handlers[operation_name]
 
+    def find_handler(self, operation_name: str) -> Optional[BaseQueryHandler]:
+        """:returns: The handler of `operation_name` if there is one."""
+        return self._query_handlers.get(operation_name, None)
+
+    def restore_snapshot(self, snapshot: Snapshot, eager: bool = False) -> None:
+        """Warm-starts the operations of this environment from a snapshot.
+
+        Each operation is restored (once) into the stores right before
+        its first `consume()`, the operation is still fetched afterwards.
+
+        Only operation results are restored, objects that are in the
+        stores for other reasons (i.e. local writes by `write_fragment()`)
+        are not part of a snapshot.
+
+        :param eager: Restore all the operations now instead.
+        """
+        if snapshot.env_name != self.name:
+            raise ValueError(
+                f"snapshot of {snapshot.env_name!r} can't be restored to {self.name!r}"
+            )
+        self._snapshot = snapshot
+        self._restored.clear()
+        if eager:
+            for handler in self._query_handlers.values():
+                handler.restore()
+
+    def take_snapshot_result(self, operation_name: str) -> Optional[dict]:
+        """:returns: The snapshot result of an operation if it wasn't restored
+        already."""
+        if self._snapshot is None or operation_name in self._restored:
+            return None
+        self._restored.add(operation_name)
+        return self._snapshot.operation(operation_name)
+
+    def _parse_ref(self, ref: str) -> tuple[type[_BaseQGraphQLObject], str]:
+        typename, sep, id_ = ref.partition(":")
+        if not sep or not id_:
+            raise ValueError(f"expected a reference of the form 'Typename:id', got {ref!r}")
+        return self.type_map[typename], id_
+
+    def read_fragment(self, ref: str) -> Optional[_BaseQGraphQLObject]:
+        """Reads a node from the store without a network operation.
+
+        :param ref: "Typename:id" of the node.
+        :returns: The generated object or None if the node is not in the store.
+        """
+        node_type, id_ = self._parse_ref(ref)
+        return node_type.__store__.get_node(id_)
+
+    def write_fragment(
+        self, ref: str, data: dict, operation_name: str = LOCAL_OPERATION_NAME
+    ) -> _BaseQGraphQLObject:
+        """Writes GraphQL data of a node to the store without a network
+        operation.
+
+        An existing node is updated in place (only the given fields),
+        otherwise a new node is created and retained by `operation_name`.
+
+        :param ref: "Typename:id" of the node.
+        :param data: The node data, shaped as the server would return it.
+        """
+        from qtgql.codegen.py.runtime.queryhandler import OperationMetaData
+        from qtgql.codegen.py.runtime.structhash import invalidate
+
+        node_type, id_ = self._parse_ref(ref)
+        data = {**data, "id": id_}
+        config = config_from_data(data)
+        metadata = OperationMetaData(operation_name=operation_name, selections=config)
+        # written nodes no longer match the payloads they were last updated with.
+        invalidate(node_type.__name__)
+        if node := node_type.__store__.get_node(id_):
+            node.update(data, config, metadata)
+            return node
+        return node_type.from_dict(None, data, config, metadata)
+
+    def release_fragment(self, ref: str, operation_name: str = LOCAL_OPERATION_NAME) -> bool:
+        """Releases a node that `write_fragment()` retained.
+
+        :param ref: "Typename:id" of the node.
+        :returns: Whether the node was retained by `operation_name`.
+        """
+        node_type, id_ = self._parse_ref(ref)
+        for record in node_type.__store__.retained_by(operation_name):
+            if record.node.id == id_:
+                _release(record, operation_name)
+                return True
+        return False
+
+    def evict_local(self, operation_name: str = LOCAL_OPERATION_NAME) -> int:
+        """Releases all the nodes that `write_fragment()` retained.
+
+        :returns: The number of released nodes.
+        """
+        records = [
+            record
+            for node_type in list(self.type_map.values())
+            for record in node_type.__store__.retained_by(operation_name)
+        ]
+        for record in records:
+            _release(record, operation_name)
+        return len(records)
+
+    def current_data(self, handler_cls: type[BaseQueryHandler]) -> Optional[QObject]:
+        """:returns: The current data of an operation, without fetching it.
+
+        This is the result the handler holds for its current variables,
+        results aren't cached per variables so other variables can't be
+        read from the stores.
+        """
+        return self.get_handler(handler_cls.OPERATION_METADATA.operation_name).data
+
+    def write_query(self, handler_cls: type[BaseQueryHandler], data: dict) -> None:
+        """Seeds an operation with data that is already known (i.e from a list
+        query), as if it arrived from the server.
+
+        Nodes are normalized as usual so existing nodes are reused and
+        updated in place. Consuming the operation would still fetch it.
+        """
+        handler = self.get_handler(handler_cls.OPERATION_METADATA.operation_name)
+        operation_on_the_fly = handler._operation_on_the_fly
+        handler.on_data(data)
+        handler._operation_on_the_fly = operation_on_the_fly
+
+
+def _release(record: NodeRecord, operation_name: str) -> None:
+    from qtgql.codegen.py.runtime.bases import loose_tree
+    from qtgql.codegen.py.runtime.queryhandler import OperationMetaData, SelectionConfig
+
+    if record.retainers == {operation_name}:
+        metadata = OperationMetaData(operation_name, SelectionConfig())
+        loose_tree(record.node, metadata)
+    else:
+        # still used by other operations, its children must stay.
+        record.node.__store__.loose(record.node, operation_name)
+
+
+def config_from_data(data: dict[str, Any]) -> SelectionConfig:
+    """:returns: A selection config that selects exactly what is in `data`."""
+    from qtgql.codegen.py.runtime.queryhandler import SelectionConfig
+
+    selections: dict[str, Optional[SelectionConfig]] = {}
+    for key, value in data.items():
+        if isinstance(value, list):
+            rows = [row for row in value if isinstance(row, dict)]
+            merged: dict[str, Any] = {}
+            choices: dict[str, SelectionConfig] = {}
+            for row in rows:
+                merged.update(row)
+                if typename := row.get("__typename", None):
+                    choices[typename] = config_from_data(row)
+            selections[key] = config_from_data(merged)._replace(choices=choices) if rows else None
+        elif isinstance(value, dict):
+            inner = config_from_data(value)
+            if typename := value.get("__typename", None):
+                inner = inner._replace(choices={typename: inner})
+            selections[key] = inner
+        else:
+            selections[key] = None
+    return SelectionConfig(selections=selections)
+
 
 _ENV_MAP: dict[str, QtGqlEnvironment] = {}
 """In the future this would be usefully if you want to use different schemas,
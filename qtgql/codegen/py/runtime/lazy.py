@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Callable, Iterable, NamedTuple, Optional, Union
+
+if TYPE_CHECKING:  # pragma: no cover
+    from PySide6.QtCore import QObject
+
+    from qtgql.codegen.py.runtime.bases import _BaseQGraphQLObject
+    from qtgql.codegen.py.runtime.queryhandler import OperationMetaData, SelectionConfig
+
+__all__ = ["Deferred", "LazyTypeMap", "RawRow", "from_choices", "from_union", "in_store"]
+
+_NodeTypes = Union["type[_BaseQGraphQLObject]", "dict[str, type[_BaseQGraphQLObject]]"]
+
+
+class Deferred(NamedTuple):
+    """Raw payload of a child field that wasn't materialized yet (see
+    `QtGqlConfig.lazy_children`)."""
+
+    build: Callable[[Any], Any]
+    """Builds the field value from `data`."""
+    data: Any
+
+
+class RawRow:
+    """Payload of a list row that wasn't materialized yet (see
+    `QtGqlConfig.lazy_rows`)."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: dict):
+        self.data = data
+
+
+class LazyTypeMap(dict):
+    """Generated types by their GraphQL name, of a package that defines each
+    type in a module of its own (see `QtGqlConfig.split_modules`).
+
+    A type is imported on its first lookup, its module then registers
+    it here.
+    """
+
+    def __init__(self, package: str, names: Iterable[str]):
+        super().__init__()
+        self._package = package
+        self._names = frozenset(names)
+
+    def __missing__(self, name: str) -> type[_BaseQGraphQLObject]:
+        if name not in self._names:
+            raise KeyError(name)
+        getattr(import_module(self._package), name)
+        return dict.__getitem__(self, name)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._names
+
+    def get(  # type: ignore[override]
+        self, name: str, default: Optional[type[_BaseQGraphQLObject]] = None
+    ) -> Optional[type[_BaseQGraphQLObject]]:
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+
+def in_store(data: Union[dict, list[dict]], types: _NodeTypes) -> bool:
+    """:returns: Whether a payload (or one of its rows) refers to a node that
+    is already in the store.
+
+    Such payloads are materialized right away, so that the shared node
+    is updated as usual.
+
+    :param types: The node type, or a typename -> type mapping for unions.
+    """
+    for row in data if isinstance(data, list) else (data,):
+        if id_ := row.get("id", None):
+            node_type = types if isinstance(types, type) else types.get(row.get("__typename", ""))
+            if node_type is not None and node_type.__store__.contains(id_):
+                return True
+    return False
+
+
+def from_union(
+    type_map: dict[str, type[_BaseQGraphQLObject]],
+    parent: QObject,
+    config: SelectionConfig,
+    metadata: OperationMetaData,
+    data: dict,
+) -> _BaseQGraphQLObject:
+    type_name = data["__typename"]
+    return type_map[type_name].from_dict(parent, data, config.choices[type_name], metadata)
+
+
+def from_choices(
+    choices: dict[str, Callable[[QObject, dict, OperationMetaData], _BaseQGraphQLObject]],
+    parent: QObject,
+    metadata: OperationMetaData,
+    data: dict,
+) -> _BaseQGraphQLObject:
+    return choices[data["__typename"]](parent, data, metadata)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from typing import ClassVar, Iterable, Optional
+
+import shiboken6
+from PySide6.QtCore import QObject, QTimer
+
+from qtgql.tools import slot
+
+__all__ = ["NotificationCoalescer", "emit_changed", "get_coalescer"]
+
+
+class NotificationCoalescer(QObject):
+    """Defers `<field>Changed` signals of updated nodes to the end of the
+    event-loop turn.
+
+    The generated `update()` applies all the fields of a node before it
+    emits their signals, when `deferred` is set these are collected here
+    instead, so a node that was updated many times during a turn (i.e
+    by a burst of subscription results) notifies each field only once.
+    """
+
+    instance: ClassVar[Optional[NotificationCoalescer]] = None
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.deferred = False
+        self._pending: dict[QObject, dict[str, None]] = {}
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._on_timeout)  # type: ignore
+
+    def __len__(self) -> int:
+        return sum(len(names) for names in self._pending.values())
+
+    def add(self, node: QObject, signal_names: Iterable[str]) -> None:
+        self._pending.setdefault(node, {}).update(dict.fromkeys(signal_names))
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self) -> int:
+        """Emits all pending signals now.
+
+        :returns: How many signals were emitted.
+        """
+        pending, self._pending = self._pending, {}
+        count = 0
+        for node, names in pending.items():
+            # the node might have been deleted meanwhile.
+            if shiboken6.isValid(node):
+                for name in names:
+                    getattr(node, name).emit()
+                    count += 1
+        return count
+
+    @slot
+    def _on_timeout(self) -> None:
+        self.flush()
+
+
+def get_coalescer() -> NotificationCoalescer:
+    if NotificationCoalescer.instance is None:
+        NotificationCoalescer.instance = NotificationCoalescer()
+    return NotificationCoalescer.instance
+
+
+def emit_changed(node: QObject, signal_names: list[str]) -> None:
+    """Used by the generated `update()` after all fields were applied."""
+    if not signal_names:
+        return
+    coalescer = get_coalescer()
+    if coalescer.deferred:
+        coalescer.add(node, signal_names)
+    else:
+        for name in signal_names:
+            getattr(node, name).emit()
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional, Tuple
+
+from attrs import define, field
+
+if TYPE_CHECKING:  # pragma: no cover
+    from qtgql.codegen.py.runtime.bases import _BaseQGraphQLObject
+
+__all__ = ["OptimisticLayer", "OptimisticUpdates", "Patch"]
+
+Patch = Dict["_BaseQGraphQLObject", Dict[str, Any]]
+"""Mapping of a node to the values of its fields (by GraphQL field name).
+
+values are of the type the field setter accepts.
+"""
+_FieldKey = Tuple["_BaseQGraphQLObject", str]
+
+
+@define(eq=False)
+class OptimisticLayer:
+    patch: Patch
+    confirmed: bool = False
+    rolled_back: bool = False
+
+    def __iter__(self) -> Iterator[_FieldKey]:
+        """Iterates the (node, field name) pairs this layer patches."""
+        for node, fields in self.patch.items():
+            for f_name in fields:
+                yield node, f_name
+
+
+def _get(key: _FieldKey) -> Any:
+    node, f_name = key
+    # a child that is still deferred (see `QtGqlConfig.lazy_children`) is
+    # built now, otherwise it would be built over the patched value once
+    # accessed.
+    if node._deferred and f_name in node._deferred:
+        node._materialize(f_name)
+    return getattr(node, "_" + f_name)
+
+
+def _set(key: _FieldKey, value: Any) -> None:
+    node, f_name = key
+    # set only what changed so only the relevant signals would be emitted.
+    if _get(key) != value:
+        getattr(node, f_name + "_setter")(value)
+
+
+@define
+class OptimisticUpdates:
+    """A stack of optimistic patches over the normalized store.
+
+    A patch is applied to the nodes immediately, then it is either
+    confirmed (when the server accepted the mutation) or rolled back.
+    Rolling back restores the value of each field to what it would be
+    without this layer, fields that were changed meanwhile (i.e by an
+    update from the server) are left untouched.
+    """
+
+    _layers: list[OptimisticLayer] = field(factory=list)
+    _base: dict[_FieldKey, Any] = field(factory=dict)
+    """The values before the first pending layer touched them."""
+
+    @property
+    def layers(self) -> list[OptimisticLayer]:
+        return list(self._layers)
+
+    def apply(self, patch: Patch) -> OptimisticLayer:
+        layer = OptimisticLayer(patch=patch)
+        for key in layer:
+            if key not in self._base:
+                self._base[key] = _get(key)
+        self._layers.append(layer)
+        for node, fields in patch.items():
+            for f_name, value in fields.items():
+                _set((node, f_name), value)
+        return layer
+
+    def confirm(self, layer: OptimisticLayer, server_patch: Optional[Patch] = None) -> None:
+        """Commits the layer.
+
+        The patch values (or `server_patch` values if provided) become
+        the base values for the layers that are still pending.
+        """
+        index = self._pop(layer)
+        layer.confirmed = True
+        settled = []
+        for key in layer:
+            if self._changed_meanwhile(key, layer, index):
+                self._forget(key)
+                continue
+            self._base[key] = layer.patch[key[0]][key[1]]
+            settled.append(key)
+        for node, fields in (server_patch or {}).items():
+            for f_name, value in fields.items():
+                key = (node, f_name)
+                if key in self._base:
+                    self._base[key] = value
+                    settled.append(key)
+                else:
+                    _set(key, value)
+        self._settle(settled)
+
+    def rollback(self, layer: OptimisticLayer) -> None:
+        """Reverts the layer, emitting signals only for the fields that
+        changed."""
+        index = self._pop(layer)
+        layer.rolled_back = True
+        settled = []
+        for key in layer:
+            if self._changed_meanwhile(key, layer, index):
+                # this field was changed by someone else, don't override.
+                self._forget(key)
+                continue
+            settled.append(key)
+        self._settle(settled)
+
+    def _changed_meanwhile(self, key: _FieldKey, layer: OptimisticLayer, index: int) -> bool:
+        node, f_name = key
+        return _get(key) != layer.patch[node][f_name] and not self._is_shadowed(key, index)
+
+    def _pop(self, layer: OptimisticLayer) -> int:
+        index = self._layers.index(layer)
+        self._layers.pop(index)
+        return index
+
+    def _is_shadowed(self, key: _FieldKey, index: int) -> bool:
+        """whether a layer above `index` touches this field."""
+        node, f_name = key
+        return any(f_name in layer.patch.get(node, {}) for layer in self._layers[index:])
+
+    def _top_value(self, key: _FieldKey) -> Any:
+        node, f_name = key
+        for layer in reversed(self._layers):
+            if f_name in (fields := layer.patch.get(node, {})):
+                return fields[f_name]
+        return self._base[key]
+
+    def _forget(self, key: _FieldKey) -> None:
+        node, f_name = key
+        if not any(f_name in layer.patch.get(node, {}) for layer in self._layers):
+            self._base.pop(key, None)
+
+    def _settle(self, keys: list[_FieldKey]) -> None:
+        for key in keys:
+            if key not in self._base:
+                continue
+            _set(key, self._top_value(key))
+            self._forget(key)
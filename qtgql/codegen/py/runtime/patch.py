@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, NamedTuple, Optional, Union
+
+from qtgql.codegen.py.runtime.bases import DetachedNodes, QGraphQListModel, _BaseQGraphQLObject
+from qtgql.codegen.py.runtime.columnar import ColumnarListModel
+from qtgql.codegen.py.runtime.structhash import invalidate
+from qtgql.exceptions import QtGqlException
+
+if TYPE_CHECKING:  # pragma: no cover
+    from qtgql.codegen.py.runtime.queryhandler import (
+        BaseQueryHandler,
+        OperationMetaData,
+        SelectionConfig,
+    )
+
+__all__ = ["PatchError", "PatchOperation", "apply_patch", "parse_pointer"]
+
+SUPPORTED_OPS = ("add", "remove", "replace")
+
+_Target = Union[_BaseQGraphQLObject, QGraphQListModel]
+
+
+class PatchError(QtGqlException):
+    ...
+
+
+class PatchOperation(NamedTuple):
+    """A single JSON-Patch (RFC 6902) operation, `path` is relative to the
+    operation `data`."""
+
+    op: str
+    path: list[str]
+    value: Any = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> PatchOperation:
+        op = data.get("op", None)
+        if op not in SUPPORTED_OPS:
+            raise PatchError(f"unsupported patch operation {op!r}, supported: {SUPPORTED_OPS}")
+        return cls(op=op, path=parse_pointer(data["path"]), value=data.get("value", None))
+
+
+def parse_pointer(pointer: str) -> list[str]:
+    """:returns: Reference tokens of a JSON pointer (RFC 6901)."""
+    if not pointer.startswith("/"):
+        raise PatchError(f"invalid JSON pointer {pointer!r}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def _narrow(target: _Target, config: SelectionConfig) -> SelectionConfig:
+    # unions are selected per concrete type.
+    if config.choices and isinstance(target, _BaseQGraphQLObject):
+        return config.choices[type(target).__name__]
+    return config
+
+
+def _index(token: str, length: int) -> int:
+    if not token.isdigit() or int(token) >= length:
+        raise PatchError(f"invalid list index {token!r} (length {length})")
+    return int(token)
+
+
+class _Location(NamedTuple):
+    owner: Union[_BaseQGraphQLObject, BaseQueryHandler]
+    owner_config: SelectionConfig
+    field: str
+    target: _Target
+    config: SelectionConfig
+
+
+def _resolve(handler: BaseQueryHandler, tokens: list[str]) -> _Location:
+    """Walks the generated objects to the parent of the patched value."""
+    root_config = handler.OPERATION_METADATA.selections
+    target: Optional[_Target] = handler._data
+    loc = _Location(handler, root_config, handler.ROOT_FIELD, target, root_config)  # type: ignore
+    config = _narrow(target, root_config)  # type: ignore
+    for token in tokens:
+        if target is None:
+            raise PatchError(f"can't resolve {token!r}, parent is null")
+        if isinstance(target, ColumnarListModel):
+            raise PatchError("rows of columnar models are only patched whole")
+        if isinstance(target, QGraphQListModel):
+            target = target.node_at(_index(token, target.rowCount()))
+            config = _narrow(target, config)
+            continue
+        if token not in config.selections:
+            raise PatchError(f"{token!r} is not selected on {type(target).__name__}")
+        owner, owner_config = target, config
+        config = config.selections[token]  # type: ignore
+        if target._deferred and token in target._deferred:
+            target._materialize(token)
+        target = getattr(target, "_" + token)
+        loc = _Location(owner, owner_config, token, target, config)  # type: ignore
+        config = _narrow(target, config)  # type: ignore
+    if target is None:
+        raise PatchError("can't patch into null")
+    return loc._replace(target=target, config=config)
+
+
+def _patch_field(
+    node: _BaseQGraphQLObject,
+    field: str,
+    value: Any,
+    config: SelectionConfig,
+    metadata: OperationMetaData,
+) -> None:
+    if field not in config.selections:
+        raise PatchError(f"{field!r} is not selected on {type(node).__name__}")
+    # the generated update would only visit the patched field.
+    node.update(
+        {field: value}, config._replace(selections={field: config.selections[field]}), metadata
+    )
+
+
+def _row_type(
+    handler: BaseQueryHandler, model: QGraphQListModel, value: dict
+) -> Optional[type[_BaseQGraphQLObject]]:
+    if typename := value.get("__typename", None):
+        return handler.environment.type_map[typename]
+    if model.rowCount():
+        return type(model.node_at(0))
+    return None
+
+
+def _patch_model(
+    handler: BaseQueryHandler,
+    loc: _Location,
+    token: str,
+    operation: PatchOperation,
+    metadata: OperationMetaData,
+) -> None:
+    model: QGraphQListModel = loc.target  # type: ignore
+    length = model.rowCount()
+    if operation.op == "remove":
+        index = _index(token, length)
+        DetachedNodes.add(model.remove_range(index, 1))
+        return
+
+    value = operation.value
+    node_type = _row_type(handler, model, value)
+    if node_type is None:
+        # empty list, the owner knows how to deserialize its rows.
+        if operation.op != "add" or token not in ("0", "-"):
+            raise PatchError(f"invalid list index {token!r} (length {length})")
+        if isinstance(loc.owner, _BaseQGraphQLObject):
+            _patch_field(loc.owner, loc.field, [value], loc.owner_config, metadata)
+        else:
+            loc.owner.update({loc.field: [value]})
+        return
+
+    node_config = loc.config.choices[node_type.__name__] if loc.config.choices else loc.config
+    if operation.op == "replace":
+        index = _index(token, length)
+        current = model.node_at(index)
+        if value.get("id", None) and getattr(current, "_id", None) == value["id"]:
+            current.update(value, node_config, metadata)
+            if model.FIELD_ROLES:
+                # roles (and columns) are refreshed from the node.
+                model.replace_range(index, [current])
+            return
+        node = node_type.from_dict(model.parent(), value, node_config, metadata)
+        DetachedNodes.add(model.replace_range(index, [node]))
+        return
+
+    index = length if token == "-" else _index(token, length + 1)
+    node = node_type.from_dict(model.parent(), value, node_config, metadata)
+    model.insert_many(index, [node])
+
+
+def apply_patch(handler: BaseQueryHandler, operations: list[dict]) -> None:
+    """Applies a JSON-Patch to the data of a handler in place.
+
+    Only the patched fields are compared (and emit signals), nodes
+    that are replaced or removed are released from the store once the
+    patch is applied, unless they are still used elsewhere in the data.
+    """
+    # patched nodes no longer match the payloads they were last updated with.
+    invalidate()
+    with handler.releasing_detached():
+        for operation in map(PatchOperation.from_dict, operations):
+            _apply_operation(handler, operation)
+
+
+def _apply_operation(handler: BaseQueryHandler, operation: PatchOperation) -> None:
+    metadata = handler.OPERATION_METADATA
+    root, *tokens = operation.path
+    if root != handler.ROOT_FIELD:
+        raise PatchError(f"{root!r} is not the root field of {handler.objectName()}")
+    if not tokens:
+        handler.on_data({root: None if operation.op == "remove" else operation.value})
+        return
+    *tokens, last = tokens
+    loc = _resolve(handler, tokens)
+    if isinstance(loc.target, QGraphQListModel):
+        _patch_model(handler, loc, last, operation, metadata)
+    else:
+        value = None if operation.op == "remove" else operation.value
+        node = loc.target
+        # a child that is still deferred was never built.
+        deferred = node._deferred and last in node._deferred
+        prev = None if deferred else getattr(node, "_" + last, None)
+        _patch_field(node, last, value, loc.config, metadata)
+        # a child that was removed or replaced by another node left the data.
+        if isinstance(prev, _BaseQGraphQLObject) and getattr(node, "_" + last, None) is not prev:
+            DetachedNodes.add([prev])
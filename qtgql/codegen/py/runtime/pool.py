@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Generic, Iterable, Optional, TypeVar
+
+import shiboken6
+from PySide6.QtCore import QObject
+
+if TYPE_CHECKING:  # pragma: no cover
+    from qtgql.codegen.py.runtime.bases import _BaseQGraphQLObject
+
+__all__ = ["ObjectPool"]
+
+T = TypeVar("T", bound="_BaseQGraphQLObject")
+
+
+class ObjectPool(Generic[T]):
+    """Recycles instances of a generated type instead of deleting them.
+
+    Released instances are reset to their default values (without
+    emitting signals), detached from their parent and disconnected from
+    all receivers, those belong to consumers of nodes that were already
+    released and must not observe the node as a different one.
+    """
+
+    def __init__(self, node_type: type[T], max_size: int):
+        self.node_type = node_type
+        self.max_size = max_size
+        self._free: list[T] = []
+        self.created = 0
+        self.reused = 0
+
+    def __len__(self) -> int:
+        return len(self._free)
+
+    def acquire(self, parent: Optional[QObject] = None) -> T:
+        if self._free:
+            self.reused += 1
+            node = self._free.pop()
+            node.setParent(parent)
+            return node
+        self.created += 1
+        return self.node_type(parent=parent)
+
+    def release(self, nodes: Iterable[T]) -> list[T]:
+        """:returns: Nodes that the pool had no room for, these should be
+        deleted by the caller."""
+        rejected = []
+        free = self._free
+        for node in nodes:
+            if len(free) >= self.max_size or not shiboken6.isValid(node):
+                rejected.append(node)
+                continue
+            node._reset()
+            # otherwise it would be deleted with its previous parent.
+            node.setParent(None)
+            # i.e from all the signals to all the receivers.
+            QObject.disconnect(node, None, None, None)  # type: ignore
+            free.append(node)
+        return rejected
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import json
+import sys
+import time
+from collections import Counter
+from typing import Any, Optional
+
+from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtQml import QmlElement
+
+from qtgql.codegen.py.runtime.collector import get_collector
+from qtgql.tools import qproperty, slot
+
+__all__ = ["StoreProfiler", "StoreProfilerOverlay", "estimate_size"]
+
+QML_IMPORT_NAME = "qtgql.debug"
+QML_IMPORT_MAJOR_VERSION = 1
+
+AGE_BUCKETS: tuple[tuple[str, float], ...] = (
+    ("<1s", 1),
+    ("<10s", 10),
+    ("<1m", 60),
+    ("<10m", 600),
+    ("<1h", 3600),
+)
+OLDEST_BUCKET = ">=1h"
+
+
+def estimate_size(node: QObject) -> int:
+    """Shallow estimation of the Python side of a node in bytes.
+
+    The C++ side of the QObject is not included.
+    """
+    attrs = node.__dict__
+    return (
+        sys.getsizeof(node)
+        + sys.getsizeof(attrs)
+        + sum(sys.getsizeof(v) for v in attrs.values() if not isinstance(v, QObject))
+    )
+
+
+def _age_bucket(age: float) -> str:
+    for name, limit in AGE_BUCKETS:
+        if age < limit:
+            return name
+    return OLDEST_BUCKET
+
+
+class StoreProfiler:
+    """Introspects all the `QGraphQLObjectStore`s and the live
+    `QGraphQListModel`s."""
+
+    def snapshot(self) -> dict[str, Any]:
+        """:returns: A JSON-serializable report of the stores occupancy."""
+        now = time.monotonic()
+        collector = get_collector()
+        types: dict[str, dict[str, Any]] = {}
+        for store in collector.stores:
+            records = store.records()
+            if not records and not store.has_garbage():
+                continue
+            name = store.node_type.__name__ if store.node_type else "<unknown>"
+            report = types.setdefault(
+                name,
+                {
+                    "count": 0,
+                    "unretained": 0,
+                    "estimated_bytes": 0,
+                    "retainers": Counter(),
+                    "ages": Counter(),
+                },
+            )
+            report["count"] += len(records)
+            report["unretained"] += len(store._unretained)
+            for record in records:
+                report["estimated_bytes"] += estimate_size(record.node)
+                report["retainers"].update(record.retainers)
+                report["ages"][_age_bucket(now - store.added_at(record.node.id))] += 1
+        for report in types.values():
+            report["retainers"] = dict(report["retainers"])
+            report["ages"] = dict(report["ages"])
+
+        models = collector.models
+        return {
+            "types": types,
+            "models": {
+                "count": len(models),
+                "rows": sum(model.rowCount() for model in models),
+                "detached": sum(1 for model in models if model.parent() is None),
+            },
+            "total": {
+                "count": sum(t["count"] for t in types.values()),
+                "unretained": sum(t["unretained"] for t in types.values()),
+                "estimated_bytes": sum(t["estimated_bytes"] for t in types.values()),
+            },
+        }
+
+    def retained_longer_than(self, seconds: float) -> list[dict[str, Any]]:
+        """:returns: Nodes that are retained for more than `seconds`, useful
+        for tracking nodes whose retainers never empties."""
+        now = time.monotonic()
+        ret = []
+        for store in get_collector().stores:
+            for record in store.records():
+                age = now - store.added_at(record.node.id)
+                if age > seconds:
+                    ret.append(
+                        {
+                            "typename": record.node.__class__.__name__,
+                            "id": record.node.id,
+                            "retainers": sorted(record.retainers),
+                            "age": age,
+                        }
+                    )
+        return ret
+
+    def to_json(self, indent: Optional[int] = None) -> str:
+        return json.dumps(self.snapshot(), indent=indent)
+
+
+@QmlElement
+class StoreProfilerOverlay(QObject):
+    """Exposes the profiler report to QML (i.e for a debug overlay).
+
+    ```qml
+    import qtgql.debug
+
+    StoreProfilerOverlay{id: profiler; interval: 1000}
+    Text{text: profiler.report}
+    ```
+    """
+
+    reportChanged = Signal()
+    intervalChanged = Signal()
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._profiler = StoreProfiler()
+        self._report = ""
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.refresh)  # type: ignore
+
+    @slot
+    def refresh(self) -> None:
+        self._report = self._profiler.to_json(indent=2)
+        self.reportChanged.emit()
+
+    @qproperty(str, notify=reportChanged)
+    def report(self) -> str:
+        return self._report
+
+    @slot
+    def set_interval(self, interval: int) -> None:
+        if interval > 0:
+            self._timer.start(interval)
+        else:
+            self._timer.stop()
+        self.intervalChanged.emit()
+
+    @qproperty(int, notify=intervalChanged, fset=set_interval)
+    def interval(self) -> int:
+        return self._timer.interval() if self._timer.isActive() else 0
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import contextlib
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Iterator, Optional
+
+import shiboken6
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from qtgql.tools import slot
+
+if TYPE_CHECKING:  # pragma: no cover
+    from qtgql.codegen.py.runtime.bases import QGraphQListModel
+
+__all__ = ["ProgressiveMaterializer", "get_active_materializer"]
+
+
+class _Job:
+    __slots__ = ("model", "rows", "create", "next")
+
+    def __init__(self, model: QGraphQListModel, rows: list[dict], create: Callable[[dict], Any]):
+        self.model = model
+        self.rows = rows
+        self.create = create
+        self.next = 0
+
+
+def get_active_materializer() -> Optional[ProgressiveMaterializer]:
+    """:returns: The materializer of the result that is being built right
+    now, if it is built progressively."""
+    return ProgressiveMaterializer.current
+
+
+class ProgressiveMaterializer(QObject):
+    """Builds the rows of list models in time slices.
+
+    While a result is built under `active()`, every list model gets as
+    many rows as the frame budget allows, the remaining rows are built
+    on the next event-loop turns (each turn bounded by `budget_ms`) and
+    inserted with a single ranged insertion per model per turn. Rows
+    that contain list models of their own schedule them the same way.
+    """
+
+    progressChanged = Signal()
+    current: ClassVar[Optional[ProgressiveMaterializer]] = None
+    """The materializer that is `active()` (or building rows)."""
+
+    def __init__(self, budget_ms: float = 8.0, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.budget_ms = budget_ms
+        self._jobs: deque[_Job] = deque()
+        self._deadline: float = 0.0
+        self._total = 0
+        self._done = 0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._on_timeout)  # type: ignore
+
+    @property
+    def progress(self) -> float:
+        """Fraction of the known rows that were built, 1.0 when idle.
+
+        Note that rows may still discover nested lists, so the total
+        grows while building.
+        """
+        if not self._jobs:
+            return 1.0
+        return self._done / self._total
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._jobs)
+
+    @contextlib.contextmanager
+    def active(self) -> Iterator[None]:
+        """Builds list models created meanwhile progressively, the current
+        frame budget starts now."""
+        prev = ProgressiveMaterializer.current
+        ProgressiveMaterializer.current = self
+        self._deadline = time.perf_counter() + self.budget_ms / 1000
+        try:
+            yield
+        finally:
+            ProgressiveMaterializer.current = prev
+        self._after_slice()
+
+    def build_rows(
+        self, model: QGraphQListModel, rows: list[dict], create: Callable[[dict], Any]
+    ) -> list:
+        """Builds rows of a new model until the frame budget is exhausted
+        and schedules the rest.
+
+        :returns: The rows that were built.
+        """
+        self._total += len(rows)
+        job = _Job(model, rows, create)
+        built = self._build(job)
+        if job.next < len(rows):
+            self._jobs.append(job)
+        return built
+
+    def flush(self) -> None:
+        """Builds all the pending rows now."""
+        self._deadline = float("inf")
+        self._run()
+        self._after_slice()
+
+    def cancel(self) -> None:
+        """Drops the pending rows (i.e when the result was released)."""
+        self._jobs.clear()
+        self._timer.stop()
+        self._after_slice()
+
+    def _build(self, job: _Job) -> list:
+        built = []
+        rows = job.rows
+        create = job.create
+        deadline = self._deadline
+        i = job.next
+        # at least one row, even if the budget was exhausted by the parents.
+        while i < len(rows):
+            built.append(create(rows[i]))
+            i += 1
+            if time.perf_counter() > deadline:
+                break
+        self._done += i - job.next
+        job.next = i
+        return built
+
+    def _run(self) -> None:
+        prev = ProgressiveMaterializer.current
+        ProgressiveMaterializer.current = self
+        try:
+            jobs = self._jobs
+            # each turn builds at least one row.
+            first = True
+            while jobs and (first or time.perf_counter() <= self._deadline):
+                job = jobs[0]
+                # the model might have been deleted meanwhile.
+                if not shiboken6.isValid(job.model):
+                    jobs.popleft()
+                    continue
+                first = False
+                built = self._build(job)
+                if job.next >= len(job.rows):
+                    jobs.popleft()
+                job.model.extend(built)
+        finally:
+            ProgressiveMaterializer.current = prev
+
+    def _after_slice(self) -> None:
+        if self._jobs:
+            if not self._timer.isActive():
+                self._timer.start()
+        else:
+            self._total = self._done = 0
+        self.progressChanged.emit()
+
+    @slot
+    def _on_timeout(self) -> None:
+        self._deadline = time.perf_counter() + self.budget_ms / 1000
+        self._run()
+        self._after_slice()
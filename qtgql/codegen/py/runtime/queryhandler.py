@@ -1,17 +1,42 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, ClassVar, Dict, Generic, NamedTuple, Optional, TypeVar
-
+import contextlib
+import logging
+from typing import (
+    Any,
+    ClassVar,
+    ContextManager,
+    Dict,
+    Generic,
+    Iterator,
+    NamedTuple,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+import attrs
 from PySide6.QtCore import QObject, Signal
 from PySide6.QtQuick import QQuickItem
 
+from qtgql.codegen.py.runtime.bases import (
+    DetachedNodes,
+    QGraphQListModel,
+    _BaseQGraphQLObject,
+    loose_tree,
+)
+from qtgql.codegen.py.runtime.decode import get_decoder
 from qtgql.codegen.py.runtime.environment import get_gql_env
+from qtgql.codegen.py.runtime.patch import PatchError, apply_patch
+from qtgql.codegen.py.runtime.progressive import ProgressiveMaterializer
+from qtgql.codegen.py.runtime.structhash import payload_hashes
+from qtgql.gqltransport.client import GqlClientMessage
 from qtgql.tools import qproperty, slot
 
-if TYPE_CHECKING:
-    from qtgql.gqltransport.client import GqlClientMessage
+logger = logging.getLogger(__name__)
 
-T_QObject = TypeVar("T_QObject", bound=QObject)
+T_QObject = TypeVar("T_QObject", bound=Union[_BaseQGraphQLObject, QGraphQListModel])
+"""The type of the root field of an operation."""
 
 
 class SelectionConfig(NamedTuple):
@@ -24,6 +49,32 @@ class OperationMetaData(NamedTuple):
     selections: SelectionConfig
 
 
+class Connection(NamedTuple):
+    """A Relay connection that a handler pages through (see
+    `BaseQueryHandler.fetch_more()`)."""
+
+    path: tuple[str, ...]
+    """Field names from the root field to the connection."""
+    variable: str
+    """The variable of the `after` cursor."""
+
+    def page_of(self, data: dict) -> Optional[dict]:
+        """:returns: The connection payload of a result."""
+        ret: Optional[dict] = data
+        for name in self.path:
+            ret = ret.get(name, None) if ret else None
+        return ret
+
+    def resolve(self, root: Optional[QObject]) -> Optional[QObject]:
+        """:returns: The connection object under the root object."""
+        ret = root
+        for name in self.path[1:]:
+            if ret is None:
+                return None
+            ret = getattr(ret, name)
+        return ret
+
+
 class QSingletonMeta(type(QObject)):  # type: ignore
     def __init__(cls, name, bases, dict):
         super().__init__(name, bases, dict)
@@ -40,13 +91,18 @@ class BaseQueryHandler(Generic[T_QObject], QObject, metaclass=QSingletonMeta):
 
     instance: ClassVar[Optional[BaseQueryHandler]] = None
     ENV_NAME: ClassVar[str]
+    ROOT_FIELD: ClassVar[str]
     OPERATION_METADATA: ClassVar[OperationMetaData]
+    TWO_PHASE_DECODE: ClassVar[bool] = False
+    STRUCTURAL_HASHING: ClassVar[bool] = False
+    CONNECTION: ClassVar[Optional[Connection]] = None
     _message_template: ClassVar[GqlClientMessage]
 
     graphqlChanged = Signal()
     dataChanged = Signal()
     completedChanged = Signal()
     errorChanged = Signal()
+    progressChanged = Signal()
 
     def __init__(self, parent: Optional[QObject] = None):
         super().__init__(parent)
@@ -58,11 +114,81 @@ class BaseQueryHandler(Generic[T_QObject], QObject, metaclass=QSingletonMeta):
         self.environment.add_query_handler(self)
         self._consumers_count: int = 0
         self._operation_on_the_fly: bool = False
+        self._materializer: Optional[ProgressiveMaterializer] = None
+        self._decode_snapshot: Optional[dict] = None
+        """The last decoded result (see `QtGqlConfig.two_phase_decode`)."""
+        self._decode_generation: int = 0
+        """Bumped when the snapshot is dropped, results that were decoded
+        against an older snapshot don't replace it."""
+        self._pending_decodes: int = 0
+        self._completed_after_decode: bool = False
+        self._page_message: Optional[GqlClientMessage] = None
+        """The message of the page being fetched (see `fetch_more()`)."""
+
+    def set_frame_budget(self, budget_ms: Optional[float]) -> None:
+        """Builds the rows of results in time slices of `budget_ms` per
+        event-loop turn (see `ProgressiveMaterializer`), so that large
+        results don't block the UI. `None` (the default) builds results
+        at once.
+        """
+        if budget_ms is None:
+            if self._materializer is not None:
+                self._materializer.flush()
+                self._materializer.deleteLater()
+                self._materializer = None
+        elif self._materializer is None:
+            self._materializer = ProgressiveMaterializer(budget_ms, parent=self)
+            self._materializer.progressChanged.connect(self.progressChanged)  # type: ignore
+        else:
+            self._materializer.budget_ms = budget_ms
+
+    @qproperty(float, notify=progressChanged)
+    def progress(self) -> float:
+        """Fraction of the current result that was built, 1.0 once all the
+        rows are in their models."""
+        if self._materializer is None:
+            return 1.0
+        return self._materializer.progress
+
+    def materializing(self) -> ContextManager[None]:
+        """Used by the generated `on_data()` around deserialization."""
+        if self._materializer is None:
+            return contextlib.nullcontext()
+        return self._materializer.active()
+
+    def hashing(self) -> ContextManager[None]:
+        """Used by the generated `on_data()` around applying a result (see
+        `QtGqlConfig.structural_hashing`)."""
+        if not self.STRUCTURAL_HASHING:
+            return contextlib.nullcontext()
+        return payload_hashes()
+
+    @contextlib.contextmanager
+    def releasing_detached(self) -> Iterator[None]:
+        """Used around updates of the data, nodes that left it (see
+        `DetachedNodes`) are released once the update is done."""
+        detached = DetachedNodes()
+        prev, DetachedNodes.active = DetachedNodes.active, detached
+        try:
+            yield
+        finally:
+            DetachedNodes.active = prev
+        detached.release(self._data, self.OPERATION_METADATA)
+
+    def finish_materialization(self) -> None:
+        """Builds the remaining rows of the current result now."""
+        if self._materializer is not None and self._materializer.pending:
+            self._materializer.flush()
 
     def loose(self) -> None:
-        """Releases retention from all children, real implementation is
-        generated."""
-        raise NotImplementedError
+        """Releases retention from all children."""
+        self._drop_decode_snapshot()
+        self._page_message = None
+        if self._materializer is not None:
+            self._materializer.cancel()
+        if self._data is not None:
+            loose_tree(self._data, self.OPERATION_METADATA)
+            self._data = None
 
     def unconsume(self) -> None:
         self._consumers_count -= 1
@@ -70,8 +196,20 @@ class BaseQueryHandler(Generic[T_QObject], QObject, metaclass=QSingletonMeta):
             self.loose()
             self._data = None
 
+    def restore(self) -> None:
+        """Deserializes the snapshot result of this operation if there is one
+        (see `QtGqlEnvironment.restore_snapshot()`)."""
+        if self._data is None:
+            data = self.environment.take_snapshot_result(self.OPERATION_METADATA.operation_name)
+            if data is not None:
+                operation_on_the_fly = self._operation_on_the_fly
+                self.on_data(data)
+                self._operation_on_the_fly = operation_on_the_fly
+
     def consume(self) -> None:
         # if it is the first consumer (or first after all previous consumers disposed) fetch the data here.
+        if self._consumers_count <= 0:
+            self.restore()
         if self._consumers_count <= 0 and not self._operation_on_the_fly:
             if self._completed:
                 self.refetch()
@@ -81,8 +219,49 @@ class BaseQueryHandler(Generic[T_QObject], QObject, metaclass=QSingletonMeta):
 
     @property
     def message(self) -> GqlClientMessage:
+        if self._page_message is not None:
+            return self._page_message
         return self._message_template
 
+    def connection(self) -> Optional[QObject]:
+        """:returns: The paginated connection of the current data if this
+        operation has one."""
+        if self.CONNECTION is None:
+            return None
+        return self.CONNECTION.resolve(self._data)
+
+    def can_fetch_more(self) -> bool:
+        if self._operation_on_the_fly or (connection := self.connection()) is None:
+            return False
+        page_info = connection.pageInfo  # type: ignore
+        return bool(page_info and page_info.hasNextPage)
+
+    @slot
+    def fetch_more(self) -> None:
+        """Fetches the page after the last one and appends its edges to the
+        edges model of the connection.
+
+        Views call it through `QGraphQListModel.fetchMore()` when they
+        are scrolled to the end of the edges.
+        """
+        if not self.can_fetch_more():
+            return
+        assert self.CONNECTION
+        template = self._message_template
+        cursor = self.connection().pageInfo.endCursor  # type: ignore
+        self._page_message = GqlClientMessage(
+            payload=attrs.evolve(template.payload, variables={self.CONNECTION.variable: cursor})
+        )
+        self.fetch()
+
+    def merge_page(self, data: dict) -> None:  # pragma: no cover
+        # real is on derived class.
+        raise NotImplementedError
+
+    def _attach_pager(self) -> None:
+        if (connection := self.connection()) is not None:
+            connection.edges.set_pager(self)  # type: ignore
+
     @qproperty(QObject, notify=dataChanged)
     def data(self) -> Optional[QObject]:
         return self._data
@@ -98,6 +277,8 @@ class BaseQueryHandler(Generic[T_QObject], QObject, metaclass=QSingletonMeta):
     @slot
     def refetch(self) -> None:
         if not self._operation_on_the_fly:
+            # the whole result is fetched again, a page that failed isn't.
+            self._page_message = None
             self._completed = False
             self.fetch()
 
@@ -105,13 +286,96 @@ class BaseQueryHandler(Generic[T_QObject], QObject, metaclass=QSingletonMeta):
         # real is on derived class.
         raise NotImplementedError
 
+    def update(self, data: dict) -> None:  # pragma: no cover
+        # real is on derived class.
+        raise NotImplementedError
+
+    def receive(self, message: dict) -> None:
+        """Called by the client with a result from the network.
+
+        With `QtGqlConfig.two_phase_decode` the result is decoded on the
+        `DecodeWorker` and applied once decoded, otherwise it is applied
+        right away. Pages requested by `fetch_more()` are merged.
+        """
+        if self._page_message is not None:
+            # pages are appended, never diffed.
+            self._page_message = None
+            self._operation_on_the_fly = False
+            self._drop_decode_snapshot()
+            self.merge_page(message)
+        elif self.TWO_PHASE_DECODE:
+            get_decoder().submit(self, message)
+        else:
+            self.on_data(message)
+
+    @staticmethod
+    def decode(data: dict, previous: Optional[dict]) -> dict:  # pragma: no cover
+        """The thread-safe phase of two-phase decoding, real is on derived
+        class."""
+        raise NotImplementedError
+
+    def _drop_decode_snapshot(self) -> None:
+        self._decode_snapshot = None
+        self._decode_generation += 1
+
+    def apply_decoded(self, message: dict, decoded: dict) -> None:
+        """The GUI-thread phase of two-phase decoding."""
+        self._operation_on_the_fly = False
+        if self.environment.recorder is not None:
+            self.environment.recorder.add_operation(self.OPERATION_METADATA.operation_name, message)
+        self.on_decoded(decoded)
+
+    def on_decoded(self, decoded: dict) -> None:  # pragma: no cover
+        # real is on derived class.
+        raise NotImplementedError
+
+    def on_decode_error(self, message: dict, error: Exception) -> None:
+        """Called on the GUI thread when a result failed to decode, the result
+        is dropped and reported to `on_error()`."""
+        self._operation_on_the_fly = False
+        self.on_error([{"message": f"failed to decode the result: {error!r}"}])
+
+    def on_patch(self, operations: list[dict]) -> None:
+        """Applies a JSON-Patch (sent under `extensions.patch`) in place.
+
+        If the patch doesn't apply to the current data, the data is
+        refetched.
+        """
+        self._operation_on_the_fly = False
+        if self._data is None:
+            logger.warning("%s got a patch with no data to patch, refetching", self.objectName())
+            return self.refetch()
+        # the patch applies to the whole current result, rows that are
+        # still scheduled would be built over it.
+        self.finish_materialization()
+        try:
+            apply_patch(self, operations)
+        except PatchError as e:
+            logger.warning("%s failed to apply patch: %s, refetching", self.objectName(), e)
+            self.refetch()
+        else:
+            self._attach_pager()
+
     def on_completed(self) -> None:
+        if self._pending_decodes:
+            # the result is still being decoded.
+            self._completed_after_decode = True
+            return
         self._completed = True
         self.completedChanged.emit()
 
-    def on_error(self, message: list[dict[str, Any]]) -> None:  # pragma: no cover
-        # This (unlike `on_data` is not implemented for real)
-        raise NotImplementedError(message)
+    def _complete_if_decoded(self) -> None:
+        if self._completed_after_decode and not self._pending_decodes:
+            self._completed_after_decode = False
+            self.on_completed()
+
+    def on_error(self, message: list[dict[str, Any]]) -> None:
+        """Called by the client with the errors of the operation, the
+        operation is not on the fly anymore and a page that was requested
+        by `fetch_more()` is dropped (the next result replaces the data)."""
+        logger.warning("%s got errors: %s", self.objectName(), message)
+        self._operation_on_the_fly = False
+        self._page_message = None
 
 
 class UseQueryABC(QQuickItem):
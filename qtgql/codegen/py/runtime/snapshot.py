@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+from typing import TYPE_CHECKING, Optional, Union
+
+from attrs import define, field
+
+if TYPE_CHECKING:  # pragma: no cover
+    from pathlib import Path
+
+__all__ = ["Snapshot", "SnapshotWriter"]
+
+MAGIC = b"QTGQLSNP"
+VERSION = 1
+_PREAMBLE = struct.Struct("<8sII")
+"""magic, version, header length."""
+
+_Buffer = Union[bytes, mmap.mmap]
+_NOT_A_SNAPSHOT = "not a qtgql snapshot"
+
+
+@define
+class SnapshotWriter:
+    """Collects operation results and writes them as a snapshot file.
+
+    Attach it to `QtGqlEnvironment.recorder` to record a live session,
+    or feed it recorded responses (see `qtgql snapshot --help`).
+
+    A snapshot holds operation results, not the object stores, local
+    writes (see `QtGqlEnvironment.write_fragment()`) are not recorded.
+    """
+
+    env_name: str
+    _operations: dict[str, dict] = field(factory=dict)
+
+    def add_operation(self, operation_name: str, data: dict) -> None:
+        """:param data: The operation `data` as it arrived from the server."""
+        self._operations[operation_name] = data
+
+    def dumps(self) -> bytes:
+        index: dict[str, tuple[int, int]] = {}
+        blobs = bytearray()
+        for name, data in self._operations.items():
+            blob = json.dumps(data, separators=(",", ":")).encode()
+            index[name] = (len(blobs), len(blob))
+            blobs += blob
+        header = json.dumps({"env": self.env_name, "operations": index}).encode()
+        return _PREAMBLE.pack(MAGIC, VERSION, len(header)) + header + bytes(blobs)
+
+    def save(self, path: Path) -> None:
+        path.write_bytes(self.dumps())
+
+
+class Snapshot:
+    """A read-only view of a snapshot file.
+
+    Only the header is parsed on load, operation results are decoded
+    on demand (from a memory map when opened from a file).
+
+    File layout: `MAGIC | version (u32) | header length (u32) | header
+    (JSON) | blobs (JSON)`, the header maps each operation name to the
+    (offset, length) of its result in the blobs section.
+    """
+
+    def __init__(self, buffer: _Buffer):
+        """:raises ValueError: If `buffer` is not a (whole) snapshot."""
+        if len(buffer) < _PREAMBLE.size:
+            raise ValueError(_NOT_A_SNAPSHOT)
+        magic, version, header_len = _PREAMBLE.unpack_from(buffer)
+        if magic != MAGIC:
+            raise ValueError(_NOT_A_SNAPSHOT)
+        if version != VERSION:
+            raise ValueError(f"unsupported snapshot version {version}, expected {VERSION}")
+        self._buffer = buffer
+        header_start = _PREAMBLE.size
+        self._blobs_start = header_start + header_len
+        try:
+            header = json.loads(buffer[header_start : self._blobs_start])
+            self.env_name: str = header["env"]
+            self._index: dict[str, list[int]] = header["operations"]
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(_NOT_A_SNAPSHOT) from e
+        blobs_len = len(buffer) - self._blobs_start
+        if any(offset + length > blobs_len for offset, length in self._index.values()):
+            raise ValueError(_NOT_A_SNAPSHOT)
+
+    @classmethod
+    def open(cls, path: Path) -> Snapshot:
+        """:raises ValueError: If the file is not a (whole) snapshot."""
+        with path.open("rb") as f:
+            if not os.fstat(f.fileno()).st_size:
+                # can't map an empty file.
+                raise ValueError(_NOT_A_SNAPSHOT)
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(buffer)
+        except ValueError:
+            buffer.close()
+            raise
+
+    @property
+    def operations(self) -> list[str]:
+        return list(self._index.keys())
+
+    def __contains__(self, operation_name: str) -> bool:
+        return operation_name in self._index
+
+    def operation(self, operation_name: str) -> Optional[dict]:
+        """:returns: The decoded result of an operation if it exists in the
+        snapshot."""
+        if entry := self._index.get(operation_name, None):
+            offset, length = entry
+            start = self._blobs_start + offset
+            return json.loads(self._buffer[start : start + length])
+        return None
+
+    def close(self) -> None:
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import contextlib
+from collections import defaultdict
+from typing import Any, ClassVar, Iterable, Iterator, Optional, Tuple
+
+__all__ = ["SubtreeHash", "current_epoch", "current_hash", "invalidate", "payload_hashes"]
+
+SubtreeHash = Tuple[int, int]
+"""(payload digest, epoch)"""
+
+
+class _Epochs:
+    """Counts `invalidate()` calls, per type name."""
+
+    everything: ClassVar[int] = 0
+    """Invalidations that are not scoped to a type."""
+    by_type: ClassVar[defaultdict[str, int]] = defaultdict(int)
+    total: ClassVar[int] = 0
+
+
+class _Digests:
+    active: ClassVar[Optional[dict[int, tuple[dict, int]]]] = None
+    """(dict, digest) of the dicts of the payload being applied by `id()`
+    (see `payload_hashes()`), the dicts are kept so that ids are not
+    reused meanwhile."""
+
+
+def invalidate(typename: Optional[str] = None) -> None:
+    """Invalidates the recorded subtree hashes of nodes whose subtree
+    contains `typename` (all of them if not given).
+
+    Called on modifications that don't come from a payload (setters,
+    patches, `write_fragment()` etc.), after these a node could differ
+    from the payload it was last updated with.
+    """
+    if typename is None:
+        _Epochs.everything += 1
+    else:
+        _Epochs.by_type[typename] += 1
+    _Epochs.total += 1
+
+
+def current_epoch(typenames: Iterable[str] = ()) -> int:
+    """:returns: The number of `invalidate()` calls so far that affect
+    `typenames` (all of them if not given), nodes that recorded what they
+    were updated with compare it to tell whether they were modified
+    since.
+
+    :param typenames: The types of the subtree of a node (the codegen
+        knows them per selection).
+    """
+    if not typenames:
+        return _Epochs.total
+    by_type = _Epochs.by_type
+    return _Epochs.everything + sum(by_type.get(name, 0) for name in typenames)
+
+
+def current_hash(data: dict, typenames: Iterable[str] = ()) -> SubtreeHash:
+    """:returns: Structural hash of a payload (see
+    `QtGqlConfig.structural_hashing`).
+
+    A generated updater records this hash on the node it updated, an
+    update with an equal hash skips the node and its whole subtree.
+    Within `payload_hashes()` each dict of the payload is digested once.
+    """
+    digests = _Digests.active
+    if digests is None:
+        return _digest(data, {}), current_epoch(typenames)
+    if found := digests.get(id(data), None):
+        return found[1], current_epoch(typenames)
+    return _digest(data, digests), current_epoch(typenames)
+
+
+@contextlib.contextmanager
+def payload_hashes() -> Iterator[None]:
+    """Used around applying a payload, the digest of a dict combines the
+    digests of its children (bottom-up) and is computed once, rather
+    than once per ancestor.
+
+    The payload must not be modified meanwhile.
+    """
+    prev, _Digests.active = _Digests.active, {}
+    try:
+        yield
+    finally:
+        _Digests.active = prev
+
+
+def _digest(value: Any, digests: dict[int, tuple[dict, int]]) -> int:
+    if isinstance(value, dict):
+        ret = hash(tuple((key, _digest(child, digests)) for key, child in value.items()))
+        digests[id(value)] = (value, ret)
+        return ret
+    if isinstance(value, list):
+        return hash(tuple(_digest(child, digests) for child in value))
+    # 1, 1.0 and True hash the same.
+    return hash((value.__class__, value))
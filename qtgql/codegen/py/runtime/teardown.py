@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import ClassVar, Iterable, Optional
+
+import shiboken6
+from PySide6.QtCore import QObject, QTimer
+
+from qtgql.tools import slot
+
+__all__ = ["DeleteLaterQueue", "get_delete_queue"]
+
+
+class DeleteLaterQueue(QObject):
+    """Schedules ``deleteLater()`` of released objects in time-sliced batches.
+
+    Releasing a large tree at once would post thousands of deferred
+    deletes to the event loop and all of them would be processed in the
+    same frame. This queue spreads them over several event-loop turns,
+    each turn is bounded by ``budget_ms`` and ``batch_size``.
+    """
+
+    instance: ClassVar[Optional[DeleteLaterQueue]] = None
+
+    def __init__(
+        self, budget_ms: float = 4.0, batch_size: int = 256, parent: Optional[QObject] = None
+    ):
+        super().__init__(parent)
+        self.budget_ms = budget_ms
+        self.batch_size = batch_size
+        self._pending: deque[QObject] = deque()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._on_timeout)  # type: ignore
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def enqueue(self, objects: Iterable[QObject]) -> None:
+        self._pending.extend(objects)
+        if self._pending and not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self) -> None:
+        """Schedules deletion of everything that is pending, regardless of the
+        budget."""
+        while self._pending:
+            self._delete_later(self._pending.popleft())
+
+    @staticmethod
+    def _delete_later(obj: QObject) -> None:
+        # objects might have been deleted already by their Qt parent.
+        if shiboken6.isValid(obj):
+            obj.deleteLater()
+
+    @slot
+    def _on_timeout(self) -> None:
+        deadline = time.perf_counter() + self.budget_ms / 1000
+        pending = self._pending
+        for _ in range(self.batch_size):
+            if not pending:
+                break
+            self._delete_later(pending.popleft())
+            if time.perf_counter() > deadline:
+                break
+        if pending:
+            self._timer.start()
+
+
+def get_delete_queue() -> DeleteLaterQueue:
+    if DeleteLaterQueue.instance is None:
+        DeleteLaterQueue.instance = DeleteLaterQueue()
+    return DeleteLaterQueue.instance
@@ -0,0 +1,21 @@
+{% for enum in context.enums %}
+class {{enum.name}}(Enum):
+    {% for member in enum.members %}
+    {{member.name}} = auto()
+    """{{member.description}}"""{% endfor %}
+
+{% endfor %}
+
+{% if context.enums %}
+@QmlElement
+class Enums(QObject):
+    {% for enum in context.enums %}
+    QEnum({{enum.name}})
+    {% endfor %}
+{% endif %}
+
+
+class SCALARS:
+    {% for scalar in context.custom_scalars %}
+    {{scalar}} = {{scalar}}{% else %}
+    pass{% endfor %}
@@ -1,14 +1,25 @@
-{% import "macros.jinja.py" as macros %}
+{% import "macros.jinja.py" as macros with context %}
 
+from functools import partial
 from typing import Optional, Union
 from PySide6.QtCore import Signal, QObject
 from PySide6.QtQml import QmlElement, QmlSingleton
-from qtgql.codegen.py.runtime.queryhandler import BaseQueryHandler, UseQueryABC, SelectionConfig, OperationMetaData
+from qtgql.codegen.py.runtime.queryhandler import BaseQueryHandler, UseQueryABC, SelectionConfig, OperationMetaData, Connection
 from qtgql.gqltransport.client import  GqlClientMessage, QueryPayload
-from qtgql.codegen.py.runtime.bases import QGraphQListModel
-from objecttypes import * # noqa
+from qtgql.codegen.py.runtime.bases import QGraphQListModel, NodeRecord
+from qtgql.codegen.py.runtime.notifications import emit_changed
+from qtgql.codegen.py.runtime.structhash import current_epoch, current_hash
+from qtgql.codegen.py.runtime.decode import decode_rows, decode_union
+from qtgql.codegen.py.runtime.lazy import from_choices
+from objecttypes import *
+from objecttypes import __TYPE_MAP__
+{% if context.config.split_modules and context.operation_types %}
+from objecttypes import {{ context.operation_types | join(", ") }}
+{% endif %}
+from qtgql.codegen.py.runtime.environment import get_gql_env
 
 
+{% set phases = [False, True] if context.config.two_phase_decode else [False] %}
 QML_IMPORT_NAME = "generated.{{context.config.env_name}}"
 QML_IMPORT_MAJOR_VERSION = 1
 
@@ -18,19 +29,121 @@ QML_IMPORT_MAJOR_VERSION = 1
 
 
 {% for query in context.queries %}
+# ---------- deserializers specialized for {{query.name}} ----------
+{% for sel in query.specialized_selections %}
+{% for decoded in phases %}
+{% set from_fn = sel.prefix ~ ('__from_decoded' if decoded else '__from_dict') %}
+{% set update_fn = sel.prefix ~ ('__apply' if decoded else '__update') %}
+def {{from_fn}}(parent: QObject, data: dict, metadata: OperationMetaData) -> {{sel.type.name}}:
+    cls = {{sel.type.name}}
+    store = cls.__store__
+    {% if sel.type.id_is_optional %}
+    if id_ := data.get('id', None):
+        if instance := store.get_node(id_):
+            store.retain(instance, metadata.operation_name)
+            {{update_fn}}(instance, data, metadata)
+            return instance
+    {% elif sel.type.has_id_field %}
+    if instance := store.get_node(data['id']):
+        store.retain(instance, metadata.operation_name)
+        {{update_fn}}(instance, data, metadata)
+        return instance
+    {% endif %}
+    {% if context.pool_size(sel.type) %}
+    inst = store.pool.acquire(parent)
+    {% else %}
+    inst = cls(parent=parent)
+    {% endif %}
+    {% for f in sel.fields -%}
+    {% set assign_to %}inst.{{f.private_name}}{% endset %}
+    {{ macros.deserialize_selected(f, assign_to, sel, lazy_owner=context.config.lazy_children and 'inst', decoded=decoded) | indent(4) }}
+    {% endfor %}
+    {% if decoded %}
+    inst._decoded = (data, current_epoch({{ sel.subtree_types }}))
+    {% endif %}
+    {% if sel.type.id_is_optional %}
+    if inst._id:
+        store.add_record(NodeRecord(inst, {metadata.operation_name}))
+    {% elif sel.type.has_id_field %}
+    store.add_record(NodeRecord(inst, {metadata.operation_name}))
+    {% endif %}
+    return inst
+
+
+def {{update_fn}}(self: {{sel.type.name}}, data: dict, metadata: OperationMetaData) -> None:
+    parent = self.parent()
+    {% if context.cache_policy(sel.type) and sel.type.has_id_field %}
+    self.__store__.touch(self)
+    {% endif %}
+    {% if decoded %}
+    epoch = current_epoch({{ sel.subtree_types }})
+    if (applied := self._decoded) is not None and applied[0] is data and applied[1] == epoch:
+        # nothing changed in this subtree since it was applied.
+        return
+    {% elif context.config.structural_hashing %}
+    subtree_hash = current_hash(data, {{ sel.subtree_types }})
+    if self._subtree_hash == subtree_hash:
+        # nothing changed in this subtree since the last update.
+        return
+    {% endif %}
+    # signals are emitted once all fields were applied.
+    changed: list[str] = []
+    {% for f in sel.fields -%}
+    {% set private_name %}self.{{f.private_name}}{% endset %}
+    {{ macros.update_selected(f, None, private_name, sel, lazy_owner=context.config.lazy_children and 'self', decoded=decoded) | indent(4) }}
+    {% endfor %}
+    {% if decoded %}
+    self._decoded = (data, epoch)
+    {% elif context.config.structural_hashing %}
+    self._subtree_hash = subtree_hash
+    {% endif %}
+    emit_changed(self, changed)
+
+{% endfor %}
+{% if context.config.two_phase_decode %}
+def {{sel.prefix}}__decode(data: dict, prev: Optional[dict]) -> dict:
+    # runs on the decode thread, must not touch QObjects.
+    ret = {}
+    if '__typename' in data:
+        ret['__typename'] = data['__typename']
+    {% for f in sel.fields -%}
+    {{ macros.decode_selected(f, sel) | indent(4) }}
+    {% endfor %}
+    # unchanged subtrees are reused as is, the GUI phase skips them by identity.
+    return prev if ret == prev else ret
+
+{% endif %}
+{% endfor %}
+{% for union in query.specialized_unions %}
+{{union.prefix}}__from_dict_choices = { {% for type_name, prefix in union.choices.items() %}"{{type_name}}": {{prefix}}__from_dict, {% endfor %} }
+{{union.prefix}}__update_choices = { {% for type_name, prefix in union.choices.items() %}"{{type_name}}": {{prefix}}__update, {% endfor %} }
+{% if context.config.two_phase_decode %}
+{{union.prefix}}__from_decoded_choices = { {% for type_name, prefix in union.choices.items() %}"{{type_name}}": {{prefix}}__from_decoded, {% endfor %} }
+{{union.prefix}}__apply_choices = { {% for type_name, prefix in union.choices.items() %}"{{type_name}}": {{prefix}}__apply, {% endfor %} }
+{{union.prefix}}__decode_choices = { {% for type_name, prefix in union.choices.items() %}"{{type_name}}": {{prefix}}__decode, {% endfor %} }
+{% endif %}
+{% endfor %}
+
+
 @QmlElement
 @QmlSingleton
 class {{query.name}}(BaseQueryHandler[{{query.field.annotation}}]):
     ENV_NAME = "{{context.config.env_name}}"
+    ROOT_FIELD = "{{query.field.name}}"
+    {% if context.config.two_phase_decode %}
+    TWO_PHASE_DECODE = True
+    {% endif %}
+    {% if context.config.structural_hashing %}
+    STRUCTURAL_HASHING = True
+    {% endif %}
     OPERATION_METADATA = OperationMetaData(
         operation_name="{{query.name}}",
         selections= {{query.operation_config}}
     )
     _message_template = GqlClientMessage(payload=QueryPayload(query="""{{query.query}}""", operationName="{{query.name}}"))
-
-
-
-
+    {% if query.connection %}
+    CONNECTION = Connection(path={{ query.connection.path }}, variable="{{ query.connection.variable }}")
+    {% endif %}
 
     def set_data(self, d: {{query.field.annotation}}) -> None:
         self._data = d
@@ -39,26 +152,79 @@ class {{query.name}}(BaseQueryHandler[{{query.field.annotation}}]):
     def update(self, data: dict) -> None:
         parent = self
         metadata = self.OPERATION_METADATA
-        config = self.OPERATION_METADATA.selections
+        {{ macros.update_selected(query.field, 'self.set_data', 'self._data', query.root_selection) | indent(8) }}
 
-        {{ macros.update_field(query.field,  fset_name='self.dataChanged', private_name='self._data', include_selection_check=False) | indent(4, True) }}
+    def deserialize(self, data: dict) -> None:
+        metadata = self.OPERATION_METADATA
+        parent = self
+        {{ macros.deserialize_selected(query.field, 'self._data', query.root_selection) | indent(8) }}
+        self.dataChanged.emit()
 
-    def loose(self) -> None:
+{% if query.connection %}
+    def merge_page(self, data: dict) -> None:
         metadata = self.OPERATION_METADATA
-        {% set private_name %}self._data{% endset %}
-        {{ macros.loose_field(query.field, private_name) }}
-    def deserialize(self, data: dict) -> None:
+        connection = self.connection()
+        page = self.CONNECTION.page_of(data)
+        if connection is None or not page:
+            return
+        edges = page.get('edges', None) or []
+        connection.edges.extend([{{ query.connection.prefix }}__edges__from_dict(connection, row, metadata) for row in edges])
+        if (page_info := page.get('pageInfo', None)) and connection.pageInfo is not None:
+            {{ query.connection.prefix }}__pageInfo__update(connection.pageInfo, page_info, metadata)
+
+{% endif %}
+{% if context.config.two_phase_decode %}
+    @staticmethod
+    def decode(data: dict, previous: Optional[dict]) -> dict:
+        prev = previous
+        ret = {}
+        {{ macros.decode_selected(query.field, query.root_selection) | indent(8) }}
+        return ret
+
+    def update_decoded(self, data: dict) -> None:
+        parent = self
+        metadata = self.OPERATION_METADATA
+        {{ macros.update_selected(query.field, 'self.set_data', 'self._data', query.root_selection, decoded=True) | indent(8) }}
+
+    def deserialize_decoded(self, data: dict) -> None:
         metadata = self.OPERATION_METADATA
-        config = self.OPERATION_METADATA.selections
         parent = self
-        {% set assign_to %}self._data{% endset %}
-        {{ macros.deserialize_field(query.field,  assign_to, include_selection_check=False) | indent(4) }}
+        {{ macros.deserialize_selected(query.field, 'self._data', query.root_selection, decoded=True) | indent(8) }}
         self.dataChanged.emit()
+
+    def on_data(self, message: dict) -> None:
+        self._decode_snapshot = self.decode(message, self._decode_snapshot)
+        self.apply_decoded(message, self._decode_snapshot)
+
+    def on_decoded(self, data: dict) -> None:
+        # the current result must be complete before it is updated.
+        self.finish_materialization()
+        if not self._data:
+            with self.materializing():
+                self.deserialize_decoded(data)
+
+        # data existed and arrived data was null, empty data.
+        elif not data.get('{{query.field.name}}', None):
+            self._data = None
+            self.dataChanged.emit()
+        # data existed already, update the data
+        else:
+            with self.releasing_detached():
+                self.update_decoded(data)
+        {% if query.connection %}
+        self._attach_pager()
+        {% endif %}
+{% else %}
     def on_data(self, message: dict) -> None:
         self._operation_on_the_fly = False
+        if self.environment.recorder is not None:
+            self.environment.recorder.add_operation(self.OPERATION_METADATA.operation_name, message)
 
+        # the current result must be complete before it is updated.
+        self.finish_materialization()
         if not self._data:
-            self.deserialize(message)
+            with self.materializing(), self.hashing():
+                self.deserialize(message)
 
         # data existed and arrived data was null, empty data.
         elif not message.get('{{query.field.name}}', None):
@@ -66,15 +232,26 @@ class {{query.name}}(BaseQueryHandler[{{query.field.annotation}}]):
             self.dataChanged.emit()
         # data existed already, update the data
         else:
-            self.update(message)
+            with self.releasing_detached(), self.hashing():
+                self.update(message)
+        {% if query.connection %}
+        self._attach_pager()
+        {% endif %}
+{% endif %}
 
 {% endfor %}
 
 
 def init() -> None:
+    {% if context.config.split_modules %}
+    # the types of the map are imported on first lookup.
+    get_gql_env("{{context.config.env_name}}").type_map = __TYPE_MAP__
+    {% else %}
+    get_gql_env("{{context.config.env_name}}").type_map.update(__TYPE_MAP__)
+    {% endif %}
     {% for query in context.queries %}
     {{query.name}}()
     {% endfor %}
 @QmlElement
 class UseQuery(UseQueryABC):
-    ENV_NAME = "{{context.config.env_name}}"
\ No newline at end of file
+    ENV_NAME = "{{context.config.env_name}}"
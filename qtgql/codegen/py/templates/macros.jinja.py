@@ -1,4 +1,4 @@
-{% macro deserialize_field(f, assign_to, include_selection_check=True) -%}
+{% macro deserialize_field(f, assign_to, include_selection_check=True, lazy_owner=None) -%}
 {% if include_selection_check %}
 if '{{f.name}}' in config.selections.keys():
 {% endif %}
@@ -10,48 +10,42 @@ if '{{f.name}}' in config.selections.keys():
     inner_config = config
     {% endif %}
     {% endif %}
-    {% if f.type.is_object_type -%}
-    if field_data:
-        {{ assign_to }} = {{f.type.is_object_type.name}}.from_dict(
-        parent,
-        field_data,
-        inner_config,
-        metadata,
-    )
-    {% elif f.type.is_model -%}
-    {% if f.type.is_model.is_object_type -%}
-    {{ assign_to }} = QGraphQListModel(
-        parent=parent,
-        data=[{{f.type.is_model.is_object_type.name}}.from_dict(parent, data=node, config=inner_config, metadata=metadata) for
-              node in field_data],
-    )
-    {% elif f.type.is_model.is_union -%}
-    model_data = []
-    for node in field_data:
-        type_name = node['__typename']
-        choice = inner_config.choices[type_name]
-        model_data.append(
-            __TYPE_MAP__[type_name].from_dict(self, node,
-                                              choice, metadata)
-        )
-    {{ assign_to }} = QGraphQListModel(parent, data=model_data)
-    {% endif %}
-    {% elif f.type.is_builtin_scalar -%}
-    {{ assign_to }} = field_data
-    {% elif f.is_custom_scalar -%}
-    {{ assign_to }} = SCALARS.{{f.is_custom_scalar.__name__}}.from_graphql(field_data)
-    {% elif f.type.is_enum -%}
-    {{ assign_to }} = {{f.type.is_enum.name}}[field_data]
-    {% elif f.type.is_union() -%}
-    type_name = field_data['__typename']
-    choice = inner_config.choices[type_name]
-    {{ assign_to }} = __TYPE_MAP__[type_name].from_dict(parent, field_data, choice, metadata)
+    {% if lazy_owner and f.holds_nodes %}
+    if not {{lazy_owner}}._defer('{{f.name}}', field_data, {{ build_field(f) }}, {{ node_types(f) }}):
+        {{ _deserialize_value(f, assign_to) | indent(8) }}
+    {% else %}
+    {{ _deserialize_value(f, assign_to) | indent(4) }}
     {% endif %}
 {%- endmacro %}
 
 
+{% macro _deserialize_value(f, assign_to) -%}
+{% if f.type.is_object_type -%}
+if field_data:
+    {{ assign_to }} = {{ context.type_ref(f.type.is_object_type) }}.from_dict(
+    parent,
+    field_data,
+    inner_config,
+    metadata,
+)
+{% elif f.type.is_model -%}
+{{ assign_to }} = {{ _model_class(f) }}.from_rows(parent, field_data, create={{ _build_node(f) }}{{ _lazy_rows(f) }})
+{% elif f.type.is_builtin_scalar -%}
+{{ assign_to }} = field_data
+{% elif f.is_custom_scalar -%}
+{{ assign_to }} = SCALARS.{{f.is_custom_scalar.__name__}}.decode(field_data)
+{% elif f.type.is_enum -%}
+{{ assign_to }} = {{f.type.is_enum.name}}[field_data]
+{% elif f.type.is_union() -%}
+type_name = field_data['__typename']
+choice = inner_config.choices[type_name]
+{{ assign_to }} = __TYPE_MAP__[type_name].from_dict(parent, field_data, choice, metadata)
+{% endif %}
+{%- endmacro %}
+
 
-{% macro update_field(f, fset_name, private_name, include_selection_check=True) -%}
+
+{% macro update_field(f, fset_name, private_name, include_selection_check=True, lazy_owner=None) -%}
 {% if include_selection_check %}
 if '{{f.name}}' in config.selections.keys():
 {% endif %}
@@ -63,75 +57,254 @@ if '{{f.name}}' in config.selections.keys():
     inner_config = config
     {% endif %}
     {% endif %}
-    {% if f.type.is_object_type %}
-    if not field_data:
-        {{fset_name}}(None)
-    else:
-        if {{private_name}} and {{private_name}}._id == field_data['id']:
-            {{private_name}}.update(field_data, inner_config, metadata)
-        else:
-            {{fset_name}}({{f.type.is_object_type.name}}.from_dict(
-                parent,
-                field_data,
-                inner_config,
-                metadata
-            ))
-    {% elif f.type.is_model %}
-    node_config = inner_config
-    new_len = len(field_data)
-    prev_len = {{private_name}}.rowCount()
-    if new_len < prev_len:
-        # crop the list to the arrived data length.
-        {{private_name}}.removeRows(new_len, prev_len - new_len)
-    for index, node in enumerate(field_data):
-        id_ = node.get("id", None)
-        if id_ and {{private_name}}._data[index].id == id_:
-            # same node on that index just call update there is no need call model signals.
-            {{private_name}}._data[index].update(field_data[index], node_config, metadata)
-        else:
-            # get or create node if wasn't on the correct index.
-            # Note: it is safe to call [].insert(50, 50) (although index 50 doesn't exist).
-            {% if f.type.is_model.is_object_type %}
-            {{private_name}}.insert(index,
-                                      {{f.type.is_model.is_object_type.name}}.from_dict(self, field_data[index], node_config, metadata))
-            {% elif f.type.is_model.is_union %}
-            type_name = node['__typename']
-            choice = node_config.choices[type_name]
-            {{private_name}}.insert(index,
-                                      __TYPE_MAP__[type_name].from_dict(self, field_data[index],
-                                                                        choice, metadata))
-            {% endif %}
-    {% elif f.type.is_builtin_scalar %}
-    if {{private_name}} != field_data:
-        {{fset_name}}(field_data)
-    {% elif f.is_custom_scalar %}
-    new = SCALARS.{{f.is_custom_scalar.__name__}}.from_graphql(field_data)
-    if new != {{private_name}}:
-        {{fset_name}}(new)
-    {% elif f.type.is_enum %}
-    if {{private_name}}.name != field_data:
-        {{fset_name}}({{f.type.is_enum.name}}[field_data])
-    {% elif f.type.is_union() %}
-    type_name = field_data['__typename']
-    choice = inner_config.choices[type_name]
+    {% if lazy_owner and f.holds_nodes %}
+    if not {{lazy_owner}}._redefer('{{f.name}}', field_data, {{ build_field(f) }}, {{ node_types(f) }}):
+        {{ _update_value(f, fset_name, private_name) | indent(8) }}
+    {% else %}
+    {{ _update_value(f, fset_name, private_name) | indent(4) }}
+    {% endif %}
+{%- endmacro %}
+
+
+{% macro _update_value(f, fset_name, private_name) -%}
+{% if f.type.is_object_type %}
+if not field_data:
+    {{ set_field(f, fset_name, private_name, 'None') | indent(4) }}
+else:
     if {{private_name}} and {{private_name}}._id == field_data['id']:
-        {{private_name}}.update(field_data, choice, metadata)
+        {{private_name}}.update(field_data, inner_config, metadata)
     else:
-        {{fset_name}}(__TYPE_MAP__[type_name].from_dict(parent, field_data, choice, metadata))
-    {% endif %}
+        {{ set_field(f, fset_name, private_name, context.type_ref(f.type.is_object_type) ~ '.from_dict(parent, field_data, inner_config, metadata)') | indent(8) }}
+{% elif f.type.is_model %}
+node_config = inner_config
+{% if f.type.is_model.is_object_type %}
+{{private_name}}.reconcile(
+    field_data,
+    create=lambda node: {{ context.type_ref(f.type.is_model.is_object_type) }}.from_dict(self, node, node_config, metadata),
+    update=lambda row, node: row.update(node, node_config, metadata),
+)
+{% elif f.type.is_model.is_union %}
+{{private_name}}.reconcile(
+    field_data,
+    create=lambda node: __TYPE_MAP__[node['__typename']].from_dict(
+        self, node, node_config.choices[node['__typename']], metadata
+    ),
+    update=lambda row, node: row.update(node, node_config.choices[node['__typename']], metadata),
+)
+{% endif %}
+{% elif f.type.is_builtin_scalar %}
+if {{private_name}} != field_data:
+    {{ set_field(f, fset_name, private_name, 'field_data') | indent(4) }}
+{% elif f.is_custom_scalar %}
+new = SCALARS.{{f.is_custom_scalar.__name__}}.decode(field_data)
+if new != {{private_name}}:
+    {{ set_field(f, fset_name, private_name, 'new') | indent(4) }}
+{% elif f.type.is_enum %}
+if {{private_name}}.name != field_data:
+    {{ set_field(f, fset_name, private_name, f.type.is_enum.name ~ '[field_data]') | indent(4) }}
+{% elif f.type.is_union() %}
+type_name = field_data['__typename']
+choice = inner_config.choices[type_name]
+if {{private_name}} and {{private_name}}._id == field_data['id']:
+    {{private_name}}.update(field_data, choice, metadata)
+else:
+    {{ set_field(f, fset_name, private_name, '__TYPE_MAP__[type_name].from_dict(parent, field_data, choice, metadata)') | indent(4) }}
+{% endif %}
 {%- endmacro %}
 
 
-{% macro loose_field(f, private_name) -%}
-        {% if f.type.is_object_type or f.type.is_union() %}
+{% macro detach_field(f, private_name, detach=True) -%}
+        {% if f.type.is_object_type or f.type.is_union() or f.type.is_model.is_object_type or f.type.is_model.is_union %}
         if {{private_name}}:
-            {{private_name}}.loose(metadata)
-            {{private_name}} = None
-        {% elif f.type.is_model.is_object_type or f.type.is_model.is_union %}
-        if {{private_name}}:
-            for node in {{private_name}}._data:
-                node.loose(metadata)
-            {{private_name}}.deleteLater()
+            children.append({{private_name}})
+            {% if detach %}
             {{private_name}} = None
+            {% endif %}
         {% endif %}
 {%- endmacro %}
+
+
+{% macro deserialize_selected(f, assign_to, sel, lazy_owner=None, decoded=False) -%}
+field_data = data.get('{{f.name}}', {{f.default_value}})
+{% if lazy_owner and f.holds_nodes %}
+if not {{lazy_owner}}._defer('{{f.name}}', field_data, {{ build_selected(f, sel, decoded) }}, {{ node_types(f) }}):
+    {{ _deserialize_selected_value(f, assign_to, sel, decoded) | indent(4) }}
+{% else %}
+{{ _deserialize_selected_value(f, assign_to, sel, decoded) }}
+{% endif %}
+{%- endmacro %}
+
+
+{% macro _deserialize_selected_value(f, assign_to, sel, decoded) -%}
+{% set from_fn = sel.child(f) ~ ('__from_decoded' if decoded else '__from_dict') -%}
+{% if f.type.is_object_type -%}
+if field_data:
+    {{ assign_to }} = {{ from_fn }}(parent, field_data, metadata)
+{% elif f.type.is_model -%}
+{{ assign_to }} = {{ _model_class(f) }}.from_rows(parent, field_data, create={{ _build_selected_node(f, sel, decoded) }}{{ _lazy_rows(f) }})
+{% elif f.type.is_builtin_scalar or (decoded and (f.is_custom_scalar or f.type.is_enum)) -%}
+{{ assign_to }} = field_data
+{% elif f.is_custom_scalar -%}
+{{ assign_to }} = SCALARS.{{f.is_custom_scalar.__name__}}.decode(field_data)
+{% elif f.type.is_enum -%}
+{{ assign_to }} = {{f.type.is_enum.name}}[field_data]
+{% elif f.type.is_union() -%}
+if field_data:
+    {{ assign_to }} = {{ from_fn }}_choices[field_data['__typename']](parent, field_data, metadata)
+{% endif %}
+{%- endmacro %}
+
+
+{% macro update_selected(f, fset_name, private_name, sel, lazy_owner=None, decoded=False) -%}
+field_data = data.get('{{f.name}}', {{f.default_value}})
+{% if lazy_owner and f.holds_nodes %}
+if not {{lazy_owner}}._redefer('{{f.name}}', field_data, {{ build_selected(f, sel, decoded) }}, {{ node_types(f) }}):
+    {{ _update_selected_value(f, fset_name, private_name, sel, decoded) | indent(4) }}
+{% else %}
+{{ _update_selected_value(f, fset_name, private_name, sel, decoded) }}
+{% endif %}
+{%- endmacro %}
+
+
+{% macro _update_selected_value(f, fset_name, private_name, sel, decoded) -%}
+{% set from_fn = sel.child(f) ~ ('__from_decoded' if decoded else '__from_dict') -%}
+{% set update_fn = sel.child(f) ~ ('__apply' if decoded else '__update') -%}
+{% if f.type.is_object_type %}
+if not field_data:
+    {{ set_field(f, fset_name, private_name, 'None') | indent(4) }}
+{% if sel.child_has_id(f) %}
+elif {{private_name}} and {{private_name}}._id == field_data['id']:
+{% else %}
+elif {{private_name}}:
+{% endif %}
+    {{ update_fn }}({{private_name}}, field_data, metadata)
+else:
+    {{ set_field(f, fset_name, private_name, from_fn ~ '(parent, field_data, metadata)') | indent(4) }}
+{% elif f.type.is_model %}
+{% if f.type.is_model.is_object_type %}
+{{private_name}}.reconcile(
+    field_data,
+    create=lambda node: {{ from_fn }}(self, node, metadata),
+    update=lambda row, node: {{ update_fn }}(row, node, metadata),
+)
+{% else %}
+{{private_name}}.reconcile(
+    field_data,
+    create=lambda node: {{ from_fn }}_choices[node['__typename']](self, node, metadata),
+    update=lambda row, node: {{ update_fn }}_choices[node['__typename']](row, node, metadata),
+)
+{% endif %}
+{% elif f.type.is_builtin_scalar or (decoded and f.is_custom_scalar) %}
+if {{private_name}} != field_data:
+    {{ set_field(f, fset_name, private_name, 'field_data') | indent(4) }}
+{% elif f.is_custom_scalar %}
+new = SCALARS.{{f.is_custom_scalar.__name__}}.decode(field_data)
+if new != {{private_name}}:
+    {{ set_field(f, fset_name, private_name, 'new') | indent(4) }}
+{% elif f.type.is_enum and decoded %}
+if {{private_name}} is not field_data:
+    {{ set_field(f, fset_name, private_name, 'field_data') | indent(4) }}
+{% elif f.type.is_enum %}
+if {{private_name}}.name != field_data:
+    {{ set_field(f, fset_name, private_name, f.type.is_enum.name ~ '[field_data]') | indent(4) }}
+{% elif f.type.is_union() %}
+type_name = field_data['__typename']
+if {{private_name}} and {{private_name}}._id == field_data['id']:
+    {{ update_fn }}_choices[type_name]({{private_name}}, field_data, metadata)
+else:
+    {{ set_field(f, fset_name, private_name, from_fn ~ '_choices[type_name](parent, field_data, metadata)') | indent(4) }}
+{% endif %}
+{%- endmacro %}
+
+
+{% macro decode_selected(f, sel) -%}
+field_data = data.get('{{f.name}}', {{f.default_value}})
+{% if f.holds_nodes %}
+prev_data = prev.get('{{f.name}}', None) if prev is not None else None
+{% endif %}
+{% if f.type.is_object_type -%}
+ret['{{f.name}}'] = {{ sel.child(f) }}__decode(field_data, prev_data) if field_data else None
+{% elif f.type.is_model and f.type.is_model.is_object_type -%}
+ret['{{f.name}}'] = decode_rows(field_data, prev_data, {{ sel.child(f) }}__decode)
+{% elif f.type.is_model -%}
+ret['{{f.name}}'] = decode_rows(field_data, prev_data, partial(decode_union, {{ sel.child(f) }}__decode_choices))
+{% elif f.type.is_builtin_scalar -%}
+ret['{{f.name}}'] = field_data
+{% elif f.is_custom_scalar -%}
+ret['{{f.name}}'] = SCALARS.{{f.is_custom_scalar.__name__}}.decode(field_data)
+{% elif f.type.is_enum -%}
+ret['{{f.name}}'] = {{f.type.is_enum.name}}[field_data]
+{% elif f.type.is_union() -%}
+ret['{{f.name}}'] = decode_union({{ sel.child(f) }}__decode_choices, field_data, prev_data) if field_data else None
+{% endif %}
+{%- endmacro %}
+
+
+{% macro set_field(f, fset_name, private_name, value) -%}
+{% if fset_name -%}
+{{fset_name}}({{value}})
+{%- else -%}
+{{private_name}} = {{value}}
+changed.append("{{f.signal_name}}")
+{%- endif %}
+{%- endmacro %}
+
+
+{% macro node_types(f) -%}
+{% if f.type.is_object_type -%}
+{{ context.type_ref(f.type.is_object_type) }}
+{%- elif f.type.is_model and f.type.is_model.is_object_type -%}
+{{ context.type_ref(f.type.is_model.is_object_type) }}
+{%- else -%}
+__TYPE_MAP__
+{%- endif %}
+{%- endmacro %}
+
+
+{% macro _build_node(f) -%}
+{% if f.type.is_object_type -%}
+partial({{ context.type_ref(f.type.is_object_type) }}.from_dict, parent, config=inner_config, metadata=metadata)
+{%- elif f.type.is_model and f.type.is_model.is_object_type -%}
+partial({{ context.type_ref(f.type.is_model.is_object_type) }}.from_dict, parent, config=inner_config, metadata=metadata)
+{%- else -%}
+partial(from_union, __TYPE_MAP__, parent, inner_config, metadata)
+{%- endif %}
+{%- endmacro %}
+
+
+{% macro build_field(f) -%}
+{% if f.type.is_model -%}
+partial({{ _model_class(f) }}.from_rows, parent, create={{ _build_node(f) }}{{ _lazy_rows(f) }})
+{%- else -%}
+{{ _build_node(f) }}
+{%- endif %}
+{%- endmacro %}
+
+
+{% macro _build_selected_node(f, sel, decoded=False) -%}
+{% set from_fn = sel.child(f) ~ ('__from_decoded' if decoded else '__from_dict') -%}
+{% if f.type.is_object_type or (f.type.is_model and f.type.is_model.is_object_type) -%}
+lambda node, parent=parent, metadata=metadata: {{ from_fn }}(parent, node, metadata)
+{%- else -%}
+partial(from_choices, {{ from_fn }}_choices, parent, metadata)
+{%- endif %}
+{%- endmacro %}
+
+
+{% macro build_selected(f, sel, decoded=False) -%}
+{% if f.type.is_model -%}
+partial({{ _model_class(f) }}.from_rows, parent, create={{ _build_selected_node(f, sel, decoded) }}{{ _lazy_rows(f) }})
+{%- else -%}
+{{ _build_selected_node(f, sel, decoded) }}
+{%- endif %}
+{%- endmacro %}
+
+
+{% macro _lazy_rows(f) -%}
+{% if context.config.lazy_rows %}, lazy_types={{ node_types(f) }}{% endif %}
+{%- endmacro %}
+
+
+{% macro _model_class(f) -%}
+{% if f.type.is_model.is_object_type and context.has_role_model(f.type.is_model.is_object_type) %}{{ context.type_ref(f.type.is_model.is_object_type) }}ListModel{% else %}QGraphQListModel{% endif %}
+{%- endmacro %}
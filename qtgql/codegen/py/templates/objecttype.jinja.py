@@ -0,0 +1,116 @@
+class {{ type.name }}({{context.base_object_name}}):
+    """{{  type.docstring  }}"""
+
+
+    def __init__(self, parent: QObject = None, {% for f in type.fields %} {{f.name}}: Optional[{{f.annotation}}] = None, {% endfor %}):
+        super().__init__(parent){% for f in type.fields %}
+        self.{{  f.private_name  }} = {{f.name}} if {{f.name}} else {{f.default_value}}{% endfor %}
+    {%for f in type.fields %}
+    {{f.signal_name}} = Signal()
+
+    def {{f.setter_name}}(self, v: {{f.annotation}}) -> None:
+        {% if context.config.structural_hashing or context.config.two_phase_decode %}
+        invalidate("{{ type.name }}")
+        {% endif %}
+        self.{{f.private_name}} = v
+        self.{{f.signal_name}}.emit()
+
+    @qproperty(type={{f.property_type}}, fset={{f.setter_name}}, notify={{f.signal_name}})
+    def {{f.name}}(self) -> {{f.fget_annotation}}:
+        {% if context.config.lazy_children and f.holds_nodes %}
+        if self._deferred and '{{f.name}}' in self._deferred:
+            self._materialize('{{f.name}}')
+        {% endif %}
+        {{f.fget}}
+    {% endfor %}
+    
+    def _detach_children(self) -> list[QObject]:
+        children = []
+        {% for f in type.fields -%}
+        {% set private_name %}self.{{f.private_name}}{% endset %}
+        {{ macros.detach_field(f, private_name) }}
+        {% endfor %}
+        return children
+
+    def _child_nodes(self) -> list[QObject]:
+        children = []
+        {% for f in type.fields -%}
+        {% set private_name %}self.{{f.private_name}}{% endset %}
+        {{ macros.detach_field(f, private_name, detach=False) }}
+        {% endfor %}
+        return children
+
+    def _reset(self) -> None:
+        self._subtree_hash = None
+        self._decoded = None
+        self._deferred = None{% for f in type.fields %}
+        self.{{  f.private_name  }} = {{f.default_value}}{% endfor %}
+
+    @classmethod
+    def from_dict(cls, parent, data: dict, config: SelectionConfig, metadata: OperationMetaData) -> {{type.name}}:
+        {% if type.id_is_optional %}
+        if id_ := data.get('id', None):
+            if instance := cls.__store__.get_node(id_):
+                cls.__store__.retain(instance, metadata.operation_name)
+                instance.update(data, config, metadata)
+                return instance
+        {% elif type.has_id_field %}
+        if instance := cls.__store__.get_node(data['id']):
+            cls.__store__.retain(instance, metadata.operation_name)
+            instance.update(data, config, metadata)
+            return instance
+        {% endif %}
+        {% if context.pool_size(type) %}
+        inst = cls.__store__.pool.acquire(parent)
+        {% else %}
+        inst = cls(parent=parent)
+        {% endif %}
+        {% for f in type.fields -%}
+        {% set assign_to %}inst.{{f.private_name}}{% endset %}
+        {{ macros.deserialize_field(f,  assign_to, lazy_owner=context.config.lazy_children and 'inst') | indent(8)}}
+        {%- endfor %}
+        {% if type.id_is_optional %}
+        if inst.id:
+            record = NodeRecord(node=inst, retainers=set()).retain(metadata.operation_name)
+            cls.__store__.add_record(record)
+        {% elif type.has_id_field and not type.id_is_optional %}
+        record = NodeRecord(node=inst, retainers=set()).retain(metadata.operation_name)
+        cls.__store__.add_record(record)
+        {% endif %}
+        return inst
+
+    def update(self, data, config: SelectionConfig, metadata: OperationMetaData) -> None:
+        parent = self.parent()
+        {% if context.cache_policy(type) and type.has_id_field %}
+        self.__store__.touch(self)
+        {% endif %}
+        {% if context.config.structural_hashing or context.config.two_phase_decode %}
+        invalidate("{{ type.name }}")
+        {% endif %}
+        # signals are emitted once all fields were applied.
+        changed: list[str] = []
+        {%for f in type.fields %}{% set private_name %}self.{{f.private_name}}{% endset %}
+        {{ macros.update_field(f, fset_name=None, private_name=private_name, lazy_owner=context.config.lazy_children and 'self') | indent(8, True) }}{% endfor %}
+        emit_changed(self, changed)
+
+{% if context.is_columnar(type) %}
+
+class {{ type.name }}ListModel(ColumnarListModel):
+    COLUMNS = ({% for f in type.fields %}
+        {{ f.column }},{% endfor %}
+    )
+
+{% elif context.has_role_model(type) %}
+
+class {{ type.name }}ListModel(QGraphQListModel):
+    FIELD_ROLES = { {% for f in type.fields %}'{{f.name}}': QGraphQListModel.OBJECT_ROLE + {{loop.index}}, {% endfor %} }
+    RAW_FIELDS = frozenset(({% for f in type.fields if f.type.is_builtin_scalar %}'{{f.name}}', {% endfor %}))
+
+{% endif %}
+__TYPE_MAP__['{{ type.name }}'] = {{ type.name }}
+{% if context.cache_policy(type) %}
+{{ type.name }}.__store__.set_policy({{ context.cache_policy(type) }}, env_name="{{context.config.env_name}}")
+{% endif %}
+{% if context.pool_size(type) %}
+{{ type.name }}.__store__.set_pool(ObjectPool({{ type.name }}, max_size={{ context.pool_size(type) }}))
+{% endif %}
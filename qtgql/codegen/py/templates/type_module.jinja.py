@@ -0,0 +1,14 @@
+{% import "macros.jinja.py" as macros with context %}
+{% include "types_header.jinja.py" %}
+import sys
+
+from . import SCALARS, __TYPE_MAP__{% for enum in context.enums_of(type) %}, {{enum}}{% endfor %}
+
+
+# other types are reached through the package, that imports them on first access.
+_types = sys.modules[__package__]
+
+__all__ = [{% for name in context.exports(type) %}"{{name}}", {% endfor %}]
+
+
+{% include "objecttype.jinja.py" %}
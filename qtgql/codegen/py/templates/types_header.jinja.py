@@ -0,0 +1,22 @@
+from __future__ import annotations
+from functools import partial
+from PySide6.QtCore import Signal, QObject, QEnum
+
+from PySide6.QtQuick import QQuickItem
+from typing import Optional, Union
+from enum import Enum, auto
+from PySide6.QtQml import QmlElement, QmlSingleton
+
+from qtgql.codegen.py.runtime.queryhandler import SelectionConfig, OperationMetaData
+from qtgql.tools import qproperty
+from qtgql.codegen.py.runtime.bases import QGraphQListModel, NodeRecord
+from qtgql.codegen.py.runtime.cachepolicy import CachePolicy, EvictionStrategy
+from qtgql.codegen.py.runtime.pool import ObjectPool
+from qtgql.codegen.py.runtime.notifications import emit_changed
+from qtgql.codegen.py.runtime.structhash import invalidate
+from qtgql.codegen.py.runtime.lazy import from_union
+from qtgql.codegen.py.runtime.columnar import ColumnarListModel, Column, enum_value
+
+{% for dep in context.dependencies %}
+{{dep}}{% endfor %}
+
@@ -0,0 +1,23 @@
+{% include "types_header.jinja.py" %}
+from importlib import import_module
+from qtgql.codegen.py.runtime.lazy import LazyTypeMap
+
+
+QML_IMPORT_NAME = "generated.{{context.config.env_name}}.types"
+QML_IMPORT_MAJOR_VERSION = 1
+
+# each type is defined in a module of its own, imported on first access.
+_MODULES = { {% for type in context.types %}{% for name in context.exports(type) %}"{{name}}": "{{type.name}}", {% endfor %}{% endfor %} }
+__TYPE_MAP__: LazyTypeMap = LazyTypeMap(__name__, ({% for type in context.types %}"{{type.name}}", {% endfor %}))
+
+
+{% include "enums.jinja.py" %}
+
+
+def __getattr__(name: str):
+    if module_name := _MODULES.get(name, None):
+        module = import_module(f"{__name__}.{module_name}")
+        # importing the module bound it to the package, bind its types instead.
+        globals().update({exported: getattr(module, exported) for exported in module.__all__})
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
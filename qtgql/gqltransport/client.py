@@ -64,6 +64,16 @@ class HandlerProto(typing.Protocol):  # pragma: no cover
     def on_data(self, message: dict) -> None:
         raise NotImplementedError
 
+    def receive(self, message: dict) -> None:
+        """Called with the `data` of each result, handlers that decode or
+        merge results before applying them override it."""
+        self.on_data(message)
+
+    def on_patch(self, operations: list[dict]) -> None:
+        """Called instead of `receive()` when the server sent a JSON-Patch of
+        the previous result (under `extensions.patch`)."""
+        self.on_error([{"message": "JSON-Patch results are not supported"}])
+
     @abstractmethod
     def on_error(self, message: list[dict[str, Any]]) -> None:
         raise NotImplementedError
@@ -252,4 +262,10 @@ class GqlWsTransportClient(QtWebSockets.QWebSocket):
 
     def _on_gql_next(self, message: SubscribeResponseMessage) -> None:
         if message.payload:
-            self.handlers[message.id].on_data(message.payload["data"])
+            handler = self.handlers[message.id]
+            # servers may send a JSON-Patch of the previous result instead of the full result.
+            patch = (message.payload.get("extensions", None) or {}).get("patch", None)
+            if patch is not None:
+                handler.on_patch(patch)
+            else:
+                handler.receive(message.payload["data"])
@@ -0,0 +1,56 @@
+"""Benchmarks of the generated runtime, these are skipped unless selected
+with the `benchmark` marker:
+
+    pytest tests/benchmarks -m benchmark
+"""
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+HERE = Path(__file__).parent
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    if "benchmark" in (config.option.markexpr or ""):
+        return
+    skip = pytest.mark.skip(reason="selected with `-m benchmark`")
+    for item in items:
+        if HERE in Path(item.fspath).parents:
+            item.add_marker(skip)
+
+
+def best_of(fn: Callable[[], object], repeat: int = 5) -> float:
+    """:returns: The shortest run of `fn` in seconds."""
+    ret = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        ret = min(ret, time.perf_counter() - start)
+    return ret
+
+
+_RESULTS: list[str] = []
+
+
+def pytest_terminal_summary(terminalreporter) -> None:
+    if _RESULTS:
+        terminalreporter.section("benchmarks")
+        for line in _RESULTS:
+            terminalreporter.write_line(line)
+
+
+@pytest.fixture
+def report() -> Callable[..., None]:
+    """Adds a result line to the terminal summary."""
+
+    def write(title: str, **numbers: float) -> None:
+        values = ", ".join(
+            f"{k}={v:.3f}" if isinstance(v, float) else f"{k}={v}" for k, v in numbers.items()
+        )
+        _RESULTS.append(f"{title}: {values}")
+
+    return write
@@ -0,0 +1,55 @@
+"""user-031: allocations and frame time of a list that pages through
+rows (previous pages are dropped), with and without an `ObjectPool`."""
+import statistics
+import time
+
+import pytest
+from qtgql.codegen.py.runtime.collector import StoreCollector
+
+from tests.test_codegen.test_py.testcases import ObjectWithListOfObjectTestCase, with_config
+
+PAGE = 50
+PAGES = 200
+
+pytestmark = pytest.mark.benchmark
+
+
+def scroll(object_pools: dict[str, int]) -> tuple[list[float], int]:
+    """:returns: Frame times and the number of `Person`s that were
+    constructed."""
+    testcase = with_config(ObjectWithListOfObjectTestCase, object_pools=object_pools)
+    person_type = testcase.objecttypes_mod.Person
+    constructed = 0
+    init = person_type.__init__
+
+    def counting_init(self, *args, **kwargs):
+        nonlocal constructed
+        constructed += 1
+        init(self, *args, **kwargs)
+
+    person_type.__init__ = counting_init
+    handler = testcase.query_handler
+    collector = StoreCollector()
+    frames = []
+    for page in range(PAGES):
+        persons = [{"id": f"{page}-{i}", "name": f"name {i}", "age": i} for i in range(PAGE)]
+        start = time.perf_counter()
+        handler.on_data({"user": {"id": "user", "persons": persons}})
+        collector.collect(float("inf"))
+        frames.append(time.perf_counter() - start)
+    return frames, constructed
+
+
+def test_scrolling_paged_list(qtbot, report):
+    constructed_by = {}
+    for name, pools in (("no pool", {}), ("pool", {"Person": PAGE})):
+        frames, constructed = constructed_by[name] = scroll(pools)
+        report(
+            f"{PAGES} pages of {PAGE} rows, {name}",
+            constructed=constructed,
+            allocations_per_page=constructed / PAGES,
+            median_frame_ms=statistics.median(frames) * 1000,
+            max_frame_ms=max(frames) * 1000,
+        )
+    # the previous page is recycled into the next one.
+    assert constructed_by["pool"][1] <= 2 * PAGE
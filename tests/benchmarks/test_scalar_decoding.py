@@ -0,0 +1,55 @@
+"""user-046: decoding 100k rows of date / decimal columns one value at a
+time vs in batches, without and with the memo of the scalar (the builtin
+scalars are memoized, the baselines disable it)."""
+import datetime
+import itertools
+
+import pytest
+from qtgql.codegen.py.runtime.custom_scalars import DateScalar, DecimalScalar
+
+from tests.benchmarks.conftest import best_of
+
+ROWS = 100_000
+
+pytestmark = pytest.mark.benchmark
+
+
+class PlainDateScalar(DateScalar):
+    MEMO_SIZE = 0
+
+
+class PlainDecimalScalar(DecimalScalar):
+    MEMO_SIZE = 0
+
+
+def columns() -> tuple[list[str], list[str]]:
+    # payloads repeat values, i.e a year of dates and a price list.
+    first = datetime.date(2023, 1, 1)
+    dates = [(first + datetime.timedelta(days=i % 365)).isoformat() for i in range(ROWS)]
+    prices = [f"{price}.99" for price in itertools.islice(itertools.cycle(range(200)), ROWS)]
+    return dates, prices
+
+
+@pytest.mark.parametrize(
+    ("plain", "memoized"), [(PlainDateScalar, DateScalar), (PlainDecimalScalar, DecimalScalar)]
+)
+def test_100k_rows(report, plain, memoized):
+    assert not plain.MEMO_SIZE
+    assert memoized.MEMO_SIZE
+    dates, prices = columns()
+    column = dates if issubclass(plain, DateScalar) else prices
+
+    per_value = best_of(lambda: [plain.decode(v) for v in column])
+    per_value_memo = best_of(lambda: [memoized.decode(v) for v in column])
+    batched = best_of(lambda: plain.from_graphql_many(column))
+    batched_memo = best_of(lambda: memoized.from_graphql_many(column))
+    report(
+        f"{ROWS} rows of {memoized.__name__}",
+        per_value_ms=per_value * 1000,
+        per_value_memo_ms=per_value_memo * 1000,
+        batched_ms=batched * 1000,
+        batched_memo_ms=batched_memo * 1000,
+        memo_speedup=per_value / per_value_memo,
+        speedup=per_value / batched_memo,
+    )
+    assert memoized.from_graphql_many(column) == plain.from_graphql_many(column)
@@ -0,0 +1,83 @@
+"""user-034: time to the first data of an operation, restored from a
+snapshot (warm) or from a server response (cold).
+
+Both paths parse the same JSON and deserialize the same rows, what a
+snapshot saves is waiting for the server. The cold start receives its
+response through the event loop after `NETWORK_RTT_MS`, a simulated
+round trip (the server's own latency is not included).
+"""
+import gc
+import json
+import time
+
+import pytest
+from PySide6.QtCore import QTimer
+from qtgql.codegen.py.runtime.environment import get_gql_env
+from qtgql.codegen.py.runtime.snapshot import Snapshot, SnapshotWriter
+
+from tests.test_codegen.test_py.testcases import ObjectWithListOfObjectTestCase
+
+ROWS = 1000
+REPEAT = 5
+NETWORK_RTT_MS = 50
+
+pytestmark = pytest.mark.benchmark
+
+
+def payload() -> dict:
+    persons = [{"id": str(i), "name": f"name {i}", "age": i} for i in range(ROWS)]
+    return {"user": {"id": "user", "persons": persons}}
+
+
+def compile_handler(monkeypatch):
+    testcase = ObjectWithListOfObjectTestCase.compile()
+    handler = testcase.query_handler
+    monkeypatch.setattr(handler, "fetch", lambda: None)
+    return testcase, handler
+
+
+def test_warm_vs_cold_start(qtbot, report, tmp_path, monkeypatch):
+    data = payload()
+    response = json.dumps({"data": data}).encode()
+    path = tmp_path / "startup.qtgqlsnap"
+    cold = warm = deserialize = float("inf")
+    gc.disable()
+    try:
+        for _ in range(REPEAT):
+            testcase, handler = compile_handler(monkeypatch)
+            writer = SnapshotWriter(env_name=testcase.config.env_name)
+            writer.add_operation(handler.OPERATION_METADATA.operation_name, data)
+            writer.save(path)
+            start = time.perf_counter()
+            get_gql_env(testcase.config.env_name).restore_snapshot(Snapshot.open(path))
+            handler.consume()
+            warm = min(warm, time.perf_counter() - start)
+            assert handler.data.persons.rowCount() == ROWS
+
+            _, handler = compile_handler(monkeypatch)
+            done = []
+
+            def on_response(handler=handler, done=done) -> None:
+                received = time.perf_counter()
+                handler.on_data(json.loads(response)["data"])
+                done.append((received, time.perf_counter()))
+
+            start = time.perf_counter()
+            handler.consume()
+            QTimer.singleShot(NETWORK_RTT_MS, on_response)
+            qtbot.waitUntil(lambda done=done: bool(done), timeout=NETWORK_RTT_MS * 20)
+            received, finished = done[0]
+            cold = min(cold, finished - start)
+            deserialize = min(deserialize, finished - received)
+            assert handler.data.persons.rowCount() == ROWS
+            gc.collect()
+    finally:
+        gc.enable()
+
+    report(
+        f"first data of {ROWS} rows, {NETWORK_RTT_MS}ms round trip",
+        warm_ms=warm * 1000,
+        cold_ms=cold * 1000,
+        cold_without_network_ms=deserialize * 1000,
+        saved_ms=(cold - warm) * 1000,
+    )
@@ -0,0 +1,104 @@
+"""user-035: operation specialized deserializers vs the type-level
+`from_dict()` that consults the `SelectionConfig`."""
+import gc
+import itertools
+import time
+from typing import Callable
+
+import pytest
+from PySide6.QtCore import QCoreApplication, QEvent
+from qtgql.codegen.py.runtime.bases import loose_tree
+from qtgql.codegen.py.runtime.collector import get_collector
+from qtgql.codegen.py.runtime.teardown import get_delete_queue
+
+from tests.test_codegen.test_py.testcases import ObjectWithListOfObjectTestCase
+
+ROWS = 10_000
+REPEAT = 5
+
+pytestmark = pytest.mark.benchmark
+
+
+def _release(root, metadata) -> None:
+    loose_tree(root, metadata)
+    get_collector().collect()
+    get_delete_queue().flush()
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+    gc.collect()
+
+
+def _timed(fn: Callable[[dict], object], data: dict) -> tuple[float, object]:
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        ret = fn(data)
+        return time.perf_counter() - start, ret
+    finally:
+        gc.enable()
+
+
+def test_10k_rows(qtbot, report):
+    testcase = ObjectWithListOfObjectTestCase.compile()
+    handler = testcase.query_handler
+    metadata = handler.OPERATION_METADATA
+    user_type = testcase.objecttypes_mod.User
+    specialized = getattr(testcase.handlers_mod, f"_{metadata.operation_name}__user__from_dict")
+    # fresh ids on every run, otherwise nodes are found in the store.
+    runs = itertools.count()
+
+    def payload() -> dict:
+        run = next(runs)
+        persons = [{"id": f"{run}-{i}", "name": f"name {i}", "age": i} for i in range(ROWS)]
+        return {"id": f"user-{run}", "persons": persons}
+
+    def timed(build: Callable[[dict], object]) -> float:
+        seconds, root = _timed(build, payload())
+        # every run starts with an empty store.
+        _release(root, metadata)
+        return seconds
+
+    generic_s = specialized_s = float("inf")
+    # interleaved, so both see the same process state.
+    for _ in range(REPEAT):
+        generic_s = min(
+            generic_s,
+            timed(lambda data: user_type.from_dict(None, data, metadata.selections, metadata)),
+        )
+        specialized_s = min(specialized_s, timed(lambda data: specialized(None, data, metadata)))
+    report(
+        f"{ROWS} rows from_dict",
+        generic_ms=generic_s * 1000,
+        specialized_ms=specialized_s * 1000,
+        speedup=generic_s / specialized_s,
+    )
+
+
+def test_10k_rows_update(qtbot, report):
+    testcase = ObjectWithListOfObjectTestCase.compile()
+    handler = testcase.query_handler
+    metadata = handler.OPERATION_METADATA
+    specialized = getattr(testcase.handlers_mod, f"_{metadata.operation_name}__user__update")
+    persons = [{"id": str(i), "name": f"name {i}", "age": i} for i in range(ROWS)]
+    data = {"id": "user", "persons": persons}
+    handler.on_data({"user": data})
+    user = handler.data
+
+    def changed() -> dict:
+        # unchanged values, measures visiting the fields rather than signals.
+        return {"id": "user", "persons": [dict(person) for person in persons]}
+
+    generic_s = specialized_s = float("inf")
+    for _ in range(REPEAT):
+        generic_s = min(
+            generic_s,
+            _timed(lambda data: user.update(data, metadata.selections, metadata), changed())[0],
+        )
+        specialized_s = min(
+            specialized_s, _timed(lambda data: specialized(user, data, metadata), changed())[0]
+        )
+    report(
+        f"{ROWS} rows update",
+        generic_ms=generic_s * 1000,
+        specialized_ms=specialized_s * 1000,
+        speedup=generic_s / specialized_s,
+    )
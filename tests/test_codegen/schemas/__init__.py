@@ -1,4 +1,5 @@
 from . import (
+    connection,
     list_of_union,
     object_reference_each_other,
     object_with_date,
@@ -42,4 +43,5 @@ __all__ = [  # noqa: PLE0604
     type_with_nullable_id,
     wrogn_id_type,
     list_of_union,
+    connection,
 ]
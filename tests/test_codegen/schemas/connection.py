@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import strawberry
+
+from tests.conftest import fake
+from tests.test_codegen.schemas.node_interface import Node
+
+
+@strawberry.type
+class Person(Node):
+    name: str
+    age: int
+
+
+@strawberry.type
+class PageInfo:
+    hasNextPage: bool
+    endCursor: Optional[str]
+
+
+@strawberry.type
+class PersonEdge:
+    cursor: str
+    node: Person
+
+
+@strawberry.type
+class PersonConnection:
+    edges: list[PersonEdge]
+    pageInfo: PageInfo
+
+
+PERSONS = [Person(name=fake.name(), age=fake.pyint()) for _ in range(12)]
+
+
+@strawberry.type
+class User(Node):
+    @strawberry.field
+    def persons(self, first: int = 5, after: Optional[str] = None) -> PersonConnection:
+        start = int(after) + 1 if after is not None else 0
+        page = PERSONS[start : start + first]
+        edges = [PersonEdge(cursor=str(start + i), node=person) for i, person in enumerate(page)]
+        return PersonConnection(
+            edges=edges,
+            pageInfo=PageInfo(
+                hasNextPage=start + first < len(PERSONS),
+                endCursor=edges[-1].cursor if edges else None,
+            ),
+        )
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    def user(self) -> User:
+        return User()
+
+
+schema = strawberry.Schema(query=Query)
@@ -1,3 +1,4 @@
+import json
 from functools import partial
 from pathlib import Path
 
@@ -45,3 +46,17 @@ def test_cant_find_pyproject(monkeypatch, monkey_pyproject, tmp_path):
 def test_generate_success(monkey_pyproject, monkeypatch):
     res = runner.invoke(app, ["gen"])
     assert res.exit_code == 0
+
+
+def test_snapshot_from_recorded_responses(tmp_path):
+    from qtgql.codegen.py.runtime.snapshot import Snapshot
+
+    recorded = tmp_path / "responses.json"
+    recorded.write_text(json.dumps([{"operationName": "MainQuery", "data": {"user": None}}]))
+    output = tmp_path / "cache.qtgqlsnap"
+    res = runner.invoke(app, ["snapshot", str(output), str(recorded), "--env", "Env"])
+    assert res.exit_code == 0, res.output
+    snapshot = Snapshot.open(output)
+    assert snapshot.env_name == "Env"
+    assert snapshot.operation("MainQuery") == {"user": None}
+    snapshot.close()
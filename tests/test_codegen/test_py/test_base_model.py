@@ -1,8 +1,9 @@
+import copy
 from unittest.mock import patch
 
 import pytest
 from PySide6.QtCore import QByteArray, QObject, Qt
-from qtgql.codegen.py.runtime.bases import QGraphQListModel
+from qtgql.codegen.py.runtime.bases import QGraphQListModel, _longest_increasing_subsequence
 
 from tests.test_codegen.test_py.testcases import ObjectWithListOfObjectTestCase
 
@@ -88,6 +89,17 @@ def test_remove_rows(qtbot, sample_model_initialized):
     assert not sample_model_initialized._data
 
 
+def test_remove_rows_uses_last_index(qtbot):
+    model = model_of("a", "b", "c", "d")
+    recorder = SignalRecorder(model)
+    assert model.removeRows(1, 2)
+    assert ids_of(model) == ["a", "d"]
+    assert recorder.calls == [("remove", 1, 2)]
+    assert not model.removeRows(1, 0)
+    assert not model.removeRows(1, 5)
+    assert recorder.calls == [("remove", 1, 2)]
+
+
 def test_remove_rows_inside(qtbot, sample_model_initialized):
     sample_model_initialized.clear()
     assert not sample_model_initialized._data
@@ -129,3 +141,177 @@ class TestCurrentObject:
         first = sample_model_initialized._data[0]
         assert sample_model_initialized.currentObject is first
         assert sample_model_initialized.property("currentObject") is first
+
+
+class Row(QObject):
+    def __init__(self, id_: str):
+        super().__init__()
+        self._id = id_
+        self.updates = 0
+
+
+def model_of(*ids: str) -> QGraphQListModel:
+    return QGraphQListModel(parent=None, data=[Row(id_) for id_ in ids])
+
+
+def reconcile(model: QGraphQListModel, *ids: str) -> None:
+    def update(row: Row, node: dict) -> None:
+        row.updates += 1
+
+    model.reconcile(
+        [{"id": id_} for id_ in ids], create=lambda node: Row(node["id"]), update=update
+    )
+
+
+def ids_of(model: QGraphQListModel) -> list[str]:
+    return [row._id for row in model._data]
+
+
+class SignalRecorder:
+    def __init__(self, model: QGraphQListModel):
+        self.calls: list[tuple] = []
+        model.rowsInserted.connect(
+            lambda _, first, last: self.calls.append(("insert", first, last))
+        )
+        model.rowsRemoved.connect(lambda _, first, last: self.calls.append(("remove", first, last)))
+        model.rowsMoved.connect(
+            lambda _, first, last, __, dest: self.calls.append(("move", first, last, dest))
+        )
+        model.dataChanged.connect(lambda first, last: self.calls.append(("change", first.row())))
+
+
+@pytest.mark.parametrize(
+    ("seq", "expected_len"),
+    [
+        ([], 0),
+        ([1], 1),
+        ([3, 2, 1], 1),
+        ([0, 1, 2], 3),
+        ([2, 0, 3, 1, 4], 3),
+        ([1, 5, 2, 6, 3, 7], 4),
+    ],
+)
+def test_longest_increasing_subsequence(seq, expected_len):
+    ret = _longest_increasing_subsequence(seq)
+    assert len(ret) == expected_len
+    values = [seq[i] for i in ret]
+    assert values == sorted(set(values))
+
+
+class TestReconcile:
+    def test_insert_at_top_is_one_ranged_insert(self, qtbot):
+        model = model_of("a", "b", "c")
+        originals = list(model._data)
+        recorder = SignalRecorder(model)
+        reconcile(model, "x", "y", "a", "b", "c")
+        assert ids_of(model) == ["x", "y", "a", "b", "c"]
+        assert recorder.calls == [("insert", 0, 1)]
+        assert model._data[2:] == originals
+        assert all(row.updates == 1 for row in originals)
+
+    def test_removes_contiguous_ranges(self, qtbot):
+        model = model_of("a", "b", "c", "d", "e")
+        recorder = SignalRecorder(model)
+        reconcile(model, "a", "d")
+        assert ids_of(model) == ["a", "d"]
+        assert recorder.calls == [("remove", 4, 4), ("remove", 1, 2)]
+
+    def test_swap_is_a_single_move(self, qtbot):
+        model = model_of("a", "b", "c", "d")
+        originals = {row._id: row for row in model._data}
+        recorder = SignalRecorder(model)
+        reconcile(model, "a", "c", "b", "d")
+        assert ids_of(model) == ["a", "c", "b", "d"]
+        assert [call[0] for call in recorder.calls] == ["move"]
+        assert all(model._data[i] is originals[id_] for i, id_ in enumerate("acbd"))
+
+    def test_reverse_moves_all_but_one(self, qtbot):
+        model = model_of("a", "b", "c", "d")
+        recorder = SignalRecorder(model)
+        reconcile(model, "d", "c", "b", "a")
+        assert ids_of(model) == ["d", "c", "b", "a"]
+        assert len(recorder.calls) == 3
+
+    def test_mixed(self, qtbot):
+        model = model_of("a", "b", "c", "d", "e")
+        reconcile(model, "e", "x", "c", "a", "y", "d")
+        assert ids_of(model) == ["e", "x", "c", "a", "y", "d"]
+
+    def test_falls_back_to_index_without_ids(self, qtbot):
+        model = model_of("a", "b")
+        recorder = SignalRecorder(model)
+        model.reconcile(
+            [{"id": "a"}, {}, {}], create=lambda node: Row("new"), update=lambda row, node: None
+        )
+        assert ids_of(model) == ["a", "new", "new"]
+        assert recorder.calls == [("change", 1), ("insert", 2, 2)]
+
+
+def test_update_releases_removed_rows(qtbot):
+    testcase = ObjectWithListOfObjectTestCase.compile()
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    persons = handler.data.persons
+    removed = persons._data[0]
+    store = removed.__store__
+    size = len(store.records())
+    data = copy.deepcopy(data)
+    del data["user"]["persons"][0]
+    handler.on_data(data)
+    assert removed not in persons._data
+    assert not store.contains(removed.id)
+    assert len(store.records()) == size - 1
+
+
+class TestBulkMutations:
+    def test_extend(self, qtbot):
+        model = model_of("a")
+        recorder = SignalRecorder(model)
+        data = model._data
+        model.extend([Row("b"), Row("c")])
+        assert ids_of(model) == ["a", "b", "c"]
+        assert model._data is data
+        assert recorder.calls == [("insert", 1, 2)]
+
+    def test_extend_empty_emits_nothing(self, qtbot):
+        model = model_of("a")
+        recorder = SignalRecorder(model)
+        model.extend([])
+        assert recorder.calls == []
+
+    def test_insert_many(self, qtbot):
+        model = model_of("a", "d")
+        recorder = SignalRecorder(model)
+        model.insert_many(1, [Row("b"), Row("c")])
+        model.insert_many(100, [Row("e")])
+        assert ids_of(model) == ["a", "b", "c", "d", "e"]
+        assert recorder.calls == [("insert", 1, 2), ("insert", 4, 4)]
+
+    def test_remove_range(self, qtbot):
+        model = model_of("a", "b", "c", "d")
+        recorder = SignalRecorder(model)
+        removed = model.remove_range(1, 2)
+        assert [row._id for row in removed] == ["b", "c"]
+        assert ids_of(model) == ["a", "d"]
+        assert recorder.calls == [("remove", 1, 2)]
+        with pytest.raises(IndexError):
+            model.remove_range(1, 2)
+
+    def test_replace_range(self, qtbot):
+        model = model_of("a", "b", "c")
+        changed = []
+        model.dataChanged.connect(lambda first, last: changed.append((first.row(), last.row())))
+        replaced = model.replace_range(1, [Row("x"), Row("y")])
+        assert [row._id for row in replaced] == ["b", "c"]
+        assert ids_of(model) == ["a", "x", "y"]
+        assert changed == [(1, 2)]
+
+    def test_reset_with(self, qtbot):
+        model = model_of("a", "b")
+        data = model._data
+        with qtbot.wait_signal(model.modelReset):
+            previous = model.reset_with([Row("c")])
+        assert [row._id for row in previous] == ["a", "b"]
+        assert ids_of(model) == ["c"]
+        assert model._data is data
@@ -0,0 +1,87 @@
+import shiboken6
+from PySide6.QtCore import QObject
+from qtgql.codegen.py.runtime.bases import QGraphQListModel
+from qtgql.codegen.py.runtime.collector import CollectStats, StoreCollector, get_collector
+
+from tests.test_codegen.test_py.testcases import ObjectWithListOfObjectTestCase, ScalarsTestCase
+
+
+def test_loose_defers_deletion_to_collector(qtbot):
+    testcase = ScalarsTestCase.compile()
+    handler = testcase.query_handler
+    handler.on_data(testcase.initialize_dict)
+    node = handler.data
+    store = testcase.gql_type.__store__
+    handler.loose()
+    assert not store.get_node(node.id)
+    assert store.has_garbage()
+    with qtbot.wait_signal(get_collector().collected):
+        ...
+    assert not store.has_garbage()
+
+
+def test_collect_reports_reclaimed_nodes(qtbot):
+    testcase = ObjectWithListOfObjectTestCase.compile()
+    handler = testcase.query_handler
+    handler.on_data(testcase.initialize_dict)
+    persons_count = handler.data.persons.rowCount()
+    handler.loose()
+    stats = StoreCollector().collect(float("inf"))
+    # persons + the user.
+    assert stats.nodes >= persons_count + 1
+    assert not testcase.gql_type.__store__.has_garbage()
+
+
+def test_collect_respects_budget(qtbot):
+    testcase = ScalarsTestCase.compile()
+    store = testcase.gql_type.__store__
+    store._unretained.extend(testcase.gql_type() for _ in range(200))
+    reclaimed = store.reclaim(deadline=0)
+    assert 0 < len(reclaimed) < 200
+    assert store.has_garbage()
+
+
+def test_drops_stale_default_instance(qtbot):
+    testcase = ScalarsTestCase.compile()
+    gql_type = testcase.gql_type
+    gql_type.default_instance()
+    stats = StoreCollector().collect(float("inf"))
+    assert stats.defaults >= 1
+    assert "__singleton__" not in gql_type.__dict__
+
+
+def test_keeps_used_default_instance(qtbot):
+    testcase = ScalarsTestCase.compile()
+    gql_type = testcase.gql_type
+    default = gql_type.default_instance()
+    collector = StoreCollector()
+    collector.collect(float("inf"))
+    assert gql_type.default_instance() is default
+    # i.e a QML binding.
+    default.nameChanged.connect(lambda: None)
+    default_id = id(default)
+    del default
+    collector.collect(float("inf"))
+    assert id(gql_type.__dict__["__singleton__"]) == default_id
+    default = gql_type.default_instance()
+    default.nameChanged.disconnect()
+    owner = QObject()
+    default.setParent(owner)
+    collector.collect(float("inf"))
+    assert gql_type.default_instance() is default
+
+
+def test_collects_orphaned_models(qtbot):
+    owner = QObject()
+    model = QGraphQListModel(owner, data=[])
+    not_owned = QGraphQListModel(None, data=[])
+    collector = StoreCollector()
+    assert not collector.collect(float("inf")).models
+    model.setParent(None)
+    assert collector.collect(float("inf")).models == 1
+    qtbot.wait_until(lambda: not shiboken6.isValid(model))
+    assert shiboken6.isValid(not_owned)
+
+
+def test_stats_merge():
+    assert CollectStats(1, 2, 3).merge(CollectStats(1, 1, 1)) == CollectStats(2, 3, 4)
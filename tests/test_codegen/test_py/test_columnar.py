@@ -0,0 +1,189 @@
+import copy
+import uuid
+from enum import Enum, auto
+from functools import partial
+
+import pytest
+from PySide6.QtCore import QObject
+from qtgql.codegen.py.runtime.bases import QGraphQListModel
+from qtgql.codegen.py.runtime.columnar import Column, ColumnarListModel, enum_value
+
+from tests.test_codegen.test_py.testcases import ObjectWithListOfObjectTestCase, with_config
+
+
+class Status(Enum):
+    Connected = auto()
+    Disconnected = auto()
+
+
+class Row(QObject):
+    def __init__(self, data: dict):
+        super().__init__()
+        self._status = Status[data["status"]] if isinstance(data["status"], str) else data["status"]
+        self._active = data["active"]
+
+
+class RowsModel(ColumnarListModel):
+    COLUMNS = (
+        Column(
+            "status",
+            default=Status.Connected,
+            convert=partial(enum_value, Status),
+            enum=Status,
+        ),
+        Column("active", typecode="b", default=False, convert=bool),
+    )
+
+
+def role_of(model, name: str) -> int:
+    return model.FIELD_ROLES[name]
+
+
+@pytest.fixture
+def testcase():
+    return with_config(ObjectWithListOfObjectTestCase, columnar_lists=True)
+
+
+def test_columns_are_served_by_roles(qtbot):
+    model = RowsModel.from_rows(
+        None,
+        [{"status": "Disconnected", "active": True}, {"status": "Connected", "active": False}],
+        create=Row,
+    )
+    assert model.rowCount() == 2
+    assert model.data(model.index(0), role_of(model, "status")) == Status.Disconnected.value
+    assert model.data(model.index(0), role_of(model, "active")) is True
+    assert model.data(model.index(1), role_of(model, "active")) is False
+    assert not model._objects
+    row = model.data(model.index(1), QGraphQListModel.OBJECT_ROLE)
+    assert row._status is Status.Connected
+    assert model.node_at(1) is row
+
+
+def test_object_rows_follow_structural_changes(qtbot):
+    model = RowsModel.from_rows(
+        None, [{"status": "Connected", "active": i % 2 == 0} for i in range(4)], create=Row
+    )
+    third = model.node_at(2)
+    model.remove_range(0, 1)
+    assert model.node_at(1) is third
+    node = Row({"status": Status.Disconnected, "active": True})
+    model.insert_many(0, [node])
+    assert model.node_at(0) is node
+    assert model.node_at(2) is third
+    assert model.data(model.index(0), role_of(model, "status")) == Status.Disconnected.value
+    assert model.rowCount() == 4
+
+
+def test_enum_columns_store_names(qtbot):
+    model = RowsModel.from_rows(None, [{"status": "Connected", "active": True}], create=Row)
+    model.insert_many(1, [Row({"status": Status.Disconnected, "active": True})])
+    assert list(model._columns["status"]) == ["Connected", "Disconnected"]
+    emitted = []
+    model.dataChanged.connect(lambda first, last, roles: emitted.append(first.row()))
+    model.reconcile(
+        [{"status": "Connected", "active": True}, {"status": "Disconnected", "active": True}],
+        create=Row,
+        update=lambda node, row: None,
+    )
+    assert not emitted
+
+
+def test_generated_model_creates_no_rows(qtbot, testcase):
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    model = handler.data.persons
+    assert isinstance(model, ColumnarListModel)
+    assert [
+        model.data(model.index(i), role_of(model, "name")) for i in range(model.rowCount())
+    ] == [p["name"] for p in data["user"]["persons"]]
+    assert not model._objects
+    assert model.node_at(0).name == data["user"]["persons"][0]["name"]
+
+
+def test_update_diffs_columns(qtbot, testcase):
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    model = handler.data.persons
+    person = model.node_at(1)
+    emitted = []
+    model.dataChanged.connect(lambda first, last, roles: emitted.append((first.row(), roles)))
+    changed = copy.deepcopy(data)
+    changed["user"]["persons"][1]["age"] += 1
+    handler.on_data(changed)
+    assert emitted == [(1, [role_of(model, "age")])]
+    assert person.age == changed["user"]["persons"][1]["age"]
+    handler.on_data(copy.deepcopy(changed))
+    assert len(emitted) == 1
+
+
+def test_appended_rows_are_inserted(qtbot, testcase):
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    model = handler.data.persons
+    inserted = []
+    model.rowsInserted.connect(lambda _, first, last: inserted.append((first, last)))
+    changed = copy.deepcopy(data)
+    persons = changed["user"]["persons"]
+    persons.append({**persons[0], "id": uuid.uuid4().hex})
+    handler.on_data(changed)
+    assert inserted == [(5, 5)]
+    assert model.data(model.index(5), role_of(model, "id")) == persons[-1]["id"]
+
+
+def test_reorder_resets_and_keeps_rows(qtbot, testcase):
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    model = handler.data.persons
+    first = model.node_at(0)
+    resets = []
+    model.modelReset.connect(lambda: resets.append(True))
+    changed = copy.deepcopy(data)
+    changed["user"]["persons"].reverse()
+    handler.on_data(changed)
+    assert resets
+    assert model.node_at(4) is first
+    assert [model.data(model.index(i), role_of(model, "id")) for i in range(5)] == [
+        p["id"] for p in changed["user"]["persons"]
+    ]
+
+
+def test_loose(qtbot, testcase):
+    handler = testcase.query_handler
+    handler.on_data(testcase.initialize_dict)
+    node = handler.data.persons.node_at(0)
+    handler.loose()
+    assert not type(node).__store__.contains(node._id)
+
+
+def test_reset_releases_dropped_rows(qtbot, testcase):
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    model = handler.data.persons
+    dropped, kept = model.node_at(0), model.node_at(1)
+    changed = copy.deepcopy(data)
+    persons = changed["user"]["persons"]
+    persons[:] = reversed(persons[1:])
+    handler.on_data(changed)
+    assert model.node_at(3) is kept
+    store = type(dropped).__store__
+    assert not store.contains(dropped._id)
+    assert store.contains(kept._id)
+
+
+def test_truncate_releases_removed_rows(qtbot, testcase):
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    model = handler.data.persons
+    last = model.node_at(4)
+    changed = copy.deepcopy(data)
+    del changed["user"]["persons"][4]
+    handler.on_data(changed)
+    assert model.rowCount() == 4
+    assert not type(last).__store__.contains(last._id)
@@ -0,0 +1,130 @@
+import copy
+
+import pytest
+from qtgql.codegen.py.runtime.custom_scalars import DateTimeScalar
+from qtgql.codegen.py.runtime.decode import decode_rows, get_decoder
+
+from tests.test_codegen.test_py.testcases import (
+    DateTimeTestCase,
+    EnumTestCase,
+    ListOfObjectWithUnionTestCase,
+    ObjectWithListOfObjectTestCase,
+    UnionTestCase,
+    with_config,
+)
+
+
+def test_decode_rows_reuses_unchanged_rows():
+    def decode(row, prev):
+        ret = dict(row)
+        return prev if ret == prev else ret
+
+    prev = decode_rows([{"id": "1", "v": 1}, {"id": "2", "v": 2}], None, decode)
+    assert decode_rows([{"id": "1", "v": 1}, {"id": "2", "v": 2}], prev, decode) is prev
+    reordered = decode_rows([{"id": "2", "v": 2}, {"id": "1", "v": 1}], prev, decode)
+    assert reordered is not prev
+    assert reordered[0] is prev[1]
+    assert reordered[1] is prev[0]
+
+
+@pytest.mark.parametrize(
+    "testcase",
+    [
+        ObjectWithListOfObjectTestCase,
+        UnionTestCase,
+        ListOfObjectWithUnionTestCase,
+        DateTimeTestCase,
+        EnumTestCase,
+    ],
+)
+def test_unchanged_result_decodes_to_previous(qtbot, testcase):
+    testcase = with_config(testcase, two_phase_decode=True)
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    snapshot = handler._decode_snapshot
+    assert handler.data is not None
+    handler.on_data(copy.deepcopy(data))
+    assert handler._decode_snapshot[handler.ROOT_FIELD] is snapshot[handler.ROOT_FIELD]
+
+
+def test_only_changed_nodes_are_applied(qtbot):
+    testcase = with_config(ObjectWithListOfObjectTestCase, two_phase_decode=True)
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    persons = handler.data.persons._data
+    for person in persons:
+        person._name = "tampered"  # unchanged nodes would keep it.
+    changed = copy.deepcopy(data)
+    changed["user"]["persons"][0]["name"] = "changed"
+    handler.on_data(changed)
+    assert persons[0].name == "changed"
+    assert all(person.name == "tampered" for person in persons[1:])
+
+
+def test_setters_invalidate_applied_data(qtbot):
+    testcase = with_config(ObjectWithListOfObjectTestCase, two_phase_decode=True)
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    person = handler.data.persons._data[1]
+    person.name_setter("local")
+    handler.on_data(copy.deepcopy(data))
+    assert person.name == data["user"]["persons"][1]["name"]
+
+
+def test_custom_scalars_are_decoded(qtbot):
+    testcase = with_config(DateTimeTestCase, two_phase_decode=True)
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    assert handler.data.birth == DateTimeScalar.from_graphql(data["user"]["birth"]).to_qt()
+
+
+def test_receive_decodes_in_background(qtbot):
+    testcase = with_config(ObjectWithListOfObjectTestCase, two_phase_decode=True)
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.receive(data)
+    handler.on_completed()
+    assert not handler.completed
+    get_decoder().wait()
+    qtbot.wait_until(lambda: handler.data is not None)
+    assert handler.completed
+    assert [p.name for p in handler.data.persons._data] == [
+        p["name"] for p in data["user"]["persons"]
+    ]
+
+
+def test_decode_error_does_not_leave_the_operation_on_the_fly(qtbot, monkeypatch):
+    testcase = with_config(ObjectWithListOfObjectTestCase, two_phase_decode=True)
+    handler = testcase.query_handler
+    errors = []
+    monkeypatch.setattr(handler, "on_error", errors.append)
+
+    def decode(data, previous):
+        raise ValueError("bad payload")
+
+    monkeypatch.setattr(handler, "decode", decode)
+    handler._operation_on_the_fly = True
+    handler.receive(testcase.initialize_dict)
+    get_decoder().wait()
+    qtbot.wait_until(lambda: not handler._pending_decodes)
+    assert not handler._operation_on_the_fly
+    assert "bad payload" in errors[0][0]["message"]
+    assert handler.data is None
+    fetched = []
+    monkeypatch.setattr(handler.environment.client, "execute", fetched.append)
+    handler.refetch()
+    assert fetched == [handler]
+
+
+def test_snapshot_dropped_while_decoding_is_not_restored(qtbot):
+    testcase = with_config(ObjectWithListOfObjectTestCase, two_phase_decode=True)
+    handler = testcase.query_handler
+    handler.receive(testcase.initialize_dict)
+    handler.loose()
+    get_decoder().wait()
+    qtbot.wait_until(lambda: handler.data is not None)
+    assert handler._decode_snapshot is None
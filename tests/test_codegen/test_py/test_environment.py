@@ -0,0 +1,106 @@
+import pytest
+from qtgql.codegen.py.runtime.environment import LOCAL_OPERATION_NAME, config_from_data, get_gql_env
+from qtgql.codegen.py.runtime.structhash import current_epoch
+
+from tests.test_codegen.test_py.testcases import ObjectWithListOfObjectTestCase, ScalarsTestCase
+
+
+@pytest.fixture
+def scalars_testcase():
+    return ScalarsTestCase.compile()
+
+
+def test_type_map_is_set_by_init(scalars_testcase):
+    env = get_gql_env(scalars_testcase.config.env_name)
+    assert env.type_map["User"] is scalars_testcase.gql_type
+
+
+def test_config_from_data():
+    config = config_from_data(
+        {"name": "foo", "friend": {"age": 1}, "pets": [{"__typename": "Dog"}]}
+    )
+    assert config.selections["name"] is None
+    assert config.selections["friend"].selections == {"age": None}
+    assert "Dog" in config.selections["pets"].choices
+
+
+def test_read_fragment(qtbot, scalars_testcase):
+    handler = scalars_testcase.query_handler
+    handler.on_data(scalars_testcase.initialize_dict)
+    env = get_gql_env(scalars_testcase.config.env_name)
+    assert env.read_fragment(f"User:{handler.data.id}") is handler.data
+    assert env.read_fragment("User:not-in-store") is None
+    with pytest.raises(ValueError):
+        env.read_fragment("User")
+
+
+def test_write_fragment_updates_in_place(qtbot, scalars_testcase):
+    handler = scalars_testcase.query_handler
+    handler.on_data(scalars_testcase.initialize_dict)
+    env = get_gql_env(scalars_testcase.config.env_name)
+    user = handler.data
+    with qtbot.assert_not_emitted(user.ageChanged):
+        with qtbot.wait_signal(user.nameChanged):
+            assert env.write_fragment(f"User:{user.id}", {"name": "written"}) is user
+    assert user.name == "written"
+
+
+def test_write_fragment_creates_node(qtbot, scalars_testcase):
+    env = get_gql_env(scalars_testcase.config.env_name)
+    node = env.write_fragment("User:local-user", {"name": "local"})
+    assert node.name == "local"
+    assert env.read_fragment("User:local-user") is node
+    store = scalars_testcase.gql_type.__store__
+    assert store._data[node.id].retainers == {LOCAL_OPERATION_NAME}
+
+
+def test_write_query_seeds_handler(qtbot):
+    testcase = ObjectWithListOfObjectTestCase.compile()
+    handler = testcase.query_handler
+    env = get_gql_env(testcase.config.env_name)
+    assert env.current_data(type(handler)) is None
+    data = testcase.initialize_dict
+    env.write_query(type(handler), data)
+    user = env.current_data(type(handler))
+    assert user.id == data["user"]["id"]
+    assert not handler.completed
+    assert env.read_fragment(f"Person:{data['user']['persons'][0]['id']}") is user.persons._data[0]
+
+
+def test_write_fragment_invalidates_subtree_hashes(qtbot, scalars_testcase):
+    env = get_gql_env(scalars_testcase.config.env_name)
+    epoch = current_epoch()
+    env.write_fragment("User:local-user", {"name": "local"})
+    assert current_epoch() > epoch
+
+
+def test_release_fragment(qtbot, scalars_testcase):
+    env = get_gql_env(scalars_testcase.config.env_name)
+    store = scalars_testcase.gql_type.__store__
+    env.write_fragment("User:local-user", {"name": "local"})
+    assert env.release_fragment("User:local-user")
+    assert not store.contains("local-user")
+    assert store.has_garbage()
+    assert not env.release_fragment("User:local-user")
+
+
+def test_release_fragment_keeps_node_used_by_operation(qtbot, scalars_testcase):
+    handler = scalars_testcase.query_handler
+    handler.on_data(scalars_testcase.initialize_dict)
+    env = get_gql_env(scalars_testcase.config.env_name)
+    user = handler.data
+    store = scalars_testcase.gql_type.__store__
+    store.retain(user, LOCAL_OPERATION_NAME)
+    assert env.release_fragment(f"User:{user.id}")
+    assert store._data[user.id].retainers == {handler.objectName()}
+
+
+def test_evict_local(qtbot):
+    testcase = ObjectWithListOfObjectTestCase.compile()
+    env = get_gql_env(testcase.config.env_name)
+    persons = [{"id": f"person-{i}", "name": "local", "age": i} for i in range(3)]
+    env.write_fragment("User:local-user", {"persons": persons})
+    assert env.evict_local() == 4
+    assert env.read_fragment("User:local-user") is None
+    assert env.read_fragment("Person:person-0") is None
+    assert env.evict_local() == 0
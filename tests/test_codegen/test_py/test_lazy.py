@@ -0,0 +1,89 @@
+import copy
+
+import pytest
+
+from tests.test_codegen.test_py.testcases import (
+    ListOfObjectWithUnionTestCase,
+    NestedObjectTestCase,
+    ObjectWithListOfObjectTestCase,
+    UnionTestCase,
+    with_config,
+)
+
+
+def test_nested_object_is_built_on_access(qtbot):
+    testcase = with_config(NestedObjectTestCase, lazy_children=True)
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    user = handler.data
+    assert user._person is None
+    assert "person" in user._deferred
+    assert user.person.name == data["user"]["person"]["name"]
+    assert not user._deferred
+    assert user.property("person") is user.person
+
+
+def test_list_model_is_built_on_access(qtbot):
+    testcase = with_config(ObjectWithListOfObjectTestCase, lazy_children=True)
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    user = handler.data
+    assert "persons" in user._deferred
+    persons = user.persons
+    assert [p.name for p in persons._data] == [p["name"] for p in data["user"]["persons"]]
+    assert persons.parent() is user.parent()
+
+
+@pytest.mark.parametrize("testcase", [UnionTestCase, ListOfObjectWithUnionTestCase])
+def test_unions(qtbot, testcase):
+    testcase = with_config(testcase, lazy_children=True)
+    handler = testcase.query_handler
+    handler.on_data(testcase.initialize_dict)
+    assert handler.data._deferred
+
+
+def test_update_replaces_deferred_payload(qtbot):
+    testcase = with_config(NestedObjectTestCase, lazy_children=True)
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    changed = copy.deepcopy(data)
+    changed["user"]["person"]["name"] = "changed"
+    handler.on_data(changed)
+    assert handler.data._person is None
+    assert handler.data.person.name == "changed"
+
+
+def test_update_after_access(qtbot):
+    testcase = with_config(NestedObjectTestCase, lazy_children=True)
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    person = handler.data.person
+    changed = copy.deepcopy(data)
+    changed["user"]["person"]["name"] = "changed"
+    with qtbot.wait_signal(person.nameChanged):
+        handler.on_data(changed)
+    assert handler.data.person is person
+    assert person.name == "changed"
+
+
+def test_known_nodes_are_not_deferred(qtbot):
+    testcase = with_config(NestedObjectTestCase, lazy_children=True)
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    person = handler.data.person
+    handler.on_data({"user": {**data["user"], "id": "other"}})
+    assert handler.data._person is person
+    assert not handler.data._deferred
+
+
+def test_disabled_by_default(qtbot):
+    testcase = NestedObjectTestCase.compile()
+    handler = testcase.query_handler
+    handler.on_data(testcase.initialize_dict)
+    assert handler.data._person is not None
+    assert handler.data._deferred is None
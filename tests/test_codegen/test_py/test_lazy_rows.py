@@ -0,0 +1,54 @@
+import copy
+
+import pytest
+from qtgql.codegen.py.runtime.bases import QGraphQListModel
+from qtgql.codegen.py.runtime.lazy import RawRow
+
+from tests.test_codegen.test_py.testcases import ObjectWithListOfObjectTestCase, with_config
+
+
+@pytest.fixture
+def testcase():
+    return with_config(ObjectWithListOfObjectTestCase, lazy_rows=True)
+
+
+def test_rows_are_created_on_access(qtbot, testcase):
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    model = handler.data.persons
+    persons = data["user"]["persons"]
+    assert model.rowCount() == len(persons)
+    assert all(type(row) is RawRow for row in model._data)
+    person = model.data(model.index(1), QGraphQListModel.OBJECT_ROLE)
+    assert person.name == persons[1]["name"]
+    assert model._data[1] is person
+    assert type(model._data[0]) is RawRow
+
+
+def test_update_replaces_raw_rows(qtbot, testcase):
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    model = handler.data.persons
+    accessed = model.node_at(0)
+    changed = copy.deepcopy(data)
+    for person in changed["user"]["persons"]:
+        person["name"] = "changed"
+    handler.on_data(changed)
+    assert model.node_at(0) is accessed
+    assert all(model.node_at(i).name == "changed" for i in range(model.rowCount()))
+
+
+def test_loose_skips_raw_rows(qtbot, testcase):
+    handler = testcase.query_handler
+    handler.on_data(testcase.initialize_dict)
+    handler.data.persons.node_at(0)
+    handler.loose()
+
+
+def test_disabled_by_default(qtbot):
+    testcase = ObjectWithListOfObjectTestCase.compile()
+    handler = testcase.query_handler
+    handler.on_data(testcase.initialize_dict)
+    assert not any(type(row) is RawRow for row in handler.data.persons._data)
@@ -0,0 +1,47 @@
+import pytest
+from qtgql.codegen.py.runtime.notifications import get_coalescer
+
+from tests.test_codegen.test_py.testcases import ScalarsTestCase
+
+
+@pytest.fixture
+def deferred():
+    coalescer = get_coalescer()
+    coalescer.deferred = True
+    yield coalescer
+    coalescer.flush()
+    coalescer.deferred = False
+
+
+def updated(data: dict, **fields) -> dict:
+    return {"user": {**data["user"], **fields}}
+
+
+def test_signals_are_emitted_after_all_fields_applied(qtbot):
+    testcase = ScalarsTestCase.compile()
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    user = handler.data
+    seen_age = []
+    user.nameChanged.connect(lambda: seen_age.append(user.age))
+    new_age = data["user"]["age"] + 1
+    handler.on_data(updated(data, name="changed", age=new_age))
+    assert seen_age == [new_age]
+
+
+def test_deferred_signals_are_coalesced(qtbot, deferred):
+    testcase = ScalarsTestCase.compile()
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    user = handler.data
+    emitted = []
+    user.nameChanged.connect(lambda: emitted.append(user.name))
+    handler.on_data(updated(data, name="first"))
+    handler.on_data(updated(data, name="second"))
+    assert not emitted
+    assert len(deferred) == 1
+    qtbot.wait_until(lambda: bool(emitted))
+    assert emitted == ["second"]
+    assert not len(deferred)
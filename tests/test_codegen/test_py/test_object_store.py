@@ -1,4 +1,12 @@
-from tests.test_codegen.test_py.testcases import ScalarsTestCase
+from typing import Callable, Iterator
+
+import pytest
+from qtgql.codegen.py.runtime.bases import NodeRecord
+from qtgql.codegen.py.runtime.cachepolicy import CachePolicy, EvictionStrategy
+from qtgql.codegen.py.runtime.collector import get_collector
+from qtgql.codegen.py.runtime.environment import get_gql_env
+
+from tests.test_codegen.test_py.testcases import CompiledTestCase, ScalarsTestCase, with_config
 
 
 def test_get_node():
@@ -16,3 +24,95 @@ def test_loosing_node_deletes_it_from_store():
     store = testcase.gql_type.__store__
     store.loose(inst, testcase.query_handler.OPERATION_METADATA.operation_name)
     assert not store.get_node(inst.id)
+
+
+@pytest.fixture()
+def policy_testcase() -> Iterator[Callable[[CachePolicy], CompiledTestCase]]:
+    def factory(policy: CachePolicy) -> CompiledTestCase:
+        return with_config(ScalarsTestCase, cache_policies={"User": policy})
+
+    yield factory
+    get_collector().stop()
+
+
+def test_cache_policy_as_code():
+    policy = CachePolicy(ttl=3.5, max_resident=10, eviction=EvictionStrategy.FIFO)
+    assert policy.as_code() == (
+        "CachePolicy(ttl=3.5, max_resident=10, eviction=EvictionStrategy.FIFO)"
+    )
+
+
+def test_generated_type_has_policy(policy_testcase):
+    policy = CachePolicy(ttl=3.5, max_resident=10, eviction=EvictionStrategy.FIFO)
+    testcase = policy_testcase(policy)
+    assert testcase.gql_type.__store__.policy == policy
+
+
+def test_ttl_policy_starts_periodic_sweeps(qtbot, policy_testcase):
+    collector = get_collector()
+    collector.stop()
+    policy_testcase(CachePolicy(ttl=0.5))
+    assert collector._idle_timer.isActive()
+    assert collector._idle_timer.interval() == 500
+    # a longer ttl doesn't slow down the sweeps.
+    policy_testcase(CachePolicy(ttl=60))
+    assert collector._idle_timer.interval() == 500
+
+
+def test_expired_node_refetches_retainers(qtbot, policy_testcase):
+    testcase = policy_testcase(CachePolicy(ttl=0))
+    handler = testcase.query_handler
+    handler.on_data(testcase.initialize_dict)
+    assert not handler._operation_on_the_fly
+    testcase.gql_type.__store__.enforce_policy()
+    assert handler._operation_on_the_fly
+
+
+def test_expired_local_writes_wont_break_sweeps(qtbot, policy_testcase):
+    testcase = policy_testcase(CachePolicy(ttl=0))
+    handler = testcase.query_handler
+    handler.on_data(testcase.initialize_dict)
+    env = get_gql_env(testcase.config.env_name)
+    env.write_fragment("User:local-user", {"name": "local"})
+    env.write_fragment(f"User:{handler.data.id}", {"name": "written"})
+    get_collector().collect()
+    assert handler._operation_on_the_fly
+
+
+def test_expire_visits_only_expired_nodes(qtbot, policy_testcase):
+    testcase = policy_testcase(CachePolicy(ttl=60))
+    store = testcase.gql_type.__store__
+    nodes = [testcase.gql_type(id=str(i)) for i in range(3)]
+    for node in nodes:
+        store.add_record(NodeRecord(node=node, retainers=set()))
+    store._written_at[nodes[0].id] -= 120
+    store.touch(nodes[1])
+    assert list(store._written_at) == ["0", "2", "1"]
+    store.enforce_policy()
+    # refetched, not expired until written again.
+    assert list(store._written_at) == ["2", "1", "0"]
+
+
+def test_not_expired_node_wont_refetch(qtbot, policy_testcase):
+    testcase = policy_testcase(CachePolicy(ttl=60))
+    handler = testcase.query_handler
+    handler.on_data(testcase.initialize_dict)
+    testcase.gql_type.__store__.enforce_policy()
+    assert not handler._operation_on_the_fly
+
+
+@pytest.mark.parametrize("eviction", EvictionStrategy)
+def test_max_resident_evicts(qtbot, eviction):
+    testcase = ScalarsTestCase.compile()
+    store = testcase.gql_type.__store__
+    store.set_policy(CachePolicy(max_resident=2, eviction=eviction), env_name="TestEnv")
+    nodes = [testcase.gql_type(id=str(i)) for i in range(3)]
+    store.add_record(NodeRecord(node=nodes[0], retainers={"op"}))
+    store.add_record(NodeRecord(node=nodes[1], retainers={"op"}))
+    store.get_node(nodes[0].id)  # access the first node
+    store.add_record(NodeRecord(node=nodes[2], retainers={"op"}))
+    evicted = nodes[1] if eviction is EvictionStrategy.LRU else nodes[0]
+    assert not store.get_node(evicted.id)
+    assert len(store.records()) == 2
+    store.loose(evicted, "op")
+    assert store.has_garbage()
@@ -0,0 +1,104 @@
+import pytest
+import pytestqt.exceptions
+from qtgql.codegen.py.runtime.optimistic import OptimisticUpdates
+
+from tests.test_codegen.test_py.testcases import (
+    DateTimeTestCase,
+    NestedObjectTestCase,
+    ScalarsTestCase,
+    with_config,
+)
+
+
+@pytest.fixture()
+def user(qtbot):
+    testcase = ScalarsTestCase.compile()
+    handler = testcase.query_handler
+    handler.on_data(testcase.initialize_dict)
+    return handler.data
+
+
+def test_apply_sets_values(qtbot, user):
+    updates = OptimisticUpdates()
+    with qtbot.wait_signal(user.nameChanged):
+        updates.apply({user: {"name": "optimistic"}})
+    assert user.name == "optimistic"
+    assert updates.layers
+
+
+def test_rollback_restores_and_emits_only_changed(qtbot, user):
+    updates = OptimisticUpdates()
+    prev_name, prev_age = user.name, user.age
+    layer = updates.apply({user: {"name": "optimistic", "age": prev_age}})
+    with pytest.raises(pytestqt.exceptions.TimeoutError):
+        with qtbot.wait_signal(user.ageChanged, timeout=300):
+            with qtbot.wait_signal(user.nameChanged):
+                updates.rollback(layer)
+    assert user.name == prev_name
+    assert user.age == prev_age
+    assert layer.rolled_back
+    assert not updates.layers
+
+
+def test_rollback_lower_layer_keeps_upper_value(qtbot, user):
+    updates = OptimisticUpdates()
+    prev_name = user.name
+    lower = updates.apply({user: {"name": "lower"}})
+    upper = updates.apply({user: {"name": "upper"}})
+    updates.rollback(lower)
+    assert user.name == "upper"
+    updates.rollback(upper)
+    assert user.name == prev_name
+
+
+def test_confirm_becomes_base_of_pending_layers(qtbot, user):
+    updates = OptimisticUpdates()
+    lower = updates.apply({user: {"name": "lower"}})
+    upper = updates.apply({user: {"name": "upper"}})
+    updates.confirm(lower)
+    assert lower.confirmed
+    updates.rollback(upper)
+    assert user.name == "lower"
+
+
+def test_confirm_with_server_values(qtbot, user):
+    updates = OptimisticUpdates()
+    layer = updates.apply({user: {"name": "optimistic"}})
+    updates.confirm(layer, {user: {"name": "from server"}})
+    assert user.name == "from server"
+
+
+def test_rollback_wont_override_values_changed_meanwhile(qtbot, user):
+    updates = OptimisticUpdates()
+    layer = updates.apply({user: {"name": "optimistic"}})
+    user.name_setter("from server")
+    updates.rollback(layer)
+    assert user.name == "from server"
+
+
+def test_deferred_child_is_restored(qtbot):
+    testcase = with_config(NestedObjectTestCase, lazy_children=True)
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    user = handler.data
+    assert "person" in user._deferred
+    updates = OptimisticUpdates()
+    optimistic = testcase.objecttypes_mod.Person.default_instance()
+    layer = updates.apply({user: {"person": optimistic}})
+    assert user.person is optimistic
+    updates.rollback(layer)
+    assert user.person.name == data["user"]["person"]["name"]
+
+
+def test_custom_scalar_to_and_from_none(qtbot):
+    testcase = DateTimeTestCase.compile()
+    handler = testcase.query_handler
+    handler.on_data(testcase.initialize_dict)
+    user = handler.data
+    birth = user._birth
+    updates = OptimisticUpdates()
+    layer = updates.apply({user: {"birth": None}})
+    assert user._birth is None
+    updates.rollback(layer)
+    assert user._birth == birth
@@ -0,0 +1,92 @@
+import attrs
+import pytest
+
+from tests.test_codegen.test_py.testcases import (
+    ConnectionTestCase,
+    ObjectWithListOfObjectTestCase,
+)
+
+
+@pytest.fixture
+def testcase():
+    return ConnectionTestCase.compile()
+
+
+def fetch_page(testcase, handler) -> None:
+    payload = handler.message.payload
+    res = testcase.schema.execute_sync(payload.query, variable_values=payload.variables)
+    assert not res.errors
+    handler.receive(res.data)
+    handler.on_completed()
+
+
+def test_connection_is_detected(testcase):
+    connection = testcase.query_handler.CONNECTION
+    assert connection.path == ("user", "persons")
+    assert connection.variable == "after"
+
+
+def test_no_connection(qtbot):
+    handler = ObjectWithListOfObjectTestCase.compile().query_handler
+    assert handler.CONNECTION is None
+    handler.on_data(ObjectWithListOfObjectTestCase.initialize_dict)
+    assert not handler.data.persons.canFetchMore()
+
+
+def test_page_info_selections_are_injected():
+    query = ConnectionTestCase.query.replace("endCursor", "")
+    testcase = attrs.evolve(ConnectionTestCase, query=query).compile()
+    assert "endCursor" in testcase.query_handler.message.payload.query
+
+
+def test_fetch_more_appends_pages(qtbot, testcase):
+    handler = testcase.query_handler
+    handler.on_data(testcase.initialize_dict)
+    edges = handler.data.persons.edges
+    assert edges.rowCount() == 5
+    assert edges.canFetchMore()
+    inserted = []
+    edges.rowsInserted.connect(lambda _, first, last: inserted.append((first, last)))
+    edges.fetchMore()
+    assert handler.message.payload.variables == {"after": "4"}
+    assert not edges.canFetchMore()  # the page is on the fly.
+    fetch_page(testcase, handler)
+    assert handler.data.persons.edges is edges
+    assert edges.rowCount() == 10
+    assert inserted == [(5, 9)]
+    assert [edges.node_at(i).cursor for i in range(10)] == [str(i) for i in range(10)]
+    assert handler.data.persons.pageInfo.endCursor == "9"
+    edges.fetchMore()
+    fetch_page(testcase, handler)
+    assert edges.rowCount() == 12
+    assert not edges.canFetchMore()
+    assert handler.message is handler._message_template
+
+
+def test_refetch_restarts_from_the_first_page(qtbot, testcase):
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    handler.fetch_more()
+    fetch_page(testcase, handler)
+    handler.on_data(data)
+    assert handler.data.persons.edges.rowCount() == 5
+    assert handler.data.persons.edges.canFetchMore()
+
+
+def test_refetch_after_failed_page_replaces_the_data(qtbot, testcase, monkeypatch):
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    sent = []
+    monkeypatch.setattr(handler.environment.client, "execute", sent.append)
+    handler.fetch_more()
+    handler.on_error([{"message": "page failed"}])
+    assert handler.message is handler._message_template
+    handler.refetch()
+    assert len(sent) == 2
+    assert handler.message is handler._message_template
+    edges = handler.data.persons.edges
+    handler.receive(data)
+    assert edges.rowCount() == 5
+    assert edges.canFetchMore()
@@ -0,0 +1,101 @@
+import pytest
+from qtgql.codegen.py.runtime.patch import PatchError, apply_patch, parse_pointer
+
+from tests.test_codegen.test_py.testcases import (
+    NestedObjectTestCase,
+    ObjectWithListOfObjectTestCase,
+    RootListOfTestCase,
+    ScalarsTestCase,
+)
+
+
+def test_parse_pointer():
+    assert parse_pointer("/user/persons/0/a~1b~0c") == ["user", "persons", "0", "a/b~c"]
+    with pytest.raises(PatchError):
+        parse_pointer("user")
+
+
+def test_replace_scalar_emits_only_patched_field(qtbot):
+    testcase = ScalarsTestCase.compile()
+    handler = testcase.query_handler
+    handler.on_data(testcase.initialize_dict)
+    user = handler.data
+    with qtbot.assert_not_emitted(user.ageChanged):
+        with qtbot.wait_signal(user.nameChanged):
+            apply_patch(handler, [{"op": "replace", "path": "/user/name", "value": "patched"}])
+    assert user.name == "patched"
+
+
+def test_patch_list_rows(qtbot):
+    testcase = ObjectWithListOfObjectTestCase.compile()
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    persons = handler.data.persons
+    first = persons._data[0]
+    count = persons.rowCount()
+    apply_patch(handler, [{"op": "replace", "path": "/user/persons/0/name", "value": "patched"}])
+    assert persons._data[0] is first
+    assert first.name == "patched"
+
+    new_person = dict(data["user"]["persons"][1], id="new-id", name="new")
+    with qtbot.wait_signal(persons.rowsInserted):
+        apply_patch(handler, [{"op": "add", "path": "/user/persons/1", "value": new_person}])
+    assert persons.rowCount() == count + 1
+    assert persons._data[1].name == "new"
+    assert persons._data[0] is first
+
+    with qtbot.wait_signal(persons.rowsRemoved):
+        apply_patch(handler, [{"op": "remove", "path": "/user/persons/0"}])
+    assert persons.rowCount() == count
+    assert not first.__store__.get_node(first.id)
+
+
+def test_add_to_empty_root_list(qtbot):
+    testcase = RootListOfTestCase.compile()
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    row = data["users"][0]
+    handler.on_data({"users": []})
+    apply_patch(handler, [{"op": "add", "path": "/users/-", "value": row}])
+    assert handler.data.rowCount() == 1
+    assert handler.data._data[0].name == row["name"]
+
+
+def test_invalid_patch_refetches(qtbot):
+    testcase = ScalarsTestCase.compile()
+    handler = testcase.query_handler
+    handler.on_data(testcase.initialize_dict)
+    handler.on_patch([{"op": "move", "from": "/user/name", "path": "/user/age"}])
+    assert handler._operation_on_the_fly
+
+
+def test_removed_row_used_elsewhere_is_kept(qtbot):
+    testcase = ObjectWithListOfObjectTestCase.compile()
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    persons = handler.data.persons
+    first = persons._data[0]
+    apply_patch(
+        handler, [{"op": "add", "path": "/user/persons/-", "value": data["user"]["persons"][0]}]
+    )
+    assert persons._data[-1] is first
+    apply_patch(handler, [{"op": "remove", "path": "/user/persons/0"}])
+    assert first.__store__.get_node(first.id)
+    last = persons.rowCount() - 1
+    apply_patch(handler, [{"op": "remove", "path": f"/user/persons/{last}"}])
+    assert not first.__store__.get_node(first.id)
+
+
+@pytest.mark.parametrize("op", ["remove", "replace"])
+def test_removed_child_is_released(qtbot, op):
+    testcase = NestedObjectTestCase.compile()
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    person = handler.data.person
+    value = dict(data["user"]["person"], id="new-id", name="new")
+    apply_patch(handler, [{"op": op, "path": "/user/person", "value": value}])
+    assert handler.data.person is not person
+    assert not person.__store__.get_node(person.id)
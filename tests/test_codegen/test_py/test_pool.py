@@ -0,0 +1,86 @@
+import pytest
+from PySide6.QtCore import QObject
+from qtgql.codegen.py.runtime.collector import StoreCollector
+from qtgql.codegen.py.runtime.pool import ObjectPool
+
+from tests.test_codegen.test_py.testcases import (
+    ObjectWithListOfObjectTestCase,
+    ScalarsTestCase,
+    with_config,
+)
+
+
+@pytest.fixture
+def pooled_testcase():
+    return with_config(ObjectWithListOfObjectTestCase, object_pools={"Person": 100})
+
+
+def test_acquire_and_release(qtbot):
+    testcase = ScalarsTestCase.compile()
+    pool = ObjectPool(testcase.gql_type, max_size=1)
+    parent = QObject()
+    first = pool.acquire(parent)
+    second = pool.acquire(parent)
+    assert pool.created == 2
+    assert first.parent() is parent
+    assert pool.release([first, second]) == [second]
+    assert first.parent() is None
+    assert len(pool) == 1
+    assert pool.acquire(parent) is first
+    assert pool.reused == 1
+
+
+def test_release_resets_fields(qtbot):
+    testcase = ScalarsTestCase.compile()
+    default = testcase.gql_type()
+    node = testcase.gql_type(name="foo", age=42)
+    pool = ObjectPool(testcase.gql_type, max_size=1)
+    pool.release([node])
+    assert node.name == default.name
+    assert node.age == default.age
+
+
+def test_release_disconnects_receivers(qtbot):
+    testcase = ScalarsTestCase.compile()
+    pool = ObjectPool(testcase.gql_type, max_size=1)
+    node = pool.acquire()
+    calls = []
+    node.nameChanged.connect(lambda: calls.append(node))
+    pool.release([node])
+    assert pool.acquire() is node
+    node.name_setter("reused")
+    assert calls == []
+
+
+def test_generated_type_has_pool(pooled_testcase):
+    person_type = pooled_testcase.module.Person
+    assert person_type.__store__.pool.max_size == 100
+    assert pooled_testcase.gql_type.__store__.pool is None
+
+
+def test_released_nodes_are_reused(qtbot, pooled_testcase):
+    handler = pooled_testcase.query_handler
+    handler.on_data(pooled_testcase.initialize_dict)
+    persons = list(handler.data.persons._data)
+    handler.loose()
+    StoreCollector().collect(float("inf"))
+    pool = pooled_testcase.module.Person.__store__.pool
+    assert len(pool) >= len(persons)
+    data = pooled_testcase.initialize_dict
+    handler.on_data(data)
+    assert pool.reused >= len(persons)
+    assert {p.name for p in handler.data.persons._data} == {
+        p["name"] for p in data["user"]["persons"]
+    }
+
+
+def test_store_hit_retains_operation(qtbot):
+    testcase = ScalarsTestCase.compile()
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    store = testcase.gql_type.__store__
+    node = handler.data
+    metadata = handler.OPERATION_METADATA._replace(operation_name="other")
+    testcase.gql_type.from_dict(None, data["user"], metadata.selections, metadata)
+    assert store._data[node.id].retainers == {handler.OPERATION_METADATA.operation_name, "other"}
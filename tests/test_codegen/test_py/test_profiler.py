@@ -0,0 +1,52 @@
+import json
+
+from qtgql.codegen.py.runtime.profiler import StoreProfiler, StoreProfilerOverlay, estimate_size
+
+from tests.test_codegen.test_py.testcases import ObjectWithListOfObjectTestCase
+
+
+def test_snapshot_reports_types_and_retainers(qtbot):
+    testcase = ObjectWithListOfObjectTestCase.compile()
+    handler = testcase.query_handler
+    handler.on_data(testcase.initialize_dict)
+    report = StoreProfiler().snapshot()
+    persons_type = testcase.tested_type.fields_dict["persons"].type.is_model.is_object_type
+    persons = report["types"][persons_type.name]
+    operation_name = handler.OPERATION_METADATA.operation_name
+    assert persons["count"] >= handler.data.persons.rowCount()
+    assert persons["retainers"][operation_name] >= handler.data.persons.rowCount()
+    assert persons["estimated_bytes"] > 0
+    assert sum(persons["ages"].values()) == persons["count"]
+    assert report["models"]["count"] >= 1
+    assert report["total"]["count"] >= persons["count"]
+
+
+def test_to_json_is_valid(qtbot):
+    testcase = ObjectWithListOfObjectTestCase.compile()
+    testcase.query_handler.on_data(testcase.initialize_dict)
+    assert json.loads(StoreProfiler().to_json())["types"]
+
+
+def test_retained_longer_than(qtbot):
+    testcase = ObjectWithListOfObjectTestCase.compile()
+    handler = testcase.query_handler
+    handler.on_data(testcase.initialize_dict)
+    profiler = StoreProfiler()
+    retained = profiler.retained_longer_than(0)
+    assert handler.data.id in {r["id"] for r in retained}
+    assert not profiler.retained_longer_than(60 * 60 * 24)
+
+
+def test_estimate_size(qtbot):
+    testcase = ObjectWithListOfObjectTestCase.compile()
+    assert estimate_size(testcase.gql_type()) > 0
+
+
+def test_overlay_refresh(qtbot):
+    overlay = StoreProfilerOverlay()
+    with qtbot.wait_signal(overlay.reportChanged):
+        overlay.refresh()
+    assert json.loads(overlay.property("report"))
+    with qtbot.wait_signal(overlay.reportChanged):
+        overlay.setProperty("interval", 10)
+    assert overlay.property("interval") == 10
@@ -0,0 +1,75 @@
+import copy
+import uuid
+
+import pytest
+
+from tests.test_codegen.test_py.testcases import ObjectWithListOfObjectTestCase
+
+
+@pytest.fixture
+def testcase():
+    return ObjectWithListOfObjectTestCase.compile()
+
+
+def large_result(testcase, count: int = 20) -> dict:
+    data = testcase.initialize_dict
+    person = data["user"]["persons"][0]
+    data["user"]["persons"] = [{**person, "id": uuid.uuid4().hex} for _ in range(count)]
+    return data
+
+
+def test_rows_are_built_in_slices(qtbot, testcase):
+    handler = testcase.query_handler
+    handler.set_frame_budget(0)
+    data = large_result(testcase)
+    handler.on_data(data)
+    model = handler.data.persons
+    assert model.rowCount() < 20
+    assert handler.progress < 1.0
+    inserted = []
+    model.rowsInserted.connect(lambda _, first, last: inserted.append((first, last)))
+    qtbot.wait_until(lambda: handler.progress == 1.0)
+    assert model.rowCount() == 20
+    assert [p.id for p in model._data] == [p["id"] for p in data["user"]["persons"]]
+    assert inserted
+
+
+def test_update_completes_the_result_first(qtbot, testcase):
+    handler = testcase.query_handler
+    handler.set_frame_budget(0)
+    data = large_result(testcase)
+    handler.on_data(data)
+    changed = copy.deepcopy(data)
+    changed["user"]["persons"][-1]["name"] = "changed"
+    handler.on_data(changed)
+    model = handler.data.persons
+    assert model.rowCount() == 20
+    assert model._data[-1].name == "changed"
+    assert handler.progress == 1.0
+
+
+def test_patch_completes_the_result_first(qtbot, testcase):
+    handler = testcase.query_handler
+    handler.set_frame_budget(0)
+    handler.on_data(large_result(testcase))
+    handler.on_patch([{"op": "replace", "path": "/user/persons/19/name", "value": "patched"}])
+    model = handler.data.persons
+    assert handler.progress == 1.0
+    assert model.rowCount() == 20
+    assert model._data[19].name == "patched"
+    assert not handler._operation_on_the_fly
+
+
+def test_loose_cancels_pending_rows(qtbot, testcase):
+    handler = testcase.query_handler
+    handler.set_frame_budget(0)
+    handler.on_data(large_result(testcase))
+    handler.loose()
+    assert handler.progress == 1.0
+
+
+def test_disabled_by_default(qtbot, testcase):
+    handler = testcase.query_handler
+    handler.on_data(large_result(testcase))
+    assert handler.data.persons.rowCount() == 20
+    assert handler.progress == 1.0
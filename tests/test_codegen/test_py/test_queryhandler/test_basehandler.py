@@ -1,6 +1,11 @@
-from qtgql.codegen.py.runtime.queryhandler import BaseQueryHandler, UseQueryABC
+import pytest
+from qtgql.codegen.py.runtime.queryhandler import BaseQueryHandler, SelectionConfig, UseQueryABC
 
-from tests.test_codegen.test_py.testcases import ScalarsTestCase
+from tests.test_codegen.test_py.testcases import (
+    ListOfObjectWithUnionTestCase,
+    ObjectWithListOfObjectTestCase,
+    ScalarsTestCase,
+)
 
 
 def test_is_singleton(pseudo_environment):
@@ -24,3 +29,24 @@ def test_fetched_when_first_use_query_consumes_the_operation(qtbot, schemas_serv
     use_query: UseQueryABC = testcase.handlers_mod.UseQuery()
     use_query.set_operationName(testcase.query_operationName)
     assert handler._operation_on_the_fly
+
+
+@pytest.mark.parametrize(
+    "testcase",
+    [ObjectWithListOfObjectTestCase, ListOfObjectWithUnionTestCase],
+    ids=lambda tc: tc.test_name,
+)
+def test_deserializers_dont_consult_selection_config(qtbot, monkeypatch, testcase):
+    testcase = testcase.compile()
+    handler = testcase.query_handler
+    # the deserializers are specialized to the operation, nothing should read the config.
+    monkeypatch.setattr(
+        type(handler),
+        "OPERATION_METADATA",
+        handler.OPERATION_METADATA._replace(selections=SelectionConfig()),
+    )
+    handler.on_data(testcase.initialize_dict)
+    assert handler.data
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    assert handler.data.id == data[handler.ROOT_FIELD]["id"]
@@ -0,0 +1,90 @@
+import copy
+
+import attrs
+import pytest
+from qtgql.codegen.py.compiler.template import TemplateContext
+from qtgql.codegen.py.runtime.bases import QGraphQListModel
+from qtgql.codegen.py.runtime.lazy import RawRow
+
+from tests.test_codegen.test_py.testcases import ObjectWithListOfObjectTestCase, with_config
+
+
+@pytest.fixture
+def testcase():
+    return with_config(ObjectWithListOfObjectTestCase, role_models=True)
+
+
+def role_of(model, name: str) -> int:
+    return next(role for role, role_name in model.roleNames().items() if role_name == name)
+
+
+def test_roles_map_to_fields(qtbot, testcase):
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    model = handler.data.persons
+    assert type(model).__name__ == "PersonListModel"
+    assert {name.data() for name in model.roleNames().values()} == {
+        b"object",
+        b"id",
+        b"name",
+        b"age",
+    }
+    for i, person in enumerate(data["user"]["persons"]):
+        index = model.index(i)
+        assert model.data(index, role_of(model, "name")) == person["name"]
+        assert model.data(index, role_of(model, "age")) == person["age"]
+        assert model.data(index, QGraphQListModel.OBJECT_ROLE) is model._data[i]
+
+
+def test_update_emits_changed_roles(qtbot, testcase):
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    model = handler.data.persons
+    emitted = []
+    model.dataChanged.connect(lambda first, last, roles: emitted.append((first.row(), roles)))
+    changed = copy.deepcopy(data)
+    changed["user"]["persons"][2]["name"] = "changed"
+    handler.on_data(changed)
+    assert emitted == [(2, [role_of(model, "name")])]
+    handler.on_data(copy.deepcopy(changed))
+    assert len(emitted) == 1
+
+
+def test_raw_rows_are_read_without_creating_them(qtbot):
+    testcase = with_config(ObjectWithListOfObjectTestCase, role_models=True, lazy_rows=True)
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    model = handler.data.persons
+    index = model.index(0)
+    assert model.data(index, role_of(model, "name")) == data["user"]["persons"][0]["name"]
+    assert type(model._data[0]) is RawRow
+    emitted = []
+    model.dataChanged.connect(lambda first, last, roles: emitted.append((first.row(), roles)))
+    changed = copy.deepcopy(data)
+    changed["user"]["persons"][0]["age"] += 1
+    handler.on_data(changed)
+    assert emitted == [(0, [role_of(model, "age")])]
+    assert model.data(index, role_of(model, "age")) == changed["user"]["persons"][0]["age"]
+
+
+def test_disabled_by_default(qtbot):
+    testcase = ObjectWithListOfObjectTestCase.compile()
+    handler = testcase.query_handler
+    handler.on_data(testcase.initialize_dict)
+    assert type(handler.data.persons) is QGraphQListModel
+    assert not hasattr(testcase.objecttypes_mod, "PersonListModel")
+
+
+def test_type_lookups_follow_the_types_of_the_context(testcase):
+    types = [t for t in testcase.evaluator._generated_types.values() if t.fields]
+    context = TemplateContext(enums=[], types=types, queries=[], config=testcase.config)
+    person = next(t for t in types if t.name == "Person")
+    assert context.has_role_model(person)
+    assert context.exports(person) == ["Person", "PersonListModel"]
+    # i.e after tree shaking, nothing lists persons anymore.
+    shaken = attrs.evolve(context, types=[t for t in types if t.name != "User"])
+    assert not shaken.has_role_model(person)
+    assert context.has_role_model(person)
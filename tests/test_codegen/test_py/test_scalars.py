@@ -1,15 +1,23 @@
 from abc import ABC, abstractmethod
-from datetime import date, datetime, time, timezone
+from datetime import date, datetime, time, timedelta, timezone
 from decimal import Decimal
 from typing import Type
+from unittest.mock import patch
 
+from PySide6.QtCore import QDateTime
+from qtgql.codegen.py.compiler.config import QtGqlConfig
+from qtgql.codegen.py.compiler.template import TemplateContext
 from qtgql.codegen.py.runtime.custom_scalars import (
     BaseCustomScalar,
     DateScalar,
+    DateTimeScalar,
     DecimalScalar,
+    NativeDateTimeScalar,
     TimeScalar,
 )
 
+from tests.test_codegen.test_py.testcases import DateTimeTestCase, with_config
+
 
 class AbstractScalarTestCase(ABC):
     scalar_klass: Type[BaseCustomScalar]
@@ -27,8 +35,17 @@ class AbstractScalarTestCase(ABC):
         assert scalar._value == scalar.DEFAULT_VALUE
         assert scalar.to_qt() == self.scalar_klass(scalar.DEFAULT_VALUE).to_qt()
 
+    def test_qt_value_is_converted_once(self):
+        scalar = self.scalar_klass.from_graphql()
+        with patch.object(self.scalar_klass, "to_qt", return_value="converted") as to_qt:
+            assert scalar.qt_value() == "converted"
+            assert scalar.qt_value() == "converted"
+        to_qt.assert_called_once()
+
 
 class TestDecimalScalar(AbstractScalarTestCase):
+    scalar_klass = DecimalScalar
+
     def test_deserialize(self):
         expected = Decimal(1000)
         scalar = DecimalScalar.from_graphql(str(expected))
@@ -69,3 +86,83 @@ class TestTimeScalar(AbstractScalarTestCase):
         now = datetime.now().time()
         scalar = TimeScalar(now)
         assert scalar.to_qt() == now.isoformat()
+
+
+class TestDecode:
+    def test_memo_shares_instances(self):
+        assert DecimalScalar.decode("1.5") is DecimalScalar.decode("1.5")
+        assert DecimalScalar.decode("1.5") is not DecimalScalar.decode("2.5")
+
+    def test_memo_is_bounded(self):
+        class Bounded(DecimalScalar):
+            MEMO_SIZE = 2
+
+        first = Bounded.decode("1")
+        Bounded.decode("2")
+        Bounded.decode("3")
+        assert Bounded.decode("1") is not first
+        assert Bounded.decode("1")._value == first._value
+
+    def test_memo_disabled(self):
+        class NoMemo(DecimalScalar):
+            MEMO_SIZE = 0
+
+        assert NoMemo.decode("1") is not NoMemo.decode("1")
+
+    def test_from_graphql_many(self):
+        class NoMemo(DateScalar):
+            MEMO_SIZE = 0
+
+        decoded = NoMemo.from_graphql_many(["2020-01-01", "2021-01-01", "2020-01-01", None])
+        assert [d._value for d in decoded[:2]] == [date(2020, 1, 1), date(2021, 1, 1)]
+        assert decoded[2] is decoded[0]
+        assert decoded[3]._value == NoMemo.DEFAULT_VALUE
+
+
+class TestNativeDateTimeScalar:
+    def test_to_qt(self):
+        now = datetime.now()
+        scalar = NativeDateTimeScalar(now)
+        assert scalar.to_qt() == QDateTime(now)
+
+    def test_to_qt_keeps_utc_offset(self):
+        value = datetime(2020, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=2)))
+        qt = NativeDateTimeScalar(value).to_qt()
+        assert qt.toSecsSinceEpoch() == int(value.timestamp())
+        assert qt.offsetFromUtc() == 2 * 60 * 60
+
+    def test_qdatetime_is_imported_only_when_used(self, qtbot):
+        assert not hasattr(DateTimeTestCase.compile().objecttypes_mod, "QDateTime")
+
+    def test_overrides_builtin(self, qtbot):
+        testcase = with_config(
+            DateTimeTestCase,
+            custom_scalars={DateTimeScalar.GRAPHQL_NAME: NativeDateTimeScalar},
+        )
+        handler = testcase.query_handler
+        data = testcase.initialize_dict
+        handler.on_data(data)
+        assert handler.data.property("birth") == QDateTime(
+            datetime.fromisoformat(data["user"]["birth"])
+        )
+
+
+def test_compare_with_none():
+    scalar = DateTimeScalar(datetime.now())
+    assert scalar != None  # noqa: E711
+    assert None != scalar  # noqa: E711
+    assert (scalar == None) is False  # noqa: E711
+
+
+def test_unresolved_to_qt_annotation_is_not_imported():
+    class Scalar(DateTimeScalar):
+        GRAPHQL_NAME = "Unresolved"
+
+        def to_qt(self) -> "NotImportedHere":  # type: ignore # noqa: F821
+            ...
+
+    config = QtGqlConfig(
+        graphql_dir=None, env_name="TestEnv", custom_scalars={"Unresolved": Scalar}
+    )
+    context = TemplateContext(enums=[], types=[], queries=[], config=config, scalars=[Scalar])
+    assert not any("NotImportedHere" in dependency for dependency in context.dependencies)
@@ -0,0 +1,92 @@
+import pytest
+from qtgql.codegen.py.runtime.environment import get_gql_env
+from qtgql.codegen.py.runtime.snapshot import Snapshot, SnapshotWriter
+
+from tests.test_codegen.test_py.testcases import ObjectWithListOfObjectTestCase
+
+
+@pytest.fixture
+def testcase():
+    return ObjectWithListOfObjectTestCase.compile()
+
+
+def make_snapshot(testcase, data: dict) -> Snapshot:
+    writer = SnapshotWriter(env_name=testcase.config.env_name)
+    writer.add_operation(testcase.query_handler.OPERATION_METADATA.operation_name, data)
+    return Snapshot(writer.dumps())
+
+
+def test_round_trip(tmp_path):
+    writer = SnapshotWriter(env_name="Env")
+    writer.add_operation("A", {"a": 1})
+    writer.add_operation("B", {"b": [1, 2]})
+    path = tmp_path / "cache.qtgqlsnap"
+    writer.save(path)
+    snapshot = Snapshot.open(path)
+    assert snapshot.env_name == "Env"
+    assert snapshot.operations == ["A", "B"]
+    assert snapshot.operation("B") == {"b": [1, 2]}
+    assert snapshot.operation("C") is None
+    snapshot.close()
+
+
+def test_invalid_file():
+    with pytest.raises(ValueError):
+        Snapshot(b"NOTASNAP" + bytes(8))
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "cache.qtgqlsnap"
+    path.write_bytes(b"")
+    with pytest.raises(ValueError, match="not a qtgql snapshot"):
+        Snapshot.open(path)
+
+
+@pytest.mark.parametrize("keep", [4, 16, 30, -1])
+def test_truncated_file(tmp_path, keep):
+    writer = SnapshotWriter(env_name="Env")
+    writer.add_operation("A", {"a": 1})
+    path = tmp_path / "cache.qtgqlsnap"
+    path.write_bytes(writer.dumps()[:keep])
+    with pytest.raises(ValueError, match="not a qtgql snapshot"):
+        Snapshot.open(path)
+
+
+def test_restored_before_first_consume(qtbot, testcase, monkeypatch):
+    handler = testcase.query_handler
+    monkeypatch.setattr(handler, "fetch", lambda: None)
+    data = testcase.initialize_dict
+    env = get_gql_env(testcase.config.env_name)
+    env.restore_snapshot(make_snapshot(testcase, data))
+    assert handler.data is None
+    handler.consume()
+    assert handler.data.id == data["user"]["id"]
+    assert handler.data.persons.rowCount() == len(data["user"]["persons"])
+    # restored only once.
+    assert env.take_snapshot_result(handler.OPERATION_METADATA.operation_name) is None
+
+
+def test_eager_restore(qtbot, testcase):
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    get_gql_env(testcase.config.env_name).restore_snapshot(
+        make_snapshot(testcase, data), eager=True
+    )
+    assert handler.data.id == data["user"]["id"]
+    assert not handler._operation_on_the_fly
+
+
+def test_wrong_env_raises(testcase):
+    snapshot = Snapshot(SnapshotWriter(env_name="OtherEnv").dumps())
+    with pytest.raises(ValueError):
+        get_gql_env(testcase.config.env_name).restore_snapshot(snapshot)
+
+
+def test_recorder(qtbot, testcase):
+    handler = testcase.query_handler
+    env = get_gql_env(testcase.config.env_name)
+    env.recorder = SnapshotWriter(env_name=env.name)
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    snapshot = Snapshot(env.recorder.dumps())
+    assert snapshot.operation(handler.OPERATION_METADATA.operation_name) == data
@@ -0,0 +1,74 @@
+import copy
+import sys
+
+import attrs
+import pytest
+from qtgql.codegen.py.compiler.config import QtGqlConfig
+from qtgql.codegen.py.runtime.environment import get_gql_env
+
+from tests.test_codegen.test_py.testcases import (
+    EnumTestCase,
+    ObjectWithListOfObjectTestCase,
+    UnionTestCase,
+    with_config,
+)
+
+
+def loaded_types() -> set[str]:
+    return {name.partition(".")[2] for name in sys.modules if name.startswith("objecttypes.")}
+
+
+def test_module_per_type(tmp_path):
+    config = QtGqlConfig(graphql_dir=tmp_path, env_name="TestEnv", split_modules=True)
+    testcase = attrs.evolve(ObjectWithListOfObjectTestCase, config=config)
+    (tmp_path / "operations.graphql").write_text(testcase.query)
+    (tmp_path / "schema.graphql").write_text(str(testcase.schema))
+    testcase.evaluator.dump()
+    assert {p.name for p in (tmp_path / "objecttypes").iterdir()} == {
+        "__init__.py",
+        "Person.py",
+        "Query.py",
+        "User.py",
+    }
+    assert not (tmp_path / "objecttypes.py").exists()
+
+
+def test_only_operation_types_are_imported(qtbot):
+    testcase = with_config(ObjectWithListOfObjectTestCase, split_modules=True)
+    assert loaded_types() == {"User", "Person"}
+    package = testcase.objecttypes_mod
+    assert "Query" not in package.__dict__
+    query_type = package.Query
+    assert isinstance(query_type, type)
+    assert package.__TYPE_MAP__["Query"] is query_type
+    assert "Query" in loaded_types()
+
+
+@pytest.mark.parametrize("testcase", [ObjectWithListOfObjectTestCase, UnionTestCase, EnumTestCase])
+def test_handlers(qtbot, testcase):
+    testcase = with_config(testcase, split_modules=True)
+    handler = testcase.query_handler
+    handler.on_data(testcase.initialize_dict)
+    assert handler.data is not None
+    handler.on_data(copy.deepcopy(testcase.initialize_dict))
+    assert isinstance(handler.data, getattr(testcase.objecttypes_mod, testcase.type_name))
+
+
+def test_types_refer_to_each_other_through_the_package(qtbot):
+    testcase = with_config(ObjectWithListOfObjectTestCase, split_modules=True)
+    data = testcase.initialize_dict["user"]
+    metadata = testcase.query_handler.OPERATION_METADATA
+    user = testcase.objecttypes_mod.User.from_dict(None, data, metadata.selections, metadata)
+    assert [p.name for p in user.persons._data] == [p["name"] for p in data["persons"]]
+
+
+def test_type_map_imports_on_lookup(qtbot):
+    testcase = with_config(ObjectWithListOfObjectTestCase, split_modules=True)
+    type_map = get_gql_env("TestEnv").type_map
+    assert type_map is testcase.objecttypes_mod.__TYPE_MAP__
+    assert "Query" in type_map
+    assert "Query" not in loaded_types()
+    assert type_map.get("Query") is testcase.objecttypes_mod.Query
+    assert type_map.get("Nope") is None
+    with pytest.raises(KeyError):
+        type_map["Nope"]
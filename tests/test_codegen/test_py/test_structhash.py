@@ -0,0 +1,82 @@
+import copy
+from unittest.mock import patch
+
+import pytest
+from qtgql.codegen.py.runtime import structhash
+from qtgql.codegen.py.runtime.structhash import (
+    current_epoch,
+    current_hash,
+    invalidate,
+    payload_hashes,
+)
+
+from tests.test_codegen.test_py.testcases import ObjectWithListOfObjectTestCase, with_config
+
+
+@pytest.fixture
+def testcase():
+    return with_config(ObjectWithListOfObjectTestCase, structural_hashing=True)
+
+
+def test_unchanged_subtrees_are_skipped(qtbot, testcase):
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    handler.on_data(data)  # records the hashes.
+    persons = handler.data.persons._data
+    # modify privately, skipped nodes won't be restored.
+    for person in persons:
+        person._name = "tampered"
+    changed = copy.deepcopy(data)
+    changed["user"]["persons"][0]["name"] = "changed"
+    handler.on_data(changed)
+    assert persons[0].name == "changed"
+    assert all(person.name == "tampered" for person in persons[1:])
+
+
+def test_setter_invalidates_hashes(qtbot, testcase):
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    handler.on_data(data)
+    person = handler.data.persons._data[1]
+    person.name_setter("local")
+    handler.on_data(data)
+    assert person.name == data["user"]["persons"][1]["name"]
+
+
+def test_disabled_by_default(qtbot):
+    testcase = ObjectWithListOfObjectTestCase.compile()
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    handler.on_data(data)
+    assert handler.data._subtree_hash is None
+
+
+def test_invalidation_is_scoped_to_a_type(qtbot):
+    epoch = current_epoch(("Person",))
+    invalidate("User")
+    assert current_epoch(("Person",)) == epoch
+    assert current_epoch(("Person", "User")) > epoch
+
+
+def test_payload_is_digested_once(qtbot, testcase):
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    with patch.object(structhash, "_digest", wraps=structhash._digest) as digest:
+        handler.on_data(copy.deepcopy(data))
+    persons = data["user"]["persons"]
+    # the user, each person and a list, each scalar.
+    scalars = sum(len(person) for person in persons) + len(data["user"]) - 1
+    assert digest.call_count == 1 + len(persons) + 1 + scalars
+
+
+def test_digest_tells_scalar_types_apart():
+    assert current_hash({"a": 1}) != current_hash({"a": True})
+    assert current_hash({"a": [1, 2]}) != current_hash({"a": [2, 1]})
+    with payload_hashes():
+        inner = {"b": 1}
+        assert current_hash({"a": inner}) != current_hash(inner)
+        assert current_hash(inner) == current_hash({"b": 1})
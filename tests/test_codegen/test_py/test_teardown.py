@@ -0,0 +1,57 @@
+import sys
+import weakref
+
+import shiboken6
+from PySide6.QtCore import QObject
+from qtgql.codegen.py.runtime.bases import QGraphQListModel, loose_tree
+from qtgql.codegen.py.runtime.teardown import DeleteLaterQueue
+
+from tests.test_codegen.test_py.testcases import ObjectWithListOfObjectTestCase
+
+
+def test_delete_queue_deletes_in_batches(qtbot):
+    queue = DeleteLaterQueue(batch_size=3)
+    objects = [QObject() for _ in range(10)]
+    refs = [weakref.ref(o) for o in objects]
+    queue.enqueue(objects)
+    del objects
+    assert len(queue) == 10
+    queue._on_timeout()
+    assert len(queue) == 7  # only one batch per event-loop turn.
+    qtbot.wait_until(lambda: not any(ref() for ref in refs))
+
+
+def test_delete_queue_flush(qtbot):
+    queue = DeleteLaterQueue(batch_size=1)
+    queue.enqueue([QObject() for _ in range(5)])
+    queue.flush()
+    assert not len(queue)
+
+
+def test_loose_tree_is_not_recursive(qtbot):
+    depth = sys.getrecursionlimit() * 2
+    root = QGraphQListModel(None, data=[])
+    model = root
+    for _ in range(depth):
+        child = QGraphQListModel(None, data=[])
+        model._data.append(child)
+        model = child
+    testcase = ObjectWithListOfObjectTestCase.compile()
+    loose_tree(root, testcase.query_handler.OPERATION_METADATA)
+    qtbot.wait_until(lambda: not shiboken6.isValid(model))
+
+
+def test_handler_loose_releases_list_nodes(qtbot):
+    testcase = ObjectWithListOfObjectTestCase.compile()
+    handler = testcase.query_handler
+    handler.on_data(testcase.initialize_dict)
+    model = handler.data.persons
+    persons = list(model._data)
+    model_ref = weakref.ref(model)
+    del model
+    handler.loose()
+    for person in persons:
+        assert not person.__store__.get_node(person.id)
+    assert handler.data is None
+    del persons, person
+    qtbot.wait_until(lambda: not model_ref())
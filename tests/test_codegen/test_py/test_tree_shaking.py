@@ -0,0 +1,60 @@
+import attrs
+from qtgql.codegen.py.runtime.custom_scalars import DateTimeScalar
+
+from tests.test_codegen.test_py.testcases import (
+    DateTimeTestCase,
+    EnumTestCase,
+    ObjectWithListOfObjectTestCase,
+    UnionTestCase,
+    with_config,
+)
+
+UserNameTestCase = attrs.evolve(EnumTestCase, query="query MainQuery { user { name } }")
+
+
+def test_unselected_types_are_dropped(qtbot):
+    testcase = with_config(UnionTestCase, tree_shaking=True)
+    mod = testcase.objecttypes_mod
+    assert {"User", "Frog", "Person"} <= mod.__TYPE_MAP__.keys()
+    assert "Query" not in mod.__TYPE_MAP__
+    # only an argument of the query.
+    assert not hasattr(mod, "UnionChoice")
+
+
+def test_unselected_fields_are_dropped(qtbot):
+    user = with_config(UserNameTestCase, tree_shaking=True).objecttypes_mod.User
+    assert hasattr(user, "name")
+    assert not hasattr(user, "age")
+    testcase = with_config(ObjectWithListOfObjectTestCase, tree_shaking=True)
+    handler = testcase.query_handler
+    data = testcase.initialize_dict
+    handler.on_data(data)
+    assert [p.name for p in handler.data.persons._data] == [
+        p["name"] for p in data["user"]["persons"]
+    ]
+
+
+def test_selected_enums_are_kept(qtbot):
+    testcase = with_config(EnumTestCase, tree_shaking=True)
+    mod = testcase.objecttypes_mod
+    handler = testcase.query_handler
+    handler.on_data(testcase.initialize_dict)
+    assert handler.data.status == mod.Status.Connected.value
+    assert not hasattr(with_config(UserNameTestCase, tree_shaking=True).objecttypes_mod, "Status")
+
+
+def test_only_selected_scalars_are_generated(qtbot):
+    assert vars(with_config(DateTimeTestCase, tree_shaking=True).objecttypes_mod.SCALARS).keys() & {
+        "DateTimeScalar",
+        "DateScalar",
+        "TimeScalar",
+    } == {"DateTimeScalar"}
+    assert not hasattr(
+        with_config(EnumTestCase, tree_shaking=True).objecttypes_mod.SCALARS,
+        DateTimeScalar.__name__,
+    )
+
+
+def test_with_split_modules(qtbot):
+    testcase = with_config(ObjectWithListOfObjectTestCase, tree_shaking=True, split_modules=True)
+    assert set(testcase.objecttypes_mod._MODULES) == {"User", "Person"}
@@ -1,3 +1,4 @@
+import importlib
 import sys
 import tempfile
 import uuid
@@ -76,6 +77,22 @@ class QGQLObjectTestCase:
         else:
             return res.data
 
+    @staticmethod
+    def _import_package(generated: dict[str, str]) -> ModuleType:
+        # types are imported on first access, the package must outlive the compilation.
+        root = Path(tempfile.mkdtemp())
+        for fname, content in generated.items():
+            path = root / (fname + ".py")
+            path.parent.mkdir(exist_ok=True)
+            path.write_text(content)
+        for name in [m for m in sys.modules if m.partition(".")[0] == "objecttypes"]:
+            del sys.modules[name]
+        sys.path.insert(0, str(root))
+        try:
+            return importlib.import_module("objecttypes")
+        finally:
+            sys.path.remove(str(root))
+
     def compile(self, url: Optional[str] = "") -> "CompiledTestCase":
         url = url.replace("graphql", f"{hash_schema(self.schema)}")
         env = QtGqlEnvironment(client=GqlWsTransportClient(url=url), name=self.config.env_name)
@@ -91,10 +108,13 @@ class QGQLObjectTestCase:
             generated = self.evaluator.dumps()
             types_module = ModuleType(uuid.uuid4().hex)
         handlers_mod = ModuleType(uuid.uuid4().hex)
-        try:
-            exec(compile(generated["objecttypes"], "gen_schema", "exec"), types_module.__dict__)
-        except BaseException as e:
-            raise RuntimeError(generated["objecttypes"]) from e
+        if self.config.split_modules:
+            types_module = self._import_package(generated)
+        else:
+            try:
+                exec(compile(generated["objecttypes"], "gen_schema", "exec"), types_module.__dict__)
+            except BaseException as e:
+                raise RuntimeError(generated["objecttypes"]) from e
 
         sys.modules["objecttypes"] = types_module
         exec(compile(generated["handlers"], "gen_handlers", "exec"), handlers_mod.__dict__)
@@ -167,6 +187,12 @@ class CompiledTestCase(QGQLObjectTestCase):
         return self
 
 
+def with_config(testcase: QGQLObjectTestCase, **options) -> CompiledTestCase:
+    """Compiles `testcase` with codegen options (see `QtGqlConfig`)."""
+    config = QtGqlConfig(graphql_dir=None, env_name="TestEnv", **options)
+    return attrs.evolve(testcase, config=config).compile()
+
+
 ScalarsTestCase = QGQLObjectTestCase(
     schema=schemas.object_with_scalar.schema,
     query="""
@@ -454,6 +480,30 @@ ListOfUnionTestCase = QGQLObjectTestCase(
     test_name="ListOfUnionTestCase",
 )
 
+ConnectionTestCase = QGQLObjectTestCase(
+    schema=schemas.connection.schema,
+    query="""
+        query MainQuery($after: String) {
+          user {
+            persons(first: 5, after: $after) {
+              edges {
+                cursor
+                node {
+                  name
+                  age
+                }
+              }
+              pageInfo {
+                hasNextPage
+                endCursor
+              }
+            }
+          }
+        }
+        """,
+    test_name="ConnectionTestCase",
+)
+
 all_test_cases = [
     ScalarsTestCase,
     DateTimeTestCase,
@@ -27,6 +27,47 @@ def test_subscriber_called_with_on_gql_next(qtbot, default_client):
     assert subscriber_2.data["count"] == 1
 
 
+def test_results_are_delivered_through_receive(default_client):
+    class Receiver(PseudoHandler):
+        def receive(self, message: dict) -> None:
+            super().receive(message)
+            self.received = message
+
+        def on_patch(self, operations: list[dict]) -> None:
+            self.patch = operations
+
+    handler = Receiver()
+    default_client.handlers[handler.message.id] = handler
+    default_client._on_gql_next(
+        SubscribeResponseMessage(
+            type=PROTOCOL.NEXT, id=handler.message.id, payload={"data": {"count": 1}}
+        )
+    )
+    assert handler.received == handler.data == {"count": 1}
+    patch = [{"op": "replace", "path": "/count", "value": 2}]
+    default_client._on_gql_next(
+        SubscribeResponseMessage(
+            type=PROTOCOL.NEXT,
+            id=handler.message.id,
+            payload={"data": None, "extensions": {"patch": patch}},
+        )
+    )
+    assert handler.patch == patch
+
+
+def test_patches_are_errors_by_default(default_client, default_handler):
+    default_client.handlers[default_handler.message.id] = default_handler
+    default_client._on_gql_next(
+        SubscribeResponseMessage(
+            type=PROTOCOL.NEXT,
+            id=default_handler.message.id,
+            payload={"data": None, "extensions": {"patch": []}},
+        )
+    )
+    assert default_handler.error
+    assert default_handler.data is None
+
+
 def test_subscriber_called_with_on_gql_complete(qtbot, default_client, default_handler):
     assert not default_handler.completed
     default_client.execute(default_handler)